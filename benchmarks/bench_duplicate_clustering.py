@@ -0,0 +1,77 @@
+"""
+Benchmark the offline duplicate clustering job (similarity + union-find)
+
+Builds a synthetic corpus with planted near-duplicate groups and runs the
+same find_duplicate_pairs / cluster_pairs code as
+jobs/duplicate_clustering.py, without a database. Reports pair-scoring
+throughput and checks that every planted group was recovered.
+
+A 1M x 384 float32 matrix needs ~1.5 GB (plus the same again in shared
+memory when --workers > 1).
+
+Usage:
+    python benchmarks/bench_duplicate_clustering.py --size 1000000 --workers 8
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from bugspotter_intelligence.jobs.duplicate_clustering import cluster_pairs, find_duplicate_pairs
+
+
+def planted_corpus(size: int, dimension: int, groups: int, group_size: int, seed: int = 42):
+    """Random unit vectors plus `groups` tight clusters of near-duplicates"""
+    rng = np.random.default_rng(seed)
+    matrix = rng.standard_normal((size, dimension), dtype=np.float32)
+
+    members = rng.choice(size, size=groups * group_size, replace=False).reshape(groups, group_size)
+    for group in members:
+        base = matrix[group[0]]
+        noise = rng.standard_normal((group_size, dimension), dtype=np.float32) * 0.1
+        matrix[group] = base + noise * np.linalg.norm(base) / np.sqrt(dimension)
+
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix, members
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--threshold", type=float, default=0.90)
+    parser.add_argument("--block-size", type=int, default=4096)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--groups", type=int, default=1000, help="Planted duplicate groups")
+    parser.add_argument("--group-size", type=int, default=3)
+    args = parser.parse_args()
+
+    matrix, planted = planted_corpus(args.size, args.dimension, args.groups, args.group_size)
+    bug_ids = [f"bug-{i:08}" for i in range(args.size)]
+
+    start = time.perf_counter()
+    pairs = find_duplicate_pairs(matrix, args.threshold, args.block_size, args.workers)
+    pairs_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    clusters = cluster_pairs(bug_ids, pairs)
+    union_find_s = time.perf_counter() - start
+
+    recovered = sum(
+        len({clusters.get(bug_ids[i]) for i in group}) == 1 and bug_ids[group[0]] in clusters
+        for group in planted
+    )
+    comparisons = args.size * (args.size - 1) / 2
+
+    print(f"| vectors | workers | block | similarity (s) | pairs/s | vectors/s | union-find (s) | pairs found | clusters | planted recovered |")
+    print("|---|---|---|---|---|---|---|---|---|---|")
+    print(
+        f"| {args.size:,} | {args.workers} | {args.block_size} | {pairs_s:.1f} "
+        f"| {comparisons / pairs_s:,.0f} | {args.size / pairs_s:,.0f} | {union_find_s:.2f} "
+        f"| {len(pairs):,} | {len(set(clusters.values())):,} | {recovered}/{len(planted)} |"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,26 @@ from fastapi import Depends
 
 from bugspotter_intelligence.config import Settings
 from bugspotter_intelligence.db.database import get_db_connection
-from bugspotter_intelligence.llm import LLMProvider, create_llm_provider
+from bugspotter_intelligence.llm import (
+    LLMProvider,
+    LLMScheduler,
+    Priority,
+    RouterProvider,
+    ScheduledLLMProvider,
+    SingleFlightLLMProvider,
+    create_llm_provider
+)
 from bugspotter_intelligence.services import BugCommandService, BugQueryService
+from bugspotter_intelligence.services.access_tracker import AccessTracker, get_access_tracker
 from bugspotter_intelligence.services.embeddings import EmbeddingProvider, LocalEmbeddingProvider
+from bugspotter_intelligence.services.semantic_cache import CachedLLMProvider, SemanticCache, get_semantic_cache
+from bugspotter_intelligence.services.vector_index import VectorIndex, get_vector_index
 
 
 # Global singletons
 _settings: Settings | None = None
 _llm_provider: LLMProvider | None = None
+_background_llm_provider: LLMProvider | None = None
 _embedding_provider: EmbeddingProvider | None = None
 
 
@@ -23,15 +35,65 @@ def get_settings() -> Settings:
     return _settings
 
 
+def _create_llm_providers(settings: Settings) -> tuple[LLMProvider, LLMProvider]:
+    """
+    Interactive and background views of the configured provider
+
+    Both share one backend and one scheduler; interactive calls are
+    scheduled first. Identical interactive requests share a generation
+    (when enabled) before they take a scheduler slot. With several
+    Ollama backends, only interactive calls are hedged, and a hedge
+    takes a second scheduler slot.
+    """
+    backend = create_llm_provider(settings)
+    scheduler = LLMScheduler(
+        max_concurrency=settings.llm_max_concurrency,
+        max_queue=settings.llm_max_queue,
+        queue_timeout=settings.llm_queue_timeout
+    )
+
+    provider = ScheduledLLMProvider(backend, scheduler, Priority.INTERACTIVE)
+    if settings.llm_single_flight_enabled:
+        model = getattr(settings, f"{settings.llm_provider}_model")
+        provider = SingleFlightLLMProvider(provider, model)
+
+    background = backend
+    if isinstance(backend, RouterProvider):
+        backend.scheduler = scheduler
+        background = backend.without_hedging()
+    return provider, ScheduledLLMProvider(background, scheduler, Priority.BACKGROUND)
+
+
+def init_llm_provider(settings: Settings) -> None:
+    """Create the LLM provider (and its HTTP connection pool) at startup"""
+    global _llm_provider, _background_llm_provider
+    if _llm_provider is None:
+        _llm_provider, _background_llm_provider = _create_llm_providers(settings)
+
+
+async def close_llm_provider() -> None:
+    """Close the LLM provider's connections"""
+    global _llm_provider, _background_llm_provider
+    if _llm_provider:
+        # Closes the shared backend too
+        await _llm_provider.close()
+        _llm_provider = _background_llm_provider = None
+
+
 def get_llm_provider() -> LLMProvider:
-    """Get LLM provider singleton"""
-    global _llm_provider
+    """Get LLM provider singleton (interactive priority)"""
     if _llm_provider is None:
-        settings = get_settings()
-        _llm_provider = create_llm_provider(settings)
+        init_llm_provider(get_settings())
     return _llm_provider
 
 
+def get_background_llm_provider() -> LLMProvider:
+    """Get the LLM provider for background jobs (scheduled after interactive calls)"""
+    if _background_llm_provider is None:
+        init_llm_provider(get_settings())
+    return _background_llm_provider
+
+
 def get_embedding_provider() -> EmbeddingProvider:
     """Get embedding provider singleton"""
     global _embedding_provider
@@ -40,28 +102,51 @@ def get_embedding_provider() -> EmbeddingProvider:
     return _embedding_provider
 
 
+def get_ask_llm_provider(
+    settings: Settings = Depends(get_settings),
+    llm_provider: LLMProvider = Depends(get_llm_provider),
+    embedding_provider: EmbeddingProvider = Depends(get_embedding_provider),
+    cache: SemanticCache | None = Depends(get_semantic_cache)
+) -> LLMProvider:
+    """Get the LLM provider for /ask, behind the semantic cache when enabled"""
+    if cache is None:
+        return llm_provider
+    model = getattr(settings, f"{settings.llm_provider}_model")
+    return CachedLLMProvider(llm_provider, embedding_provider, cache, model)
+
+
 def get_bug_command_service(
+    settings: Settings = Depends(get_settings),
     llm_provider: LLMProvider = Depends(get_llm_provider),
     embedding_provider: EmbeddingProvider = Depends(get_embedding_provider)
 ) -> BugCommandService:
     """Get BugCommandService instance"""
-    return BugCommandService(llm_provider, embedding_provider)
+    return BugCommandService(llm_provider, embedding_provider, settings)
 
 
 def get_bug_query_service(
     settings: Settings = Depends(get_settings),
     llm_provider: LLMProvider = Depends(get_llm_provider),
-    embedding_provider: EmbeddingProvider = Depends(get_embedding_provider)
+    embedding_provider: EmbeddingProvider = Depends(get_embedding_provider),
+    vector_index: VectorIndex | None = Depends(get_vector_index),
+    access_tracker: AccessTracker | None = Depends(get_access_tracker)
 ) -> BugQueryService:
     """Get BugQueryService instance"""
-    return BugQueryService(settings, llm_provider, embedding_provider)
+    return BugQueryService(settings, llm_provider, embedding_provider, vector_index, access_tracker)
 
 
 __all__ = [
+    "get_access_tracker",
     "get_settings",
     "get_llm_provider",
+    "get_background_llm_provider",
+    "get_ask_llm_provider",
+    "get_semantic_cache",
+    "init_llm_provider",
+    "close_llm_provider",
     "get_embedding_provider",
     "get_bug_command_service",
     "get_bug_query_service",
-    "get_db_connection"
+    "get_db_connection",
+    "get_vector_index"
 ]
\ No newline at end of file
@@ -1,10 +1,14 @@
 """Q&A endpoint using LLM"""
 
 from fastapi import APIRouter, Depends, HTTPException
-from bugspotter_intelligence.api.deps import get_llm_provider, get_settings
+from fastapi.responses import StreamingResponse
+from bugspotter_intelligence.api.deps import get_ask_llm_provider, get_llm_provider, get_semantic_cache, get_settings
 from bugspotter_intelligence.config import Settings
-from bugspotter_intelligence.llm import LLMProvider
+from bugspotter_intelligence.llm import LLMOverloadedError, LLMProvider
 from bugspotter_intelligence.models import AskRequest, AskResponse
+from bugspotter_intelligence.models.responses import LLMUsageStats, SemanticCacheStats
+from bugspotter_intelligence.services.semantic_cache import SemanticCache
+from bugspotter_intelligence.utils.sse import SSE_HEADERS, start_stream, token_events
 
 router = APIRouter(prefix="/ask", tags=["Q&A"])
 
@@ -12,7 +16,7 @@ router = APIRouter(prefix="/ask", tags=["Q&A"])
 @router.post("", response_model=AskResponse)
 async def ask_question(
         request: AskRequest,
-        provider: LLMProvider = Depends(get_llm_provider),
+        provider: LLMProvider = Depends(get_ask_llm_provider),
         settings: Settings = Depends(get_settings)
 ) -> AskResponse:
     """
@@ -36,6 +40,8 @@ async def ask_question(
             model=getattr(settings, f"{settings.llm_provider}_model")
         )
 
+    except LLMOverloadedError:
+        raise
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -43,4 +49,55 @@ async def ask_question(
         raise HTTPException(
             status_code=500,
             detail=f"Failed to generate answer: {str(e)}\n{error_details}"
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/stream")
+async def ask_question_stream(
+        request: AskRequest,
+        provider: LLMProvider = Depends(get_ask_llm_provider),
+        settings: Settings = Depends(get_settings)
+) -> StreamingResponse:
+    """
+    Ask a question, streaming the answer as Server-Sent Events
+
+    Emits a `token` event ({"text": ...}) per chunk as the model produces
+    it, then `done` ({"provider", "model"}), or `error` ({"detail"}) if
+    generation fails midway. An overloaded LLM is a 429/503 with
+    Retry-After before the stream starts.
+    """
+    tokens = await start_stream(provider.stream(
+        prompt=request.question,
+        context=request.context,
+        temperature=request.temperature,
+        max_tokens=request.max_tokens
+    ))
+    done = {
+        "provider": settings.llm_provider,
+        "model": getattr(settings, f"{settings.llm_provider}_model")
+    }
+
+    return StreamingResponse(token_events(tokens, done), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.get("/cache", response_model=SemanticCacheStats)
+async def get_cache_stats(
+        cache: SemanticCache | None = Depends(get_semantic_cache)
+) -> SemanticCacheStats:
+    """Hit rate and size of the semantic answer cache"""
+    if cache is None:
+        return SemanticCacheStats(enabled=False)
+    return SemanticCacheStats(enabled=True, **cache.stats())
+
+
+@router.get("/usage", response_model=LLMUsageStats)
+async def get_usage(
+        provider: LLMProvider = Depends(get_llm_provider),
+        settings: Settings = Depends(get_settings)
+) -> LLMUsageStats:
+    """Tokens used by the LLM provider since startup, as reported by its API"""
+    return LLMUsageStats(
+        provider=settings.llm_provider,
+        model=getattr(settings, f"{settings.llm_provider}_model"),
+        **provider.usage.as_dict()
+    )
@@ -1,22 +1,36 @@
 """Bug analysis endpoints"""
 
-from fastapi import APIRouter, Depends, HTTPException
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from psycopg import AsyncConnection
 from bugspotter_intelligence.api.deps import (
     get_bug_command_service,
     get_bug_query_service,
     get_db_connection
 )
+from bugspotter_intelligence.db.database import get_pool
+from bugspotter_intelligence.llm import LLMOverloadedError
 from bugspotter_intelligence.services import BugCommandService, BugQueryService
-from bugspotter_intelligence.models.requests import AnalyzeBugRequest, UpdateResolutionRequest
+from bugspotter_intelligence.models.requests import (
+    AnalyzeBugRequest,
+    BatchSimilarBugsRequest,
+    BulkUpdateResolutionRequest,
+    UpdateResolutionRequest
+)
 from bugspotter_intelligence.models.responses import (
     AnalyzeBugResponse,
+    BatchSimilarBugsResponse,
+    BulkResolutionUpdateResponse,
     SimilarBugsResponse,
     SimilarBug,
     MitigationResponse,
     BugDetailResponse,
     ResolutionUpdateResponse
 )
+from bugspotter_intelligence.utils.pagination import decode_cursor
+from bugspotter_intelligence.utils.sse import SSE_HEADERS, start_stream, token_events
 
 router = APIRouter(prefix="/bugs", tags=["Bugs"])
 
@@ -33,7 +47,8 @@ async def analyze_bug(
     This endpoint:
     1. Extracts relevant information from logs and metadata
     2. Generates vector embedding for similarity search
-    3. Stores bug information in the database
+    3. Optionally (detect_duplicates) checks for a duplicate and marks the bug
+    4. Stores bug information in the database
 
     The main BugSpotter app should call this when a new bug is reported.
     """
@@ -45,12 +60,16 @@ async def analyze_bug(
             description=request.description,
             console_logs=request.console_logs,
             network_logs=request.network_logs,
-            metadata=request.metadata
+            metadata=request.metadata,
+            detect_duplicates=request.detect_duplicates
         )
 
         return AnalyzeBugResponse(
             bug_id=result["bug_id"],
-            embedding_generated=result["embedding_generated"]
+            embedding_generated=result["embedding_generated"],
+            is_duplicate=result["is_duplicate"],
+            duplicate_of=result["duplicate_of"],
+            duplicate_similarity=result["duplicate_similarity"]
         )
 
     except Exception as e:
@@ -60,6 +79,79 @@ async def analyze_bug(
         )
 
 
+@router.post("/similar/batch", response_model=BatchSimilarBugsResponse)
+async def find_similar_bugs_batch(
+        request: BatchSimilarBugsRequest,
+        conn: AsyncConnection = Depends(get_db_connection),
+        service: BugQueryService = Depends(get_bug_query_service)
+) -> BatchSimilarBugsResponse:
+    """
+    Find similar bugs for many bugs in one call
+
+    All bugs are searched together (one batched search instead of
+    one request per bug). Unknown bug ids are listed in not_found.
+    """
+    try:
+        result = await service.find_similar_bugs_batch(
+            conn=conn,
+            bug_ids=request.bug_ids,
+            similarity_threshold=request.threshold,
+            limit=request.limit
+        )
+
+        return BatchSimilarBugsResponse(
+            results=[
+                SimilarBugsResponse(
+                    bug_id=item["bug_id"],
+                    is_duplicate=item["is_duplicate"],
+                    similar_bugs=[SimilarBug(**bug) for bug in item["similar_bugs"]],
+                    threshold_used=item["threshold_used"]
+                )
+                for item in result["results"]
+            ],
+            not_found=result["not_found"]
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to find similar bugs: {str(e)}"
+        )
+
+
+@router.patch("/resolutions", response_model=BulkResolutionUpdateResponse)
+async def update_resolutions(
+        request: BulkUpdateResolutionRequest,
+        conn: AsyncConnection = Depends(get_db_connection),
+        service: BugCommandService = Depends(get_bug_command_service)
+) -> BulkResolutionUpdateResponse:
+    """
+    Update many bug resolutions in one call
+
+    For release-time bulk closes: all resolutions are written in one
+    transaction and their AI summaries are generated several per LLM
+    call. Unknown bug ids are listed in not_found.
+    """
+    try:
+        result = await service.update_bug_resolutions(
+            conn=conn,
+            updates=[update.model_dump() for update in request.updates]
+        )
+
+        return BulkResolutionUpdateResponse(
+            results=[ResolutionUpdateResponse(**item) for item in result["results"]],
+            not_found=result["not_found"]
+        )
+
+    except LLMOverloadedError:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to update resolutions: {str(e)}"
+        )
+
+
 @router.get("/{bug_id}", response_model=BugDetailResponse)
 async def get_bug(
         bug_id: str,
@@ -116,6 +208,49 @@ async def find_similar_bugs(
         )
 
 
+@router.get("/{bug_id}/similar/stream")
+async def stream_similar_bugs(
+        bug_id: str,
+        threshold: float | None = Query(default=None, ge=0.0, le=1.0),
+        after: str | None = Query(default=None, description="Cursor of the last bug received"),
+        limit: int | None = Query(default=None, ge=1, description="Stop after this many bugs"),
+        conn: AsyncConnection = Depends(get_db_connection),
+        service: BugQueryService = Depends(get_bug_query_service)
+) -> StreamingResponse:
+    """
+    Stream all bugs above the similarity threshold as NDJSON
+
+    For triage tooling that needs every neighbor ("all bugs above 0.8"),
+    not just the top max_similar_bugs. One SimilarBug JSON object per
+    line, best first, each with a "cursor". If the stream is interrupted,
+    call again with after=<last cursor> to continue where it stopped.
+    """
+    try:
+        position = decode_cursor(after) if after else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        embedding = await service.get_query_embedding(conn, bug_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    async def lines():
+        # Own connection: the request one may be released before the body is sent
+        async with get_pool().connection() as stream_conn:
+            async for bug in service.iter_similar_bugs(
+                    conn=stream_conn,
+                    bug_id=bug_id,
+                    embedding=embedding,
+                    similarity_threshold=threshold,
+                    after=position,
+                    limit=limit
+            ):
+                yield json.dumps(bug) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.get("/{bug_id}/mitigation", response_model=MitigationResponse)
 async def get_mitigation_suggestion(
         bug_id: str,
@@ -140,6 +275,8 @@ async def get_mitigation_suggestion(
 
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except LLMOverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -147,6 +284,46 @@ async def get_mitigation_suggestion(
         )
 
 
+@router.get("/{bug_id}/mitigation/stream")
+async def stream_mitigation_suggestion(
+        bug_id: str,
+        use_similar_bugs: bool = True,
+        conn: AsyncConnection = Depends(get_db_connection),
+        service: BugQueryService = Depends(get_bug_query_service)
+) -> StreamingResponse:
+    """
+    Stream a mitigation suggestion as Server-Sent Events
+
+    Emits a `token` event ({"text": ...}) per chunk as the model produces
+    it, then `done` ({"bug_id", "based_on_similar_bugs", "prompt_stats"}), or `error`
+    ({"detail"}) if generation fails midway. An unknown bug is a 404,
+    and an overloaded LLM a 429/503 with Retry-After, before the stream
+    starts.
+    """
+    try:
+        request = await service.prepare_mitigation(
+            conn=conn,
+            bug_id=bug_id,
+            use_similar_bugs=use_similar_bugs
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    done = {
+        "bug_id": bug_id,
+        "based_on_similar_bugs": request["based_on_similar_bugs"],
+        "prompt_stats": request["prompt_stats"]
+    }
+
+    tokens = await start_stream(service.stream_mitigation(request))
+
+    return StreamingResponse(
+        token_events(tokens, done),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+
 @router.patch("/{bug_id}/resolution", response_model=ResolutionUpdateResponse)
 async def update_resolution(
         bug_id: str,
@@ -158,7 +335,9 @@ async def update_resolution(
     Update bug with resolution information
 
     Called by the main BugSpotter app when a bug is resolved.
-    Generates an AI summary of the resolution for future reference.
+    An AI summary of the resolution is queued for the background
+    worker (summary_status "pending"; see GET /bugs/{bug_id}).
+    An unknown bug is a 404.
     """
     try:
         result = await service.update_bug_resolution(
@@ -170,6 +349,10 @@ async def update_resolution(
 
         return ResolutionUpdateResponse(**result)
 
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except LLMOverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
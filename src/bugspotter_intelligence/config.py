@@ -11,17 +11,165 @@ class Settings(BaseSettings):
 
     llm_provider: str = "ollama"
     ollama_base_url: str = "http://localhost:11434"
+    ollama_keep_alive: str = Field(
+        default="30m",
+        description="How long Ollama keeps the model loaded after a request (Ollama duration, e.g. 30m; -1 = forever)"
+    )
+    ollama_warm_up: bool = True  # Load the model at startup instead of on the first request
+    ollama_keep_warm_interval: float = Field(
+        default=600.0,
+        ge=0.0,
+        description="Reload the model after this many idle seconds so it stays resident (0 disables; keep below keep_alive)"
+    )
+    ollama_base_urls: str = Field(
+        default="",
+        description="Comma-separated Ollama servers to route across; overrides ollama_base_url when set"
+    )
     ollama_model: str = "llama3.1:8b"
     ollama_timeout: float = 120.0
+    ollama_max_connections: int = Field(
+        default=20,
+        ge=1,
+        description="Connections in the shared Ollama HTTP pool"
+    )
+    ollama_max_keepalive_connections: int = Field(
+        default=10,
+        ge=0,
+        description="Idle Ollama connections kept open for reuse"
+    )
+    ollama_keepalive_expiry: float = Field(
+        default=30.0,
+        ge=0.0,
+        description="Seconds an idle Ollama connection is kept open"
+    )
+    llm_single_flight_enabled: bool = True  # Identical concurrent LLM requests share one generation
+    llm_max_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="LLM calls run at once (match the backend's parallel slots, e.g. OLLAMA_NUM_PARALLEL)"
+    )
+    llm_max_queue: int = Field(
+        default=32,
+        ge=0,
+        description="Interactive LLM calls allowed to wait; more are rejected with 429"
+    )
+    llm_queue_timeout: float = Field(
+        default=30.0,
+        gt=0.0,
+        description="Seconds an interactive LLM call may wait for a slot before failing with 503"
+    )
+    llm_breaker_failures: int = Field(
+        default=3,
+        ge=1,
+        description="Consecutive failures that take a routed LLM backend out of rotation"
+    )
+    llm_breaker_reset: float = Field(
+        default=30.0,
+        gt=0.0,
+        description="Seconds before a tripped LLM backend gets a trial request"
+    )
+    llm_health_interval: float = Field(
+        default=10.0,
+        ge=0.0,
+        description="Seconds between health checks of routed LLM backends (0 disables)"
+    )
+    llm_hedge_enabled: bool = False  # Retry slow interactive calls on a second backend after the p95 latency
     anthropic_api_key: str | None = None
+    anthropic_base_url: str | None = None  # Override for proxies or local stub servers
     claude_model: str = "claude-sonnet-4-20250514"
     openai_api_key: str | None = None
+    openai_base_url: str | None = None  # Override for OpenAI-compatible servers or local stubs
     openai_model: str = "gpt-4"
+    llm_api_timeout: float = Field(
+        default=60.0,
+        gt=0.0,
+        description="Request timeout in seconds for hosted LLM APIs (claude, openai)"
+    )
+    llm_api_max_retries: int = Field(
+        default=2,
+        ge=0,
+        description="SDK retries on connection errors, 429 and 5xx from hosted LLM APIs"
+    )
     log_level: str = "INFO"
     debug: bool = False
     embedding_provider: str = "local"  # local, openai
     embedding_model: str | None = None  # Provider-specific model name
 
+    #=== Semantic Response Cache Settings ===
+    semantic_cache_enabled: bool = False
+    semantic_cache_threshold: float = Field(
+        default=0.95,
+        ge=0.0,
+        le=1.0,
+        description="Cosine similarity of question embeddings to serve a cached /ask answer (same context only)"
+    )
+    semantic_cache_ttl: float = Field(
+        default=3600.0,
+        gt=0.0,
+        description="Seconds a cached /ask answer is served"
+    )
+    semantic_cache_max_entries: int = Field(
+        default=1000,
+        ge=1,
+        description="Cached /ask answers kept in memory (least recently used are evicted)"
+    )
+
+    #=== Resolution Summary Job Settings ===
+    summary_jobs_enabled: bool = True  # Summarize resolutions in the background instead of in the PATCH request
+    summary_worker_enabled: bool = True  # Run a summary worker inside the API process
+    summary_worker_concurrency: int = Field(
+        default=2,
+        ge=1,
+        description="Summary LLM calls a worker (or a bulk resolution update) runs at once"
+    )
+    summary_batch_size: int = Field(
+        default=8,
+        ge=1,
+        le=50,
+        description="Resolutions summarized per LLM call (one packed prompt, JSON array answer)"
+    )
+    summary_max_attempts: int = Field(
+        default=5,
+        ge=1,
+        description="Attempts before a summary job is marked failed"
+    )
+    summary_retry_backoff: float = Field(
+        default=30.0,
+        ge=0.0,
+        description="Seconds before the first retry, doubled for each further attempt"
+    )
+    summary_poll_interval: float = Field(
+        default=2.0,
+        gt=0.0,
+        description="Seconds an idle worker waits before polling for jobs again"
+    )
+    summary_job_lease: float = Field(
+        default=300.0,
+        gt=0.0,
+        description="Seconds a claimed job stays locked; after that another worker may take it over"
+    )
+
+    #=== Mitigation Cache Settings ===
+    mitigation_cache_enabled: bool = True  # Store suggestions in bug_mitigations, keyed by prompt fingerprint
+
+    #=== Prompt Context Settings ===
+    context_token_budget: int = Field(
+        default=1000,
+        ge=0,
+        description="Estimated tokens of similar-bug context allowed in a mitigation prompt"
+    )
+    context_dedup_threshold: float = Field(
+        default=0.8,
+        ge=0.0,
+        le=1.0,
+        description="Word-shingle Jaccard at which two resolutions count as the same and only one is used"
+    )
+    llm_prefill_tokens_per_second: float = Field(
+        default=100.0,
+        gt=0.0,
+        description="Prompt tokens per second the LLM processes, for reporting prefill time saved"
+    )
+
     #=== Similarity and Deduplication Settings ===
     similarity_threshold: float = Field(
         default=0.75,
@@ -44,6 +192,122 @@ class Settings(BaseSettings):
         description="Maximum number of similar bugs to return"
     )
 
+    #=== Precomputed Neighbor List Settings ===
+    neighbor_lists_enabled: bool = False
+    neighbor_list_size: int = Field(
+        default=20,
+        ge=1,
+        le=100,
+        description="Neighbors stored per bug; reads with a larger limit run a full search"
+    )
+    neighbor_min_similarity: float = Field(
+        default=0.5,
+        ge=0.0,
+        le=1.0,
+        description="Lowest similarity kept in neighbor lists; reads with a lower threshold run a full search"
+    )
+    neighbor_update_candidates: int = Field(
+        default=100,
+        ge=1,
+        description="Nearest bugs checked for a place in their lists when a bug is ingested"
+    )
+
+    #=== Near-Exact Pre-Dedup Settings ===
+    minhash_dedup_enabled: bool = False
+    minhash_bands: int = Field(
+        default=16,
+        ge=1,
+        description="LSH bands per signature (changing bands or rows invalidates stored buckets)"
+    )
+    minhash_rows: int = Field(
+        default=8,
+        ge=1,
+        description="Signature rows per LSH band (signature length = bands * rows)"
+    )
+    minhash_threshold: float = Field(
+        default=0.9,
+        ge=0.0,
+        le=1.0,
+        description="Estimated Jaccard similarity of normalized shingles to reuse a bug's embedding"
+    )
+
+    #=== Binary-Quantized Search Settings ===
+    binary_search_enabled: bool = False
+    binary_rerank_candidates: int = Field(
+        default=100,
+        ge=1,
+        le=1000,
+        description="Candidates from the binary (Hamming) first pass re-ranked with exact cosine (hnsw.ef_search caps it at 1000)"
+    )
+
+    #=== Hybrid Search Settings ===
+    search_mode: str = "vector"  # vector, hybrid (single-bug similar queries; batches stay vector-only)
+    hybrid_candidates: int = Field(
+        default=50,
+        ge=1,
+        description="Top-k taken from each of the vector and lexical rankings before fusion"
+    )
+    hybrid_rrf_k: int = Field(
+        default=60,
+        ge=1,
+        description="Reciprocal rank fusion constant (higher = flatter weighting of top ranks)"
+    )
+    hybrid_max_terms: int = Field(
+        default=32,
+        ge=1,
+        le=256,
+        description="Words of the bug's text ORed into the full-text query (stop words excluded)"
+    )
+
+    #=== In-Memory Vector Index Settings ===
+    vector_index_backend: str = "none"  # none, exact, hnsw
+    embedding_dimension: int = Field(
+        default=384,
+        ge=1,
+        description="Dimension of stored embeddings (must match the bug_embeddings column)"
+    )
+    hnsw_m: int = Field(
+        default=16,
+        ge=2,
+        description="HNSW graph degree (higher = better recall, more memory)"
+    )
+    hnsw_ef_construction: int = Field(
+        default=200,
+        ge=1,
+        description="HNSW build-time candidate list size"
+    )
+    hnsw_ef_search: int = Field(
+        default=64,
+        ge=1,
+        description="HNSW query-time candidate list size"
+    )
+    hnsw_rerank_candidates: int = Field(
+        default=100,
+        ge=0,
+        description="HNSW candidates re-scored with exact cosine before taking the top k (0 = off)"
+    )
+
+    #=== Access Tracking and Tiering Settings ===
+    access_tracking_enabled: bool = True
+    access_flush_interval: float = Field(
+        default=5.0,
+        gt=0.0,
+        description="Seconds between bulk last_accessed writes"
+    )
+    cold_tier_after_months: int = Field(
+        default=6,
+        ge=1,
+        description="Move bugs untouched for this many months to the cold tier"
+    )
+
+    #=== Archive Tier Settings ===
+    archive_search_enabled: bool = False  # Top up short similar-bug results from the archive (extra scan per query)
+    archive_after_months: int = Field(
+        default=12,
+        ge=1,
+        description="Archive finished cold-tier bugs untouched for this many months"
+    )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
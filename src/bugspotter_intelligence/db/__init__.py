@@ -1,4 +1,5 @@
 from .bug_repository import BugRepository
-from .migrations import create_tables
+from .migrations import migrate, verify_schema
+from .summary_job_repository import SummaryJobRepository
 
-__all__ = ["BugRepository", "create_tables"]
+__all__ = ["BugRepository", "SummaryJobRepository", "migrate", "verify_schema"]
@@ -0,0 +1,216 @@
+from typing import Optional
+
+from psycopg import AsyncConnection
+
+from .tiers import pack_payload, restore_archived, unpack_payload
+
+# Statuses that can be archived (open bugs always stay searchable at full precision)
+ARCHIVABLE_STATUSES = ["resolved", "closed", "wont_fix", "duplicate"]
+
+
+class ArchiveRepository:
+    """
+    Data access layer for bug_embeddings_archive
+
+    Archived bugs keep a half-precision (halfvec) embedding and a
+    zlib-compressed payload with their text. They are only searched
+    when the hot tier doesn't return enough results, and move back to
+    the hot tier when they are returned or read by id.
+    """
+
+    @staticmethod
+    async def search(
+            conn: AsyncConnection,
+            embedding: list[float],
+            limit: int = 5,
+            threshold: float = 0.7
+    ) -> list[dict]:
+        """
+        Exact similarity search over archived bugs
+
+        Same result shape as BugRepository.find_similar
+        """
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                SELECT bug_id,
+                       status,
+                       payload,
+                       -(embedding <#> %s::vector::halfvec) as similarity
+                FROM bug_embeddings_archive
+                WHERE -(embedding <#> %s::vector::halfvec) >= %s
+                  AND status != 'duplicate'
+                ORDER BY embedding <#> %s::vector::halfvec
+                    LIMIT %s
+                """,
+                (embedding, embedding, threshold, embedding, limit)
+            )
+
+            rows = await cursor.fetchall()
+
+            results = []
+            for row in rows:
+                payload = unpack_payload(row[2])
+                results.append({
+                    "bug_id": row[0],
+                    "title": payload["title"],
+                    "description": payload["description"],
+                    "status": row[1],
+                    "resolution": payload["resolution"],
+                    "similarity": float(row[3])
+                })
+            return results
+
+    @staticmethod
+    async def get_bug(
+            conn: AsyncConnection,
+            bug_id: str
+    ) -> Optional[dict]:
+        """Get a single archived bug by ID (same shape as BugRepository.get_bug)"""
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                "SELECT bug_id, status, payload FROM bug_embeddings_archive WHERE bug_id = %s",
+                (bug_id,)
+            )
+
+            row = await cursor.fetchone()
+
+            if not row:
+                return None
+
+            return {"bug_id": row[0], "status": row[1], **unpack_payload(row[2])}
+
+    @staticmethod
+    async def rehydrate(
+            conn: AsyncConnection,
+            bug_ids: list[str]
+    ) -> int:
+        """
+        Move archived bugs back to the hot tier
+
+        Embeddings are restored from half precision; the hot row is
+        marked as just accessed so it isn't re-tiered immediately.
+        Returns the number of bugs restored
+        """
+        if not bug_ids:
+            return 0
+
+        async with conn.cursor() as cursor:
+            restored = await restore_archived(cursor, bug_ids)
+            await conn.commit()
+
+            return restored
+
+    @staticmethod
+    async def archive_cold_bugs(
+            conn: AsyncConnection,
+            months: int,
+            batch_size: int = 500
+    ) -> int:
+        """
+        Move one batch of finished cold-tier bugs untouched for `months` to the archive
+
+        Compression happens in Python, so rows are locked, packed and
+        moved within one transaction. Returns the number of bugs archived
+        """
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                SELECT bug_id,
+                       title,
+                       description,
+                       status,
+                       resolution,
+                       resolution_summary,
+                       embedding::text,
+                       created_at,
+                       updated_at,
+                       duplicate_of,
+                       embedding_text,
+                       duplicate_cluster_id
+                FROM bug_embeddings_cold
+                WHERE status = ANY(%s)
+                  AND COALESCE(last_accessed, created_at)
+                      < CURRENT_TIMESTAMP - make_interval(months => %s)
+                ORDER BY bug_id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+                """,
+                (ARCHIVABLE_STATUSES, months, batch_size)
+            )
+
+            rows = await cursor.fetchall()
+
+            if not rows:
+                await conn.commit()
+                return 0
+
+            await cursor.executemany(
+                """
+                INSERT INTO bug_embeddings_archive (bug_id, status, payload, embedding)
+                VALUES (%s, %s, %s, %s::vector::halfvec)
+                ON CONFLICT (bug_id) DO UPDATE SET
+                    status = EXCLUDED.status,
+                    payload = EXCLUDED.payload,
+                    embedding = EXCLUDED.embedding,
+                    archived_at = CURRENT_TIMESTAMP
+                """,
+                [
+                    (
+                        row[0],
+                        row[3],
+                        pack_payload({
+                            "title": row[1],
+                            "description": row[2],
+                            "resolution": row[4],
+                            "resolution_summary": row[5],
+                            "created_at": row[7],
+                            "updated_at": row[8],
+                            "duplicate_of": row[9],
+                            "embedding_text": row[10],
+                            "duplicate_cluster_id": row[11]
+                        }),
+                        row[6]
+                    )
+                    for row in rows
+                ]
+            )
+
+            await cursor.execute(
+                "DELETE FROM bug_embeddings_cold WHERE bug_id = ANY(%s)",
+                ([row[0] for row in rows],)
+            )
+            await conn.commit()
+
+            return len(rows)
+
+    @staticmethod
+    async def storage_report(conn: AsyncConnection) -> list[dict]:
+        """
+        Rows and on-disk size (table + TOAST + indexes) per tier
+
+        Returns:
+            [{"tier": str, "table": str, "rows": int, "total_bytes": int, "bytes_per_row": float}]
+        """
+        tiers = [
+            ("hot", "bug_embeddings"),
+            ("cold", "bug_embeddings_cold"),
+            ("archive", "bug_embeddings_archive"),
+        ]
+
+        report = []
+        async with conn.cursor() as cursor:
+            for tier, table in tiers:
+                await cursor.execute(
+                    f"SELECT count(*), pg_total_relation_size('{table}') FROM {table}"
+                )
+                rows, total_bytes = await cursor.fetchone()
+                report.append({
+                    "tier": tier,
+                    "table": table,
+                    "rows": rows,
+                    "total_bytes": total_bytes,
+                    "bytes_per_row": total_bytes / rows if rows else 0.0
+                })
+
+        return report
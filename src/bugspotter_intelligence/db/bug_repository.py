@@ -1,7 +1,105 @@
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
 from psycopg import AsyncConnection
 from datetime import datetime
 
+from .summary_job_repository import ENQUEUE_SUMMARY_SQL
+from .tiers import TIER_COLUMNS, restore_archived
+
+# Move rows from the cold tier back to the hot tier (params: bug_ids)
+PROMOTE_SQL = f"""
+    WITH moved AS (
+        DELETE FROM bug_embeddings_cold
+        WHERE bug_id = ANY(%s)
+        RETURNING {TIER_COLUMNS}
+    )
+    INSERT INTO bug_embeddings ({TIER_COLUMNS})
+    SELECT {TIER_COLUMNS} FROM moved
+    ON CONFLICT (bug_id) DO NOTHING
+"""
+
+# Drop stored mitigation suggestions generated for a bug or with it as
+# context (params: bug_id, bug_id)
+INVALIDATE_MITIGATIONS_SQL = """
+    DELETE FROM bug_mitigations
+    WHERE bug_id = %s OR context_bug_ids @> ARRAY[%s]
+"""
+
+# The same for several bugs at once (params: bug_ids, bug_ids)
+INVALIDATE_MITIGATIONS_MANY_SQL = """
+    DELETE FROM bug_mitigations
+    WHERE bug_id = ANY(%s) OR context_bug_ids && %s::text[]
+"""
+
+# First stage of binary-quantized search: the nearest candidates by Hamming
+# distance over 1-bit embeddings, served by bug_embeddings_binary_idx. The
+# bit width must match the index expression (params: query embedding,
+# candidate count)
+BINARY_CANDIDATES_SQL = """
+    (SELECT bug_id, title, description, status, resolution, embedding
+     FROM bug_embeddings
+     WHERE status != 'duplicate'
+     ORDER BY binary_quantize(embedding)::bit({dimension}) <~> binary_quantize({query})
+     LIMIT %s)
+"""
+
+# Hybrid search: vector and full-text top-k fused with reciprocal rank fusion.
+# The bug's text is matched as an OR of its first max_terms lexemes (title and
+# description come before logs), English stop words left out so the query stays
+# selective, and ranked by cover density
+HYBRID_SQL = """
+    WITH terms AS (
+        SELECT to_tsquery('simple', string_agg(
+                   '''' || replace(replace(lexeme, '\\', '\\\\'), '''', '''''') || '''', ' | '
+               )) AS query
+        FROM (
+            SELECT lexeme
+            FROM unnest(to_tsvector('simple', %(query_text)s))
+            WHERE length(to_tsvector('english', lexeme)) > 0
+            ORDER BY positions[1]
+            LIMIT %(max_terms)s
+        ) first_terms
+    ),
+    vector_hits AS (
+        SELECT bug_id, row_number() OVER (ORDER BY distance) AS rank
+        FROM (
+            SELECT bug_id, embedding <#> %(embedding)s::vector AS distance
+            FROM bug_embeddings
+            WHERE -(embedding <#> %(embedding)s::vector) >= %(threshold)s
+              AND status != 'duplicate'
+            ORDER BY embedding <#> %(embedding)s::vector
+            LIMIT %(candidates)s
+        ) nearest
+    ),
+    lexical_hits AS (
+        SELECT bug_id, row_number() OVER (ORDER BY score DESC) AS rank
+        FROM (
+            SELECT bug_id, ts_rank_cd(search_vector, terms.query) AS score
+            FROM bug_embeddings
+            CROSS JOIN terms
+            WHERE search_vector @@ terms.query
+              AND status != 'duplicate'
+            ORDER BY score DESC
+            LIMIT %(candidates)s
+        ) matched
+    ),
+    fused AS (
+        SELECT bug_id, SUM(1.0 / (%(rrf_k)s + rank)) AS score
+        FROM (SELECT * FROM vector_hits UNION ALL SELECT * FROM lexical_hits) hits
+        GROUP BY bug_id
+    )
+    SELECT b.bug_id,
+           b.title,
+           b.description,
+           b.status,
+           b.resolution,
+           GREATEST(-(b.embedding <#> %(embedding)s::vector), 0) AS similarity
+    FROM fused f
+    JOIN bug_embeddings b USING (bug_id)
+    ORDER BY f.score DESC, similarity DESC
+    LIMIT %(limit)s
+"""
+
 
 class BugRepository:
     """Data access layer for bug_embeddings table"""
@@ -12,24 +110,52 @@ class BugRepository:
             bug_id: str,
             title: str,
             description: Optional[str],
-            embedding: list[float]
+            embedding: list[float],
+            duplicate_of: Optional[str] = None,
+            embedding_text: Optional[str] = None
     ) -> None:
-        """Insert or update bug embedding"""
+        """
+        Insert or update bug embedding
+
+        With duplicate_of set, the bug is stored with status 'duplicate'
+        in the same statement. Without it, an existing status is kept.
+        Stored mitigations that used the old text are dropped.
+        """
         async with conn.cursor() as cursor:
+            await cursor.execute(INVALIDATE_MITIGATIONS_SQL, (bug_id, bug_id))
+            # A re-analyzed cold or archived bug is hot again, keeping its
+            # status and resolution; no stale copy is left behind
+            await cursor.execute(PROMOTE_SQL, ([bug_id],))
+            await restore_archived(cursor, [bug_id])
             await cursor.execute(
                 """
                 INSERT INTO bug_embeddings
-                    (bug_id, title, description, embedding, last_accessed)
-                VALUES (%s, %s, %s, %s, %s) ON CONFLICT (bug_id) 
+                    (bug_id, title, description, embedding, last_accessed, status, duplicate_of, embedding_text)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s) ON CONFLICT (bug_id) 
                 DO
                 UPDATE SET
                     title = EXCLUDED.title,
                     description = EXCLUDED.description,
                     embedding = EXCLUDED.embedding,
+                    embedding_text = EXCLUDED.embedding_text,
                     updated_at = CURRENT_TIMESTAMP,
-                    last_accessed = EXCLUDED.last_accessed
+                    last_accessed = EXCLUDED.last_accessed,
+                    status = CASE
+                        WHEN EXCLUDED.duplicate_of IS NOT NULL THEN 'duplicate'
+                        ELSE bug_embeddings.status
+                    END,
+                    duplicate_of = COALESCE(EXCLUDED.duplicate_of, bug_embeddings.duplicate_of)
                 """,
-                (bug_id, title, description, embedding, datetime.now())
+                (
+                    bug_id,
+                    title,
+                    description,
+                    embedding,
+                    datetime.now(),
+                    "duplicate" if duplicate_of else "open",
+                    duplicate_of,
+                    embedding_text
+                )
             )
             await conn.commit()
 
@@ -38,30 +164,62 @@ class BugRepository:
             conn: AsyncConnection,
             embedding: list[float],
             limit: int = 5,
-            threshold: float = 0.7
+            threshold: float = 0.7,
+            rerank_candidates: Optional[int] = None,
+            dimension: int = 384,
+            query_text: Optional[str] = None,
+            hybrid_candidates: int = 50,
+            rrf_k: int = 60,
+            hybrid_max_terms: int = 32
     ) -> list[dict]:
         """
         Find similar bugs using vector similarity
 
+        With rerank_candidates set, runs a two-stage search: the nearest
+        candidates by Hamming distance over binary-quantized embeddings,
+        re-ranked with exact cosine similarity on the full vectors.
+        dimension is the embedding column's, the width of the bit
+        strings the binary index is built over.
+
+        With query_text set, runs a hybrid search instead: the top
+        hybrid_candidates by vector similarity (>= threshold) and by
+        full-text match on query_text (an OR of at most hybrid_max_terms
+        of its words), fused with reciprocal rank fusion in one
+        statement. Lexical matches are kept whatever their similarity, so
+        results are ordered by fused rank and may include bugs below
+        threshold.
+
         Returns bugs with similarity score >= threshold
         """
-        async with conn.cursor() as cursor:
-            # Use cosine similarity
+        if query_text is not None:
+            return await BugRepository._find_similar_hybrid(
+                conn, embedding, limit, threshold, query_text, hybrid_candidates, rrf_k, hybrid_max_terms
+            )
+
+        source, source_params, ef_search = "bug_embeddings", (), None
+        if rerank_candidates:
+            source = BINARY_CANDIDATES_SQL.format(dimension=dimension, query="%s::vector") + " AS candidates"
+            ef_search = max(rerank_candidates, limit)
+            source_params = (embedding, ef_search)
+
+        async with _hnsw_ef_search(conn, ef_search), conn.cursor() as cursor:
+            # Embeddings are unit length, so cosine similarity is the inner
+            # product (<#> is its negative) and needs no norms per row
             await cursor.execute(
-                """
+                f"""
                 SELECT bug_id,
                        title,
                        description,
                        status,
                        resolution,
-                       1 - (embedding <=> %s::vector) as similarity
-                FROM bug_embeddings
-                WHERE 1 - (embedding <=> %s::vector) >= %s
+                       -(embedding <#> %s::vector) as similarity
+                FROM {source}
+                WHERE -(embedding <#> %s::vector) >= %s
                   AND status != 'duplicate'
-                ORDER BY embedding <=> %s::vector
+                ORDER BY embedding <#> %s::vector
                     LIMIT %s
                 """,
-                (embedding, embedding, threshold, embedding, limit)
+                (embedding, *source_params, embedding, threshold, embedding, limit)
             )
 
             rows = await cursor.fetchall()
@@ -79,11 +237,172 @@ class BugRepository:
             ]
 
     @staticmethod
-    async def get_bug(
+    async def _find_similar_hybrid(
             conn: AsyncConnection,
-            bug_id: str
-    ) -> Optional[dict]:
-        """Get a single bug by ID"""
+            embedding: list[float],
+            limit: int,
+            threshold: float,
+            query_text: str,
+            candidates: int,
+            rrf_k: int,
+            max_terms: int
+    ) -> list[dict]:
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                HYBRID_SQL,
+                {
+                    "embedding": embedding,
+                    "threshold": threshold,
+                    "query_text": query_text,
+                    "max_terms": max_terms,
+                    "candidates": max(candidates, limit),
+                    "rrf_k": rrf_k,
+                    "limit": limit
+                }
+            )
+
+            rows = await cursor.fetchall()
+
+            return [
+                {
+                    "bug_id": row[0],
+                    "title": row[1],
+                    "description": row[2],
+                    "status": row[3],
+                    "resolution": row[4],
+                    "similarity": float(row[5])
+                }
+                for row in rows
+            ]
+
+    @staticmethod
+    async def get_search_text(conn: AsyncConnection, bug_id: str) -> Optional[str]:
+        """
+        Get the text a bug's embedding was built from (hot or cold tier)
+
+        Falls back to title and description for bugs stored before
+        embedding_text was recorded. Returns None if bug not found
+        """
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                SELECT COALESCE(embedding_text, title || ' ' || COALESCE(description, ''))
+                FROM bug_embeddings WHERE bug_id = %s
+                UNION ALL
+                SELECT COALESCE(embedding_text, title || ' ' || COALESCE(description, ''))
+                FROM bug_embeddings_cold WHERE bug_id = %s
+                LIMIT 1
+                """,
+                (bug_id, bug_id)
+            )
+            row = await cursor.fetchone()
+            return row[0] if row else None
+
+    @staticmethod
+    async def find_similar_batch(
+            conn: AsyncConnection,
+            embeddings: list[list[float]],
+            limit: int = 5,
+            threshold: float = 0.7,
+            rerank_candidates: Optional[int] = None,
+            dimension: int = 384
+    ) -> list[list[dict]]:
+        """
+        Find similar bugs for several embeddings in one round trip
+
+        Runs one KNN subquery per embedding with a LATERAL join
+        (two-stage binary search when rerank_candidates is set, as in find_similar).
+        Returns one result list per embedding, in input order.
+        """
+        if not embeddings:
+            return []
+
+        source, source_params, ef_search = "bug_embeddings", (), None
+        if rerank_candidates:
+            source = BINARY_CANDIDATES_SQL.format(dimension=dimension, query="q.embedding")
+            ef_search = max(rerank_candidates, limit)
+            source_params = (ef_search,)
+
+        async with _hnsw_ef_search(conn, ef_search), conn.cursor() as cursor:
+            await cursor.execute(
+                f"""
+                SELECT q.ord,
+                       b.bug_id,
+                       b.title,
+                       b.description,
+                       b.status,
+                       b.resolution,
+                       b.similarity
+                FROM unnest(%s::vector[]) WITH ORDINALITY AS q(embedding, ord)
+                CROSS JOIN LATERAL (
+                    SELECT bug_id,
+                           title,
+                           description,
+                           status,
+                           resolution,
+                           -(e.embedding <#> q.embedding) as similarity
+                    FROM {source} e
+                    WHERE -(e.embedding <#> q.embedding) >= %s
+                      AND e.status != 'duplicate'
+                    ORDER BY e.embedding <#> q.embedding
+                        LIMIT %s
+                ) b
+                ORDER BY q.ord, b.similarity DESC
+                """,
+                ([_vector_literal(e) for e in embeddings], *source_params, threshold, limit)
+            )
+
+            rows = await cursor.fetchall()
+
+            results: list[list[dict]] = [[] for _ in embeddings]
+            for row in rows:
+                results[row[0] - 1].append({
+                    "bug_id": row[1],
+                    "title": row[2],
+                    "description": row[3],
+                    "status": row[4],
+                    "resolution": row[5],
+                    "similarity": float(row[6])
+                })
+
+            return results
+
+    @staticmethod
+    async def get_embeddings(
+            conn: AsyncConnection,
+            bug_ids: list[str]
+    ) -> dict[str, list[float]]:
+        """Get embeddings for several bugs (missing ids are omitted)"""
+        if not bug_ids:
+            return {}
+
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                SELECT bug_id, embedding::real[]
+                FROM bug_embeddings
+                WHERE bug_id = ANY(%s) AND embedding IS NOT NULL
+                """,
+                (bug_ids,)
+            )
+
+            rows = await cursor.fetchall()
+
+            return {row[0]: list(row[1]) for row in rows}
+
+    @staticmethod
+    async def get_bugs_by_ids(
+            conn: AsyncConnection,
+            bug_ids: list[str]
+    ) -> dict[str, dict]:
+        """
+        Get search-result fields for several bugs in one primary-key lookup
+
+        Returns a mapping of bug_id -> bug (missing ids are omitted)
+        """
+        if not bug_ids:
+            return {}
+
         async with conn.cursor() as cursor:
             await cursor.execute(
                 """
@@ -91,18 +410,192 @@ class BugRepository:
                        title,
                        description,
                        status,
-                       resolution,
-                       resolution_summary,
-                       created_at,
-                       updated_at
+                       resolution
                 FROM bug_embeddings
-                WHERE bug_id = %s
+                WHERE bug_id = ANY(%s)
+                """,
+                (bug_ids,)
+            )
+
+            rows = await cursor.fetchall()
+
+            return {
+                row[0]: {
+                    "bug_id": row[0],
+                    "title": row[1],
+                    "description": row[2],
+                    "status": row[3],
+                    "resolution": row[4]
+                }
+                for row in rows
+            }
+
+    @staticmethod
+    async def get_embedding(
+            conn: AsyncConnection,
+            bug_id: str
+    ) -> Optional[tuple[list[float], str]]:
+        """
+        Get a bug's embedding and status
+
+        Returns (embedding, status) or None if the bug has no embedding
+        """
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                SELECT embedding::real[], status
+                FROM bug_embeddings
+                WHERE bug_id = %s AND embedding IS NOT NULL
                 """,
                 (bug_id,)
             )
 
             row = await cursor.fetchone()
 
+            if not row:
+                return None
+
+            return list(row[0]), row[1]
+
+    @staticmethod
+    async def iter_embeddings(
+            conn: AsyncConnection,
+            batch_size: int = 5000
+    ) -> AsyncIterator[list[tuple[str, list[float], str]]]:
+        """
+        Stream all (bug_id, embedding, status) rows in batches
+
+        Bugs marked as duplicates are left out: searches never return
+        them. Uses a server-side cursor so the full table is never held
+        in memory
+        """
+        async with conn.transaction():
+            async with conn.cursor(name="bug_embeddings_scan") as cursor:
+                await cursor.execute(
+                    """
+                    SELECT bug_id, embedding::real[], status
+                    FROM bug_embeddings
+                    WHERE embedding IS NOT NULL
+                      AND status != 'duplicate'
+                    """
+                )
+
+                while rows := await cursor.fetchmany(batch_size):
+                    yield [(row[0], list(row[1]), row[2]) for row in rows]
+
+    @staticmethod
+    async def count_embeddings(conn: AsyncConnection) -> int:
+        """Number of rows iter_embeddings would stream right now"""
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                SELECT COUNT(*)
+                FROM bug_embeddings
+                WHERE embedding IS NOT NULL
+                  AND status != 'duplicate'
+                """
+            )
+            return (await cursor.fetchone())[0]
+
+    @staticmethod
+    async def iter_similar(
+            conn: AsyncConnection,
+            embedding: list[float],
+            threshold: float = 0.7,
+            after: Optional[tuple[float, str]] = None,
+            batch_size: int = 500
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Stream every bug with similarity >= threshold, best first, in batches
+
+        Rows are ordered by (cosine distance, bug_id) and each result carries
+        its "distance", so a stream can resume after the last row seen by
+        passing it as `after`. Uses a server-side cursor, so memory stays
+        constant however many bugs match. The ANN index is bypassed: it only
+        visits a few lists/neighbors and would silently truncate large sets.
+        """
+        keyset = ""
+        params: tuple = (embedding, embedding, threshold)
+        if after is not None:
+            keyset = "AND (1 + (embedding <#> %s::vector), bug_id) > (%s, %s)"
+            params += (embedding, *after)
+
+        async with conn.transaction():
+            await conn.execute("SET LOCAL enable_indexscan = off")
+
+            async with conn.cursor(name="bug_embeddings_similar") as cursor:
+                await cursor.execute(
+                    f"""
+                    SELECT bug_id,
+                           title,
+                           description,
+                           status,
+                           resolution,
+                           1 + (embedding <#> %s::vector) as distance
+                    FROM bug_embeddings
+                    WHERE -(embedding <#> %s::vector) >= %s
+                      AND status != 'duplicate'
+                      {keyset}
+                    ORDER BY distance, bug_id
+                    """,
+                    params
+                )
+
+                while rows := await cursor.fetchmany(batch_size):
+                    yield [
+                        {
+                            "bug_id": row[0],
+                            "title": row[1],
+                            "description": row[2],
+                            "status": row[3],
+                            "resolution": row[4],
+                            "similarity": 1 - float(row[5]),
+                            "distance": float(row[5])
+                        }
+                        for row in rows
+                    ]
+
+    @staticmethod
+    async def get_bug(
+            conn: AsyncConnection,
+            bug_id: str
+    ) -> Optional[dict]:
+        """Get a single bug by ID, with the state of its summary job"""
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                SELECT t.*, j.status
+                FROM (
+                    SELECT bug_id,
+                           title,
+                           description,
+                           status,
+                           resolution,
+                           resolution_summary,
+                           created_at,
+                           updated_at
+                    FROM bug_embeddings
+                    WHERE bug_id = %s
+                    UNION ALL
+                    SELECT bug_id,
+                           title,
+                           description,
+                           status,
+                           resolution,
+                           resolution_summary,
+                           created_at,
+                           updated_at
+                    FROM bug_embeddings_cold
+                    WHERE bug_id = %s
+                    LIMIT 1
+                ) t
+                LEFT JOIN summary_jobs j USING (bug_id)
+                """,
+                (bug_id, bug_id)
+            )
+
+            row = await cursor.fetchone()
+
             if not row:
                 return None
 
@@ -114,19 +607,57 @@ class BugRepository:
                 "resolution": row[4],
                 "resolution_summary": row[5],
                 "created_at": row[6],
-                "updated_at": row[7]
+                "updated_at": row[7],
+                "summary_status": row[8]
             }
 
+    @staticmethod
+    async def get_resolution_summaries(conn: AsyncConnection, bug_ids: list[str]) -> dict[str, str]:
+        """resolution_summary by bug_id, for those of the bugs that have one"""
+        if not bug_ids:
+            return {}
+
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                SELECT bug_id, resolution_summary
+                FROM bug_embeddings
+                WHERE bug_id = ANY(%s) AND resolution_summary IS NOT NULL
+                UNION ALL
+                SELECT bug_id, resolution_summary
+                FROM bug_embeddings_cold
+                WHERE bug_id = ANY(%s) AND resolution_summary IS NOT NULL
+                """,
+                (bug_ids, bug_ids)
+            )
+
+            rows = await cursor.fetchall()
+
+            return {row[0]: row[1] for row in rows}
+
     @staticmethod
     async def update_resolution(
             conn: AsyncConnection,
             bug_id: str,
             resolution: str,
             resolution_summary: Optional[str] = None,
-            status: str = "resolved"
-    ) -> None:
-        """Update bug resolution information"""
+            status: str = "resolved",
+            queue_summary: bool = False
+    ) -> bool:
+        """
+        Update bug resolution information
+
+        With queue_summary, a summary job for the new resolution is queued
+        in the same transaction. Stored mitigations for the bug or using
+        it as context are dropped.
+
+        Returns whether the bug exists (nothing is written if it doesn't)
+        """
         async with conn.cursor() as cursor:
+            await cursor.execute(INVALIDATE_MITIGATIONS_SQL, (bug_id, bug_id))
+            # Resolving a cold or archived bug brings it back to the hot tier
+            await cursor.execute(PROMOTE_SQL, ([bug_id],))
+            await restore_archived(cursor, [bug_id])
             await cursor.execute(
                 """
                 UPDATE bug_embeddings
@@ -138,4 +669,552 @@ class BugRepository:
                 """,
                 (resolution, resolution_summary, status, bug_id)
             )
-            await conn.commit()
\ No newline at end of file
+            if cursor.rowcount == 0:
+                await conn.rollback()
+                return False
+
+            if queue_summary:
+                await cursor.execute(ENQUEUE_SUMMARY_SQL, (bug_id, resolution))
+            await conn.commit()
+
+            return True
+
+    @staticmethod
+    async def update_resolutions(
+            conn: AsyncConnection,
+            updates: list[dict],
+            queue_summaries: bool = False
+    ) -> list[str]:
+        """
+        Update several bugs' resolutions in one transaction
+
+        Args:
+            updates: {"bug_id", "resolution", "status", "resolution_summary"}
+                per bug; bug ids must be unique
+            queue_summaries: Queue a summary job for each updated bug
+
+        Returns the ids of the bugs that were updated (unknown ids are skipped)
+        """
+        if not updates:
+            return []
+
+        bug_ids = [u["bug_id"] for u in updates]
+
+        async with conn.cursor() as cursor:
+            await cursor.execute(INVALIDATE_MITIGATIONS_MANY_SQL, (bug_ids, bug_ids))
+            await cursor.execute(PROMOTE_SQL, (bug_ids,))
+            await restore_archived(cursor, bug_ids)
+            await cursor.execute(
+                """
+                UPDATE bug_embeddings b
+                SET resolution         = u.resolution,
+                    resolution_summary = u.resolution_summary,
+                    status             = u.status,
+                    updated_at         = CURRENT_TIMESTAMP
+                FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[])
+                    AS u(bug_id, resolution, resolution_summary, status)
+                WHERE b.bug_id = u.bug_id
+                RETURNING b.bug_id
+                """,
+                (
+                    bug_ids,
+                    [u["resolution"] for u in updates],
+                    [u.get("resolution_summary") for u in updates],
+                    [u["status"] for u in updates]
+                )
+            )
+            updated = [row[0] for row in await cursor.fetchall()]
+
+            if queue_summaries and updated:
+                resolutions = {u["bug_id"]: u["resolution"] for u in updates}
+                await cursor.executemany(
+                    ENQUEUE_SUMMARY_SQL,
+                    [(bug_id, resolutions[bug_id]) for bug_id in updated]
+                )
+            await conn.commit()
+
+            return updated
+
+    @staticmethod
+    async def touch_bugs(
+            conn: AsyncConnection,
+            bug_ids: list[str]
+    ) -> int:
+        """
+        Record access to several bugs in one statement
+
+        Sets last_accessed on hot rows and promotes accessed cold rows
+        back to the hot tier. Rows locked by another writer are skipped
+        (access times are approximate, so waiting isn't worth it).
+
+        Returns the number of hot rows touched
+        """
+        if not bug_ids:
+            return 0
+
+        bug_ids = sorted(set(bug_ids))
+
+        async with conn.cursor() as cursor:
+            await cursor.execute(PROMOTE_SQL, (bug_ids,))
+            await cursor.execute(
+                """
+                UPDATE bug_embeddings b
+                SET last_accessed = CURRENT_TIMESTAMP
+                FROM (
+                    SELECT bug_id
+                    FROM bug_embeddings
+                    WHERE bug_id = ANY(%s)
+                    ORDER BY bug_id
+                    FOR UPDATE SKIP LOCKED
+                ) t
+                WHERE b.bug_id = t.bug_id
+                """,
+                (bug_ids,)
+            )
+            touched = cursor.rowcount
+            await conn.commit()
+
+            return touched
+
+    @staticmethod
+    async def demote_stale_bugs(
+            conn: AsyncConnection,
+            months: int,
+            batch_size: int = 1000
+    ) -> int:
+        """
+        Move one batch of bugs untouched for `months` to the cold tier
+
+        Bugs never accessed since insert are aged by created_at.
+        Returns the number of bugs moved (0 when nothing is left)
+        """
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                f"""
+                WITH stale AS (
+                    SELECT bug_id
+                    FROM bug_embeddings
+                    WHERE COALESCE(last_accessed, created_at)
+                          < CURRENT_TIMESTAMP - make_interval(months => %s)
+                    ORDER BY bug_id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                ), moved AS (
+                    DELETE FROM bug_embeddings b
+                    USING stale
+                    WHERE b.bug_id = stale.bug_id
+                    RETURNING b.*
+                )
+                INSERT INTO bug_embeddings_cold ({TIER_COLUMNS})
+                SELECT {TIER_COLUMNS} FROM moved
+                """,
+                (months, batch_size)
+            )
+            moved = cursor.rowcount
+            await conn.commit()
+
+            return moved
+
+    @staticmethod
+    async def get_neighbors(
+            conn: AsyncConnection,
+            bug_id: str,
+            threshold: float,
+            limit: int,
+            list_size: int
+    ) -> Optional[list[dict]]:
+        """
+        Answer a similar-bugs query from the precomputed neighbor list
+
+        One primary-key lookup on bug_neighbors joined to the neighbors'
+        current rows (bugs since marked duplicate or moved out of the hot
+        tier are skipped). Results have the find_similar shape.
+
+        Returns None when the list can't answer: not computed, or full
+        (list_size entries), entirely above the threshold and with too few
+        entries left, so matches may have been cut off at the Kth neighbor
+        """
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                SELECT q.neighbors_computed_at IS NOT NULL,
+                       n.stored,
+                       n.weakest,
+                       e.bug_id,
+                       e.title,
+                       e.description,
+                       e.status,
+                       e.resolution,
+                       n.similarity
+                FROM bug_embeddings q
+                LEFT JOIN LATERAL (
+                    SELECT x.neighbor_id,
+                           x.similarity,
+                           count(*) OVER () AS stored,
+                           min(x.similarity) OVER () AS weakest
+                    FROM bug_neighbors x
+                    WHERE x.bug_id = q.bug_id
+                ) n ON true
+                LEFT JOIN bug_embeddings e
+                    ON e.bug_id = n.neighbor_id
+                   AND e.status != 'duplicate'
+                   AND n.similarity >= %s
+                WHERE q.bug_id = %s
+                ORDER BY n.similarity DESC NULLS LAST, e.bug_id
+                """,
+                (threshold, bug_id)
+            )
+
+            rows = await cursor.fetchall()
+
+            if not rows or not rows[0][0]:
+                return None
+
+            stored, weakest = rows[0][1] or 0, rows[0][2]
+            neighbors = [
+                {
+                    "bug_id": row[3],
+                    "title": row[4],
+                    "description": row[5],
+                    "status": row[6],
+                    "resolution": row[7],
+                    "similarity": float(row[8])
+                }
+                for row in rows if row[3] is not None
+            ][:limit]
+
+            truncated = stored >= list_size and weakest >= threshold
+            if len(neighbors) < limit and truncated:
+                return None
+
+            return neighbors
+
+    @staticmethod
+    async def store_neighbors(
+            conn: AsyncConnection,
+            bug_id: str,
+            neighbors: list[dict]
+    ) -> None:
+        """
+        Replace a bug's neighbor list and mark it as computed
+
+        Only hot-tier bugs keep lists; for other bugs this is a no-op
+        """
+        async with conn.cursor() as cursor:
+            await cursor.execute("DELETE FROM bug_neighbors WHERE bug_id = %s", (bug_id,))
+            await cursor.execute(
+                """
+                INSERT INTO bug_neighbors (bug_id, neighbor_id, similarity)
+                SELECT b.bug_id, n.neighbor_id, n.similarity
+                FROM bug_embeddings b
+                CROSS JOIN unnest(%s::text[], %s::real[]) AS n(neighbor_id, similarity)
+                WHERE b.bug_id = %s
+                """,
+                ([n["bug_id"] for n in neighbors], [n["similarity"] for n in neighbors], bug_id)
+            )
+            await cursor.execute(
+                "UPDATE bug_embeddings SET neighbors_computed_at = CURRENT_TIMESTAMP WHERE bug_id = %s",
+                (bug_id,)
+            )
+            await conn.commit()
+
+    @staticmethod
+    async def add_reverse_neighbors(
+            conn: AsyncConnection,
+            bug_id: str,
+            neighbors: list[dict],
+            list_size: int
+    ) -> int:
+        """
+        Insert a new bug into its neighbors' lists where it makes their top K
+
+        The bug goes into every computed list that has fewer than
+        list_size entries or whose weakest entry it beats; those lists
+        are then trimmed back to list_size.
+
+        Returns the number of lists updated
+        """
+        if not neighbors:
+            return 0
+
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                INSERT INTO bug_neighbors (bug_id, neighbor_id, similarity)
+                SELECT n.owner_id, %s, n.similarity
+                FROM unnest(%s::text[], %s::real[]) AS n(owner_id, similarity)
+                JOIN bug_embeddings b
+                    ON b.bug_id = n.owner_id
+                   AND b.neighbors_computed_at IS NOT NULL
+                CROSS JOIN LATERAL (
+                    SELECT count(*) AS stored, min(x.similarity) AS weakest
+                    FROM bug_neighbors x
+                    WHERE x.bug_id = n.owner_id
+                ) current
+                WHERE current.stored < %s OR n.similarity > current.weakest
+                ON CONFLICT (bug_id, neighbor_id) DO UPDATE SET similarity = EXCLUDED.similarity
+                RETURNING bug_id
+                """,
+                (
+                    bug_id,
+                    [n["bug_id"] for n in neighbors],
+                    [n["similarity"] for n in neighbors],
+                    list_size
+                )
+            )
+            updated = [row[0] for row in await cursor.fetchall()]
+
+            if updated:
+                await cursor.execute(
+                    """
+                    DELETE FROM bug_neighbors x
+                    USING (
+                        SELECT bug_id,
+                               neighbor_id,
+                               row_number() OVER (
+                                   PARTITION BY bug_id ORDER BY similarity DESC, neighbor_id
+                               ) AS rank
+                        FROM bug_neighbors
+                        WHERE bug_id = ANY(%s)
+                    ) ranked
+                    WHERE x.bug_id = ranked.bug_id
+                      AND x.neighbor_id = ranked.neighbor_id
+                      AND ranked.rank > %s
+                    """,
+                    (updated, list_size)
+                )
+            await conn.commit()
+
+            return len(updated)
+
+    @staticmethod
+    async def invalidate_neighbors(
+            conn: AsyncConnection,
+            bug_id: str
+    ) -> None:
+        """
+        Drop a bug's neighbor list and every list it appears in
+
+        Called before a bug's embedding changes: the lists that contain
+        it hold a stale similarity, so they are marked for recomputation
+        """
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                UPDATE bug_embeddings
+                SET neighbors_computed_at = NULL
+                WHERE bug_id = %s
+                   OR bug_id IN (SELECT bug_id FROM bug_neighbors WHERE neighbor_id = %s)
+                """,
+                (bug_id, bug_id)
+            )
+            await cursor.execute(
+                "DELETE FROM bug_neighbors WHERE bug_id = %s OR neighbor_id = %s",
+                (bug_id, bug_id)
+            )
+            await conn.commit()
+
+    @staticmethod
+    async def find_near_exact_candidates(
+            conn: AsyncConnection,
+            bug_id: str,
+            buckets: list[int],
+            limit: int = 20
+    ) -> list[dict]:
+        """
+        Hot, non-duplicate bugs sharing an LSH bucket with a signature
+
+        buckets[i] is the key of band i. Candidates sharing the most
+        bands come first; callers verify them against the full signature.
+        """
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                SELECT m.bug_id, m.signature, b.embedding
+                FROM (
+                    SELECT bug_id, count(*) AS shared
+                    FROM bug_lsh_bands
+                    WHERE (band, bucket) IN (
+                        SELECT * FROM unnest(%s::smallint[], %s::bigint[])
+                    )
+                      AND bug_id != %s
+                    GROUP BY bug_id
+                    ORDER BY shared DESC
+                    LIMIT %s
+                ) c
+                JOIN bug_minhash m USING (bug_id)
+                JOIN bug_embeddings b USING (bug_id)
+                WHERE b.status != 'duplicate'
+                ORDER BY c.shared DESC
+                """,
+                (list(range(len(buckets))), buckets, bug_id, limit)
+            )
+
+            rows = await cursor.fetchall()
+
+            return [
+                {"bug_id": row[0], "signature": row[1], "embedding": row[2]}
+                for row in rows
+            ]
+
+    @staticmethod
+    async def store_minhash(
+            conn: AsyncConnection,
+            bug_id: str,
+            signature: list[int],
+            buckets: list[int]
+    ) -> None:
+        """Replace a bug's MinHash signature and LSH band buckets"""
+        async with conn.cursor() as cursor:
+            await cursor.execute("DELETE FROM bug_lsh_bands WHERE bug_id = %s", (bug_id,))
+            await cursor.execute(
+                """
+                INSERT INTO bug_minhash (bug_id, signature)
+                VALUES (%s, %s) ON CONFLICT (bug_id)
+                DO UPDATE SET signature = EXCLUDED.signature
+                """,
+                (bug_id, signature)
+            )
+            await cursor.execute(
+                """
+                INSERT INTO bug_lsh_bands (band, bucket, bug_id)
+                SELECT band - 1, bucket, %s
+                FROM unnest(%s::bigint[]) WITH ORDINALITY AS b(bucket, band)
+                ON CONFLICT DO NOTHING
+                """,
+                (bug_id, buckets)
+            )
+            await conn.commit()
+
+    @staticmethod
+    async def get_mitigation(
+            conn: AsyncConnection,
+            bug_id: str,
+            use_similar_bugs: bool
+    ) -> Optional[dict]:
+        """Stored mitigation suggestion for a bug, or None"""
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                SELECT model, fingerprint, suggestion, based_on_similar_bugs
+                FROM bug_mitigations
+                WHERE bug_id = %s AND use_similar_bugs = %s
+                """,
+                (bug_id, use_similar_bugs)
+            )
+
+            row = await cursor.fetchone()
+
+            if not row:
+                return None
+
+            return {
+                "model": row[0],
+                "fingerprint": row[1],
+                "mitigation_suggestion": row[2],
+                "based_on_similar_bugs": row[3]
+            }
+
+    @staticmethod
+    async def store_mitigation(
+            conn: AsyncConnection,
+            bug_id: str,
+            use_similar_bugs: bool,
+            model: str,
+            fingerprint: str,
+            suggestion: str,
+            based_on_similar_bugs: bool,
+            context_bug_ids: list[str]
+    ) -> None:
+        """Insert or replace a bug's stored mitigation suggestion"""
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                INSERT INTO bug_mitigations
+                    (bug_id, use_similar_bugs, model, fingerprint, suggestion, based_on_similar_bugs, context_bug_ids)
+                VALUES (%s, %s, %s, %s, %s, %s, %s) ON CONFLICT (bug_id, use_similar_bugs)
+                DO UPDATE SET
+                    model = EXCLUDED.model,
+                    fingerprint = EXCLUDED.fingerprint,
+                    suggestion = EXCLUDED.suggestion,
+                    based_on_similar_bugs = EXCLUDED.based_on_similar_bugs,
+                    context_bug_ids = EXCLUDED.context_bug_ids,
+                    created_at = CURRENT_TIMESTAMP
+                """,
+                (bug_id, use_similar_bugs, model, fingerprint, suggestion, based_on_similar_bugs, context_bug_ids)
+            )
+            await conn.commit()
+
+    @staticmethod
+    async def write_duplicate_clusters(
+            conn: AsyncConnection,
+            clusters: dict[str, str]
+    ) -> int:
+        """
+        Replace all duplicate cluster assignments in bulk
+
+        Args:
+            clusters: bug_id -> cluster_id for every clustered bug;
+                bugs not listed are cleared (no near-duplicates)
+
+        Streams the assignments with COPY into a temp table and applies
+        them with one UPDATE join. Returns the number of bugs assigned
+        """
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                CREATE TEMP TABLE duplicate_clusters
+                (
+                    bug_id     TEXT PRIMARY KEY,
+                    cluster_id TEXT NOT NULL
+                ) ON COMMIT DROP
+                """
+            )
+
+            async with cursor.copy("COPY duplicate_clusters (bug_id, cluster_id) FROM STDIN") as copy:
+                for bug_id, cluster_id in clusters.items():
+                    await copy.write_row((bug_id, cluster_id))
+
+            await cursor.execute(
+                """
+                UPDATE bug_embeddings b
+                SET duplicate_cluster_id = NULL
+                WHERE b.duplicate_cluster_id IS NOT NULL
+                  AND NOT EXISTS (SELECT 1 FROM duplicate_clusters c WHERE c.bug_id = b.bug_id)
+                """
+            )
+
+            await cursor.execute(
+                """
+                UPDATE bug_embeddings b
+                SET duplicate_cluster_id = c.cluster_id
+                FROM duplicate_clusters c
+                WHERE b.bug_id = c.bug_id
+                  AND b.duplicate_cluster_id IS DISTINCT FROM c.cluster_id
+                """
+            )
+            await conn.commit()
+
+            return len(clusters)
+
+
+@asynccontextmanager
+async def _hnsw_ef_search(conn: AsyncConnection, ef_search: Optional[int]) -> AsyncIterator[None]:
+    """
+    Transaction in which HNSW scans keep ef_search candidates
+
+    An HNSW scan returns at most hnsw.ef_search rows (40 by default), so a
+    LIMIT above it is silently cut short. Does nothing when ef_search is None.
+    """
+    if ef_search is None:
+        yield
+        return
+
+    async with conn.transaction():
+        await conn.execute(f"SET LOCAL hnsw.ef_search = {int(ef_search)}")
+        yield
+
+
+def _vector_literal(embedding: list[float]) -> str:
+    """Format an embedding as a pgvector text literal ('[0.1,0.2,...]')"""
+    return "[" + ",".join(str(float(x)) for x in embedding) + "]"
@@ -0,0 +1,5 @@
+"""Database migrations and schema setup"""
+
+from .runner import SchemaVersionError, get_schema_version, latest_version, migrate, verify_schema
+
+__all__ = ["SchemaVersionError", "get_schema_version", "latest_version", "migrate", "verify_schema"]
@@ -0,0 +1,228 @@
+"""
+Versioned schema migrations
+
+Migrations live in the versions package as modules named
+v<NNNN>_<name>.py, each with an `async def upgrade(conn)`. A module may
+set `TRANSACTIONAL = False` to run outside a transaction, which
+statements like CREATE INDEX CONCURRENTLY need; such a migration must
+be safe to re-run if it fails halfway.
+
+Applied versions are recorded in schema_version. Runs are serialized
+with a Postgres advisory lock, so several deploys starting the runner
+at once apply each migration exactly once.
+
+Usage:
+    python -m bugspotter_intelligence.db.migrations.runner           # upgrade to latest
+    python -m bugspotter_intelligence.db.migrations.runner --check   # exit 1 if behind
+"""
+
+import argparse
+import asyncio
+import importlib
+import logging
+import pkgutil
+import re
+import sys
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from psycopg import AsyncConnection
+
+from bugspotter_intelligence.config import Settings
+from . import versions
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_lock key held while migrating (arbitrary, fixed for this app)
+ADVISORY_LOCK_KEY = 7_104_391_226_410_527
+
+_MODULE_NAME = re.compile(r"v(\d{4})_(\w+)")
+
+
+class SchemaVersionError(RuntimeError):
+    """The database schema is older than this build needs"""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[AsyncConnection], Awaitable[None]]
+    transactional: bool = True
+
+
+def load_migrations() -> list[Migration]:
+    """
+    All migrations in the versions package, in version order
+
+    Raises:
+        ValueError: If versions are duplicated or not contiguous from 1
+    """
+    migrations = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        match = _MODULE_NAME.fullmatch(module_info.name)
+        if not match:
+            continue
+
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        migrations.append(Migration(
+            version=int(match.group(1)),
+            name=match.group(2),
+            upgrade=module.upgrade,
+            transactional=getattr(module, "TRANSACTIONAL", True)
+        ))
+
+    migrations.sort(key=lambda m: m.version)
+    found = [m.version for m in migrations]
+    if found != list(range(1, len(migrations) + 1)):
+        raise ValueError(f"Migration versions must run 1..N without gaps or duplicates, found {found}")
+
+    return migrations
+
+
+def latest_version() -> int:
+    """Schema version this build expects"""
+    migrations = load_migrations()
+    return migrations[-1].version if migrations else 0
+
+
+async def get_schema_version(conn: AsyncConnection) -> int:
+    """Highest applied migration, 0 for a database never migrated"""
+    async with conn.cursor() as cursor:
+        await cursor.execute("SELECT to_regclass('schema_version') IS NOT NULL")
+        if not (await cursor.fetchone())[0]:
+            return 0
+
+        await cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        return (await cursor.fetchone())[0]
+
+
+async def verify_schema(conn: AsyncConnection) -> int:
+    """
+    Check the database is migrated far enough for this build
+
+    A newer schema is accepted (migrations are additive, and old
+    instances keep serving during a rolling deploy).
+
+    Returns the database's schema version
+
+    Raises:
+        SchemaVersionError: If migrations are pending
+    """
+    current = await get_schema_version(conn)
+    expected = latest_version()
+
+    if current < expected:
+        raise SchemaVersionError(
+            f"Database schema is at version {current}, this build needs {expected}; "
+            f"run bugspotter-migrate"
+        )
+    if current > expected:
+        logger.warning(f"Database schema version {current} is newer than this build ({expected})")
+
+    return current
+
+
+async def migrate(conn: AsyncConnection, target: Optional[int] = None) -> list[int]:
+    """
+    Apply pending migrations up to target (default: latest)
+
+    conn must be in autocommit mode: each transactional migration runs
+    in its own transaction, the others run statement by statement.
+
+    Returns the versions applied
+    """
+    if not conn.autocommit:
+        raise ValueError("migrate() needs a connection in autocommit mode")
+
+    migrations = load_migrations()
+    if target is None:
+        target = migrations[-1].version if migrations else 0
+
+    await conn.execute("SELECT pg_advisory_lock(%s)", (ADVISORY_LOCK_KEY,))
+    try:
+        await conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_version
+            (
+                version    INTEGER PRIMARY KEY,
+                name       TEXT NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+
+        # Read under the lock: another runner may have just finished
+        current = await get_schema_version(conn)
+        applied = []
+
+        for migration in migrations:
+            if not current < migration.version <= target:
+                continue
+
+            logger.info(f"Applying migration {migration.version:04d}_{migration.name}")
+            if migration.transactional:
+                async with conn.transaction():
+                    await migration.upgrade(conn)
+                    await _record(conn, migration)
+            else:
+                await migration.upgrade(conn)
+                await _record(conn, migration)
+            applied.append(migration.version)
+
+        return applied
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock(%s)", (ADVISORY_LOCK_KEY,))
+
+
+async def run(settings: Settings, target: Optional[int] = None, check: bool = False) -> int:
+    """
+    Migrate (or with check, only compare versions)
+
+    Returns a process exit code
+    """
+    async with await AsyncConnection.connect(settings.database_url, autocommit=True) as conn:
+        if check:
+            current, expected = await get_schema_version(conn), latest_version()
+            logger.info(f"Schema version {current}, latest {expected}")
+            return 0 if current >= expected else 1
+
+        applied = await migrate(conn, target)
+        current = await get_schema_version(conn)
+
+    if applied:
+        logger.info(f"Applied {len(applied)} migrations, schema is at version {current}")
+    else:
+        logger.info(f"Schema is up to date at version {current}")
+    return 0
+
+
+def main() -> None:
+    settings = Settings()
+
+    parser = argparse.ArgumentParser(description="Apply database schema migrations")
+    parser.add_argument("--target", type=int, default=None, help="Stop at this version (default: latest)")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Don't migrate; exit 1 if migrations are pending"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=settings.log_level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    sys.exit(asyncio.run(run(settings, args.target, args.check)))
+
+
+async def _record(conn: AsyncConnection, migration: Migration) -> None:
+    await conn.execute(
+        "INSERT INTO schema_version (version, name) VALUES (%s, %s)",
+        (migration.version, migration.name)
+    )
+
+
+if __name__ == "__main__":
+    main()
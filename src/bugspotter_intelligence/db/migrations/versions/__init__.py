@@ -0,0 +1 @@
+"""Schema migrations, applied in order by the migration runner (v<NNNN>_<name>.py)"""
@@ -1,14 +1,16 @@
-"""Database migrations and schema setup"""
+"""
+Initial schema: what create_tables set up at startup before migrations
 
-from psycopg import AsyncConnection
+The bug_embeddings table with its ivfflat, status and last_accessed
+indexes. Every statement is idempotent, so databases created by the old
+startup path are simply stamped with version 1 and get the later
+revisions applied on top.
+"""
 
+from psycopg import AsyncConnection
 
-async def create_tables(conn: AsyncConnection) -> None:
-    """
-    Create all required tables
 
-    Called during application startup to ensure schema exists
-    """
+async def upgrade(conn: AsyncConnection) -> None:
     async with conn.cursor() as cursor:
         # Enable pgvector extension
         await cursor.execute("CREATE EXTENSION IF NOT EXISTS vector;")
@@ -63,6 +65,3 @@ async def create_tables(conn: AsyncConnection) -> None:
                              CREATE INDEX IF NOT EXISTS bug_embeddings_accessed_idx
                                  ON bug_embeddings(last_accessed);
                              """)
-
-        await conn.commit()
-        print("✅ Database tables created successfully")
\ No newline at end of file
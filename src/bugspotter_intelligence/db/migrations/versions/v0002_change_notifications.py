@@ -0,0 +1,45 @@
+"""
+Notify listeners of bug_embeddings changes
+
+A row trigger sends a pg_notify on bug_embeddings_changes for every
+insert, delete, and embedding or status update, so the in-memory vector
+index mirror stays in sync.
+"""
+
+from psycopg import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    async with conn.cursor() as cursor:
+        # Change notifications for the in-memory vector index mirror
+        await cursor.execute("""
+                             CREATE OR REPLACE FUNCTION notify_bug_embeddings_change()
+                                 RETURNS trigger AS $$
+                             BEGIN
+                                 IF TG_OP = 'DELETE' THEN
+                                     PERFORM pg_notify('bug_embeddings_changes', json_build_object(
+                                         'op', TG_OP,
+                                         'bug_id', OLD.bug_id
+                                     )::text);
+                                     RETURN OLD;
+                                 END IF;
+
+                                 PERFORM pg_notify('bug_embeddings_changes', json_build_object(
+                                     'op', TG_OP,
+                                     'bug_id', NEW.bug_id,
+                                     'status', NEW.status,
+                                     'embedding_changed',
+                                     TG_OP = 'INSERT' OR OLD.embedding IS DISTINCT FROM NEW.embedding
+                                 )::text);
+                                 RETURN NEW;
+                             END;
+                             $$ LANGUAGE plpgsql;
+                             """)
+
+        await cursor.execute("""
+                             CREATE OR REPLACE TRIGGER bug_embeddings_notify
+                                 AFTER INSERT OR DELETE OR UPDATE OF embedding, status
+                                 ON bug_embeddings
+                                 FOR EACH ROW
+                                 EXECUTE FUNCTION notify_bug_embeddings_change();
+                             """)
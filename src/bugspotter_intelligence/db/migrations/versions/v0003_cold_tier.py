@@ -0,0 +1,33 @@
+"""
+Cold tier for bugs nobody has looked at in months
+
+Same columns as bug_embeddings, but no vector index: the tiering job
+moves stale rows here to keep the hot index small.
+"""
+
+from psycopg import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    async with conn.cursor() as cursor:
+        # Cold tier: bugs untouched for months, deliberately without a vector index
+        await cursor.execute("""
+                             CREATE TABLE IF NOT EXISTS bug_embeddings_cold
+                             (
+                                 bug_id             TEXT PRIMARY KEY,
+                                 title              TEXT NOT NULL,
+                                 description        TEXT,
+                                 status             TEXT DEFAULT 'open',
+                                 resolution         TEXT,
+                                 resolution_summary TEXT,
+                                 embedding          VECTOR(384),
+                                 created_at         TIMESTAMP,
+                                 updated_at         TIMESTAMP,
+                                 last_accessed      TIMESTAMP
+                             );
+                             """)
+
+        await cursor.execute("""
+                             CREATE INDEX IF NOT EXISTS bug_embeddings_cold_accessed_idx
+                                 ON bug_embeddings_cold(last_accessed);
+                             """)
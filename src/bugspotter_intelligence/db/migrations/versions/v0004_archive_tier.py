@@ -0,0 +1,31 @@
+"""
+Archive tier for finished bugs untouched for a long time
+
+Half-precision embeddings and a zlib-compressed payload of the text
+columns; scanned only when the hot tier returns too few matches.
+"""
+
+from psycopg import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    async with conn.cursor() as cursor:
+        # Archive tier: finished bugs untouched for a long time. Half-precision
+        # embeddings (pgvector >= 0.7) and a zlib-compressed text payload;
+        # only scanned when the hot tier returns too few matches
+        await cursor.execute("""
+                             CREATE TABLE IF NOT EXISTS bug_embeddings_archive
+                             (
+                                 bug_id      TEXT PRIMARY KEY,
+                                 status      TEXT,
+                                 payload     BYTEA NOT NULL,
+                                 embedding   HALFVEC(384),
+                                 archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                             );
+                             """)
+
+        # Payload is already compressed, skip TOAST's own compression attempt
+        await cursor.execute("""
+                             ALTER TABLE bug_embeddings_archive
+                                 ALTER COLUMN payload SET STORAGE EXTERNAL;
+                             """)
@@ -0,0 +1,29 @@
+"""
+HNSW index over binary-quantized embeddings
+
+Serves the Hamming-distance first pass of two-stage binary search. The
+bit width is the embedding column's dimension, which queries must cast
+to as well (EMBEDDING_DIMENSION) for the index to be used.
+"""
+
+from psycopg import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    async with conn.cursor() as cursor:
+        # A vector column's typmod is its dimension
+        await cursor.execute("""
+                             SELECT atttypmod
+                             FROM pg_attribute
+                             WHERE attrelid = 'bug_embeddings'::regclass
+                               AND attname = 'embedding';
+                             """)
+        dimension = (await cursor.fetchone())[0]
+
+        # First stage of binary-quantized search: HNSW over 1-bit embeddings
+        # (48 bytes per vector instead of 1536 at 384 dimensions)
+        await cursor.execute(f"""
+                             CREATE INDEX IF NOT EXISTS bug_embeddings_binary_idx
+                                 ON bug_embeddings
+                                 USING hnsw ((binary_quantize(embedding)::bit({dimension})) bit_hamming_ops);
+                             """)
@@ -0,0 +1,26 @@
+"""
+Cluster ids from the offline duplicate clustering job
+"""
+
+from psycopg import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    async with conn.cursor() as cursor:
+        # Set by the offline duplicate clustering job
+        await cursor.execute("""
+                             ALTER TABLE bug_embeddings
+                                 ADD COLUMN IF NOT EXISTS duplicate_cluster_id TEXT;
+                             """)
+
+        await cursor.execute("""
+                             CREATE INDEX IF NOT EXISTS bug_embeddings_cluster_idx
+                                 ON bug_embeddings(duplicate_cluster_id)
+                                 WHERE duplicate_cluster_id IS NOT NULL;
+                             """)
+
+        # Kept when a bug moves to the cold tier
+        await cursor.execute("""
+                             ALTER TABLE bug_embeddings_cold
+                                 ADD COLUMN IF NOT EXISTS duplicate_cluster_id TEXT;
+                             """)
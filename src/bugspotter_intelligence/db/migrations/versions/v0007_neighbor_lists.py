@@ -0,0 +1,33 @@
+"""
+Precomputed top-K neighbor lists
+
+bug_neighbors holds each bug's nearest neighbors, maintained at ingest;
+neighbors_computed_at marks a list as complete and current.
+"""
+
+from psycopg import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    async with conn.cursor() as cursor:
+        # Set when the bug's bug_neighbors list is complete and current
+        await cursor.execute("""
+                             ALTER TABLE bug_embeddings
+                                 ADD COLUMN IF NOT EXISTS neighbors_computed_at TIMESTAMP;
+                             """)
+
+        # Precomputed top-K neighbors per bug, maintained at ingest time
+        await cursor.execute("""
+                             CREATE TABLE IF NOT EXISTS bug_neighbors
+                             (
+                                 bug_id      TEXT NOT NULL,
+                                 neighbor_id TEXT NOT NULL,
+                                 similarity  REAL NOT NULL,
+                                 PRIMARY KEY (bug_id, neighbor_id)
+                             );
+                             """)
+
+        await cursor.execute("""
+                             CREATE INDEX IF NOT EXISTS bug_neighbors_neighbor_idx
+                                 ON bug_neighbors(neighbor_id);
+                             """)
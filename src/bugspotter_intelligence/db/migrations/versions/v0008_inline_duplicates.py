@@ -0,0 +1,20 @@
+"""
+Record the original of a bug marked as a duplicate at ingest
+"""
+
+from psycopg import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    async with conn.cursor() as cursor:
+        # Set when a bug is marked as a duplicate at ingest
+        await cursor.execute("""
+                             ALTER TABLE bug_embeddings
+                                 ADD COLUMN IF NOT EXISTS duplicate_of TEXT;
+                             """)
+
+        # Kept when a duplicate moves to the cold tier
+        await cursor.execute("""
+                             ALTER TABLE bug_embeddings_cold
+                                 ADD COLUMN IF NOT EXISTS duplicate_of TEXT;
+                             """)
@@ -0,0 +1,38 @@
+"""
+Full-text search over the text each embedding was built from
+
+Adds embedding_text and a generated search_vector with its GIN index,
+for hybrid (vector + full-text) search.
+"""
+
+from psycopg import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    async with conn.cursor() as cursor:
+        # Text the embedding was built from, and its full-text index for hybrid search.
+        # 'simple' keeps error tokens and identifiers unstemmed
+        await cursor.execute("""
+                             ALTER TABLE bug_embeddings
+                                 ADD COLUMN IF NOT EXISTS embedding_text TEXT;
+                             """)
+
+        await cursor.execute("""
+                             ALTER TABLE bug_embeddings
+                                 ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+                                 GENERATED ALWAYS AS (
+                                     to_tsvector('simple', COALESCE(embedding_text, title || ' ' || COALESCE(description, '')))
+                                 ) STORED;
+                             """)
+
+        await cursor.execute("""
+                             CREATE INDEX IF NOT EXISTS bug_embeddings_search_idx
+                                 ON bug_embeddings
+                                 USING gin (search_vector);
+                             """)
+
+        # Kept when a bug moves to the cold tier
+        await cursor.execute("""
+                             ALTER TABLE bug_embeddings_cold
+                                 ADD COLUMN IF NOT EXISTS embedding_text TEXT;
+                             """)
@@ -0,0 +1,33 @@
+"""
+MinHash signatures and LSH buckets for near-exact pre-dedup
+"""
+
+from psycopg import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    async with conn.cursor() as cursor:
+        # MinHash signatures and their LSH band buckets, for near-exact
+        # duplicate lookup before embedding
+        await cursor.execute("""
+                             CREATE TABLE IF NOT EXISTS bug_minhash
+                             (
+                                 bug_id    TEXT PRIMARY KEY,
+                                 signature BIGINT[] NOT NULL
+                             );
+                             """)
+
+        await cursor.execute("""
+                             CREATE TABLE IF NOT EXISTS bug_lsh_bands
+                             (
+                                 band   SMALLINT NOT NULL,
+                                 bucket BIGINT NOT NULL,
+                                 bug_id TEXT NOT NULL,
+                                 PRIMARY KEY (band, bucket, bug_id)
+                             );
+                             """)
+
+        await cursor.execute("""
+                             CREATE INDEX IF NOT EXISTS bug_lsh_bands_bug_idx
+                                 ON bug_lsh_bands(bug_id);
+                             """)
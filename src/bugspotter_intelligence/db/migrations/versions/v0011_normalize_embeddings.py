@@ -0,0 +1,32 @@
+"""
+Scale stored embeddings to unit length
+
+Embedding providers now emit L2-normalized vectors, which lets
+similarity search use the inner product instead of cosine distance.
+Rows stored before that are normalized here (pgvector >= 0.7).
+"""
+
+from psycopg import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    async with conn.cursor() as cursor:
+        # The in-memory index normalizes on its own; don't send a change
+        # notification for every rewritten row
+        await cursor.execute("ALTER TABLE bug_embeddings DISABLE TRIGGER bug_embeddings_notify;")
+
+        for table in ("bug_embeddings", "bug_embeddings_cold"):
+            await cursor.execute(f"""
+                                 UPDATE {table}
+                                 SET embedding = l2_normalize(embedding)
+                                 WHERE abs(vector_norm(embedding) - 1) > 1e-5;
+                                 """)
+
+        # Half precision can't get closer to 1 than ~1e-3
+        await cursor.execute("""
+                             UPDATE bug_embeddings_archive
+                             SET embedding = l2_normalize(embedding)
+                             WHERE abs(l2_norm(embedding) - 1) > 1e-3;
+                             """)
+
+        await cursor.execute("ALTER TABLE bug_embeddings ENABLE TRIGGER bug_embeddings_notify;")
@@ -0,0 +1,32 @@
+"""
+Rebuild the ANN index for inner-product search
+
+Replaces the vector_cosine_ops ivfflat index with vector_ip_ops, built
+concurrently so writes continue during the build. Re-runnable: an
+invalid index left by a failed concurrent build is dropped first.
+"""
+
+from psycopg import AsyncConnection
+
+TRANSACTIONAL = False
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    cursor = await conn.execute("""
+                                SELECT NOT i.indisvalid
+                                FROM pg_index i
+                                JOIN pg_class c ON c.oid = i.indexrelid
+                                WHERE c.relname = 'bug_embeddings_embedding_ip_idx';
+                                """)
+    row = await cursor.fetchone()
+    if row and row[0]:
+        await conn.execute("DROP INDEX CONCURRENTLY IF EXISTS bug_embeddings_embedding_ip_idx;")
+
+    await conn.execute("""
+                       CREATE INDEX CONCURRENTLY IF NOT EXISTS bug_embeddings_embedding_ip_idx
+                           ON bug_embeddings
+                           USING ivfflat (embedding vector_ip_ops)
+                           WITH (lists = 100);
+                       """)
+
+    await conn.execute("DROP INDEX CONCURRENTLY IF EXISTS bug_embeddings_embedding_idx;")
@@ -0,0 +1,34 @@
+"""
+Persist generated mitigation suggestions
+
+One row per bug and context mode, served as long as it exists and was
+generated by the configured model. fingerprint records the prompt
+inputs the suggestion was generated from; context_bug_ids lists the
+resolved bugs used as context, so a change to any of them can drop the
+row.
+"""
+
+from psycopg import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    async with conn.cursor() as cursor:
+        await cursor.execute("""
+                             CREATE TABLE IF NOT EXISTS bug_mitigations
+                             (
+                                 bug_id                TEXT NOT NULL,
+                                 use_similar_bugs      BOOLEAN NOT NULL,
+                                 model                 TEXT NOT NULL,
+                                 fingerprint           TEXT NOT NULL,
+                                 suggestion            TEXT NOT NULL,
+                                 based_on_similar_bugs BOOLEAN NOT NULL,
+                                 context_bug_ids       TEXT[] NOT NULL DEFAULT '{}',
+                                 created_at            TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                                 PRIMARY KEY (bug_id, use_similar_bugs)
+                             );
+                             """)
+
+        await cursor.execute("""
+                             CREATE INDEX IF NOT EXISTS bug_mitigations_context_idx
+                                 ON bug_mitigations USING GIN (context_bug_ids);
+                             """)
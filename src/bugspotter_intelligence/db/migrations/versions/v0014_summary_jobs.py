@@ -0,0 +1,34 @@
+"""
+Queue for background resolution summaries
+
+One row per bug: a new resolution resets the bug's job to pending.
+status is pending, running, done or failed; a running job whose
+locked_until has passed belongs to a worker that died and is claimed
+again.
+"""
+
+from psycopg import AsyncConnection
+
+
+async def upgrade(conn: AsyncConnection) -> None:
+    async with conn.cursor() as cursor:
+        await cursor.execute("""
+                             CREATE TABLE IF NOT EXISTS summary_jobs
+                             (
+                                 bug_id       TEXT PRIMARY KEY,
+                                 resolution   TEXT NOT NULL,
+                                 status       TEXT NOT NULL DEFAULT 'pending',
+                                 attempts     INTEGER NOT NULL DEFAULT 0,
+                                 run_after    TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                                 locked_until TIMESTAMP,
+                                 last_error   TEXT,
+                                 created_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                                 updated_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                             );
+                             """)
+
+        await cursor.execute("""
+                             CREATE INDEX IF NOT EXISTS summary_jobs_runnable_idx
+                                 ON summary_jobs (run_after)
+                                 WHERE status IN ('pending', 'running');
+                             """)
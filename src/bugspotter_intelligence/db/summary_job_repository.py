@@ -0,0 +1,128 @@
+from typing import Optional
+
+from psycopg import AsyncConnection
+
+# Queue (or re-queue) a bug's resolution summary (params: bug_id, resolution)
+ENQUEUE_SUMMARY_SQL = """
+    INSERT INTO summary_jobs (bug_id, resolution)
+    VALUES (%s, %s) ON CONFLICT (bug_id)
+    DO UPDATE SET
+        resolution = EXCLUDED.resolution,
+        status = 'pending',
+        attempts = 0,
+        run_after = CURRENT_TIMESTAMP,
+        locked_until = NULL,
+        last_error = NULL,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+class SummaryJobRepository:
+    """
+    Data access layer for summary_jobs
+
+    Workers claim jobs with FOR UPDATE SKIP LOCKED, so any number of them
+    can poll the table without blocking each other or taking the same
+    job. A claimed job is leased until locked_until; if its worker dies
+    the job becomes claimable again when the lease runs out.
+    """
+
+    @staticmethod
+    async def enqueue(conn: AsyncConnection, bug_id: str, resolution: str) -> None:
+        """Queue a summary for a bug's resolution, replacing any earlier job"""
+        async with conn.cursor() as cursor:
+            await cursor.execute(ENQUEUE_SUMMARY_SQL, (bug_id, resolution))
+            await conn.commit()
+
+    @staticmethod
+    async def claim(conn: AsyncConnection, limit: int, lease_seconds: float) -> list[dict]:
+        """
+        Claim up to `limit` runnable jobs, oldest first
+
+        Runnable: pending and due, or running with an expired lease.
+        """
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                UPDATE summary_jobs j
+                SET status       = 'running',
+                    attempts     = j.attempts + 1,
+                    locked_until = CURRENT_TIMESTAMP + make_interval(secs => %s),
+                    updated_at   = CURRENT_TIMESTAMP
+                FROM (
+                    SELECT bug_id
+                    FROM summary_jobs
+                    WHERE (status = 'pending' AND run_after <= CURRENT_TIMESTAMP)
+                       OR (status = 'running' AND locked_until < CURRENT_TIMESTAMP)
+                    ORDER BY run_after
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                ) due
+                WHERE j.bug_id = due.bug_id
+                RETURNING j.bug_id, j.resolution, j.attempts
+                """,
+                (lease_seconds, limit)
+            )
+            rows = await cursor.fetchall()
+            await conn.commit()
+
+            return [
+                {"bug_id": row[0], "resolution": row[1], "attempts": row[2]}
+                for row in rows
+            ]
+
+    @staticmethod
+    async def complete(conn: AsyncConnection, bug_id: str, resolution: str, summary: str) -> bool:
+        """
+        Store a finished summary and mark its job done
+
+        Nothing is written if the bug's resolution changed while the
+        summary was generated (the re-queued job will produce a new one).
+
+        Returns whether the summary was stored
+        """
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                UPDATE summary_jobs
+                SET status = 'done', locked_until = NULL, last_error = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE bug_id = %s AND resolution = %s AND status = 'running'
+                """,
+                (bug_id, resolution)
+            )
+            if cursor.rowcount == 0:
+                await conn.rollback()
+                return False
+
+            for table in ("bug_embeddings", "bug_embeddings_cold"):
+                await cursor.execute(
+                    f"UPDATE {table} SET resolution_summary = %s WHERE bug_id = %s AND resolution = %s",
+                    (summary, bug_id, resolution)
+                )
+            await conn.commit()
+
+            return True
+
+    @staticmethod
+    async def fail(
+            conn: AsyncConnection,
+            bug_id: str,
+            resolution: str,
+            error: str,
+            retry_in: Optional[float]
+    ) -> None:
+        """Record a failed attempt: retry after retry_in seconds, or give up when None"""
+        async with conn.cursor() as cursor:
+            await cursor.execute(
+                """
+                UPDATE summary_jobs
+                SET status       = CASE WHEN %s::float8 IS NULL THEN 'failed' ELSE 'pending' END,
+                    run_after    = CURRENT_TIMESTAMP + make_interval(secs => COALESCE(%s::float8, 0)),
+                    locked_until = NULL,
+                    last_error   = %s,
+                    updated_at   = CURRENT_TIMESTAMP
+                WHERE bug_id = %s AND resolution = %s AND status = 'running'
+                """,
+                (retry_in, retry_in, error, bug_id, resolution)
+            )
+            await conn.commit()
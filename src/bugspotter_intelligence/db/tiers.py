@@ -0,0 +1,89 @@
+"""Row layout shared by the hot, cold and archive tiers"""
+
+import json
+import zlib
+from datetime import datetime
+
+from psycopg import AsyncCursor
+
+# Columns shared by the hot (bug_embeddings) and cold (bug_embeddings_cold) tiers
+TIER_COLUMNS = (
+    "bug_id, title, description, status, resolution, resolution_summary, "
+    "embedding, created_at, updated_at, last_accessed, duplicate_of, embedding_text, duplicate_cluster_id"
+)
+
+# Text fields stored compressed in the archive payload
+_PAYLOAD_FIELDS = (
+    "title", "description", "resolution", "resolution_summary", "duplicate_of", "embedding_text",
+    "duplicate_cluster_id"
+)
+_TIMESTAMP_FIELDS = ("created_at", "updated_at")
+
+
+def pack_payload(bug: dict) -> bytes:
+    """Compress a bug's text fields and timestamps into one zlib blob"""
+    payload = {field: bug.get(field) for field in _PAYLOAD_FIELDS}
+    for field in _TIMESTAMP_FIELDS:
+        value = bug.get(field)
+        payload[field] = value.isoformat() if value else None
+
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), level=9)
+
+
+def unpack_payload(blob: bytes) -> dict:
+    """Inverse of pack_payload"""
+    payload = json.loads(zlib.decompress(blob).decode("utf-8"))
+    for field in _TIMESTAMP_FIELDS:
+        if payload.get(field):
+            payload[field] = datetime.fromisoformat(payload[field])
+    return payload
+
+
+async def restore_archived(cursor: AsyncCursor, bug_ids: list[str]) -> int:
+    """
+    Move archived bugs back to the hot tier, without committing
+
+    Embeddings are restored from half precision; the hot row is
+    marked as just accessed so it isn't re-tiered immediately. A bug
+    that is also in the hot tier keeps its hot row.
+    Returns the number of bugs moved out of the archive
+    """
+    if not bug_ids:
+        return 0
+
+    await cursor.execute(
+        """
+        DELETE FROM bug_embeddings_archive
+        WHERE bug_id = ANY(%s)
+        RETURNING bug_id, status, payload, embedding::vector::text
+        """,
+        (sorted(set(bug_ids)),)
+    )
+
+    rows = await cursor.fetchall()
+
+    for bug_id, status, blob, embedding in rows:
+        payload = unpack_payload(blob)
+        await cursor.execute(
+            f"""
+            INSERT INTO bug_embeddings ({TIER_COLUMNS})
+            VALUES (%s, %s, %s, %s, %s, %s, %s::vector, %s, %s, CURRENT_TIMESTAMP, %s, %s, %s)
+            ON CONFLICT (bug_id) DO NOTHING
+            """,
+            (
+                bug_id,
+                payload["title"],
+                payload["description"],
+                status,
+                payload["resolution"],
+                payload["resolution_summary"],
+                embedding,
+                payload["created_at"],
+                payload["updated_at"],
+                payload.get("duplicate_of"),
+                payload.get("embedding_text"),
+                payload.get("duplicate_cluster_id")
+            )
+        )
+
+    return len(rows)
@@ -0,0 +1 @@
+"""Offline maintenance jobs (run from cron or the command line)"""
@@ -0,0 +1,295 @@
+"""
+Offline duplicate clustering job
+
+Sweeps all of bug_embeddings and groups near-duplicate bugs:
+
+1. Streams every embedding into one L2-normalized float32 matrix
+2. Finds all pairs with cosine similarity >= duplicate_threshold with
+   blocked matrix multiplies (tile x tile, upper triangle only), spread
+   over worker processes that share the matrix through shared memory
+3. Resolves connected components of the pair graph with union-find
+4. Writes cluster ids back in bulk (COPY + one UPDATE join)
+
+A cluster's id is its smallest bug_id, so ids stay stable across runs
+as long as that bug stays in the cluster.
+
+Usage:
+    python -m bugspotter_intelligence.jobs.duplicate_clustering --workers 8
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+from psycopg import AsyncConnection
+
+from bugspotter_intelligence.config import Settings
+from bugspotter_intelligence.db.bug_repository import BugRepository
+
+logger = logging.getLogger(__name__)
+
+# BLAS thread pools multiplied by worker processes would oversubscribe the CPU
+_BLAS_THREAD_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+# Matrix shared with worker processes (set by _attach_matrix)
+_worker_matrix: Optional[np.ndarray] = None
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+
+
+class UnionFind:
+    """Disjoint sets over 0..n-1 with path halving"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # Lower index wins so results don't depend on pair order
+            if root_a < root_b:
+                self.parent[root_b] = root_a
+            else:
+                self.parent[root_a] = root_b
+
+    def components(self) -> list[list[int]]:
+        """All sets with more than one member"""
+        groups: dict[int, list[int]] = {}
+        for x in range(len(self.parent)):
+            groups.setdefault(self.find(x), []).append(x)
+        return [members for members in groups.values() if len(members) > 1]
+
+
+def tile_pairs(
+        matrix: np.ndarray,
+        row_start: int,
+        block_size: int,
+        threshold: float
+) -> np.ndarray:
+    """
+    Pairs (i, j), i < j, with i in one row block and similarity >= threshold
+
+    Only tiles on or right of the diagonal are scored, so every pair is
+    computed once. Returns an (n, 2) int array of row indexes
+    """
+    count = matrix.shape[0]
+    row_end = min(row_start + block_size, count)
+    block = matrix[row_start:row_end]
+    found = []
+
+    for col_start in range(row_start, count, block_size):
+        col_end = min(col_start + block_size, count)
+        scores = block @ matrix[col_start:col_end].T
+
+        rows, cols = np.nonzero(scores >= threshold)
+        rows += row_start
+        cols += col_start
+
+        upper = cols > rows
+        if upper.any():
+            found.append(np.column_stack((rows[upper], cols[upper])))
+
+    if not found:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.concatenate(found)
+
+
+def find_duplicate_pairs(
+        matrix: np.ndarray,
+        threshold: float,
+        block_size: int = 4096,
+        workers: int = 1
+) -> np.ndarray:
+    """
+    All pairs of rows with cosine similarity >= threshold
+
+    `matrix` must be L2-normalized. With workers > 1, row blocks are
+    scored in separate processes that map the matrix from shared memory
+    instead of receiving a copy each.
+    """
+    row_starts = range(0, matrix.shape[0], block_size)
+
+    if workers <= 1:
+        results = [tile_pairs(matrix, start, block_size, threshold) for start in row_starts]
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+        try:
+            np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=shm.buf)[:] = matrix
+
+            with _single_threaded_blas(), ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_attach_matrix,
+                    initargs=(shm.name, matrix.shape, matrix.dtype.str)
+            ) as pool:
+                results = list(pool.map(
+                    _worker_tile_pairs,
+                    row_starts,
+                    [block_size] * len(row_starts),
+                    [threshold] * len(row_starts)
+                ))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    if not results:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.concatenate(results)
+
+
+def cluster_pairs(bug_ids: list[str], pairs: np.ndarray) -> dict[str, str]:
+    """
+    Resolve a near-duplicate graph into clusters
+
+    Returns bug_id -> cluster_id (the smallest bug_id in its cluster)
+    for every bug with at least one near-duplicate
+    """
+    sets = UnionFind(len(bug_ids))
+    for a, b in pairs.tolist():
+        sets.union(a, b)
+
+    clusters = {}
+    for members in sets.components():
+        member_ids = [bug_ids[i] for i in members]
+        cluster_id = min(member_ids)
+        clusters.update((bug_id, cluster_id) for bug_id in member_ids)
+
+    return clusters
+
+
+async def load_embeddings(conn: AsyncConnection, batch_size: int = 5000) -> tuple[list[str], np.ndarray]:
+    """
+    Stream all non-duplicate embeddings into a normalized float32 matrix
+
+    The matrix is allocated once from a row count and filled batch by
+    batch, so only one copy of it is ever in memory (~1.5 GB at 1M x 384).
+    Rows inserted after the count grow it in place.
+    """
+    bug_ids: list[str] = []
+    matrix: Optional[np.ndarray] = None
+    expected = await BugRepository.count_embeddings(conn)
+
+    async for batch in BugRepository.iter_embeddings(conn, batch_size):
+        block = np.asarray([embedding for _, embedding, _ in batch], dtype=np.float32)
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        block /= np.where(norms > 0, norms, 1.0)
+        if matrix is None:
+            matrix = np.empty((max(expected, len(block)), block.shape[1]), dtype=np.float32)
+
+        start = len(bug_ids)
+        if start + len(block) > len(matrix):
+            matrix.resize((start + len(block), matrix.shape[1]), refcheck=False)
+
+        matrix[start:start + len(block)] = block
+        bug_ids.extend(bug_id for bug_id, _, _ in batch)
+
+    if matrix is None:
+        return [], np.empty((0, 0), dtype=np.float32)
+
+    # Rows deleted after the count leave the tail unused
+    return bug_ids, matrix[:len(bug_ids)]
+
+
+async def run(settings: Settings, threshold: float, block_size: int, workers: int) -> dict:
+    """
+    Cluster all bugs and write the cluster ids back
+
+    Returns throughput stats for the run
+    """
+    stats = {}
+
+    async with await AsyncConnection.connect(settings.database_url) as conn:
+        start = time.perf_counter()
+        bug_ids, matrix = await load_embeddings(conn)
+        stats["vectors"] = len(bug_ids)
+        stats["load_s"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pairs = find_duplicate_pairs(matrix, threshold, block_size, workers)
+        stats["pairs"] = len(pairs)
+        stats["pairs_s"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        clusters = cluster_pairs(bug_ids, pairs)
+        stats["clustered_bugs"] = len(clusters)
+        stats["clusters"] = len(set(clusters.values()))
+        stats["union_find_s"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await BugRepository.write_duplicate_clusters(conn, clusters)
+        stats["write_s"] = time.perf_counter() - start
+
+    comparisons = stats["vectors"] * (stats["vectors"] - 1) / 2
+    logger.info(
+        f"Clustered {stats['vectors']} bugs into {stats['clusters']} clusters "
+        f"({stats['clustered_bugs']} bugs, {stats['pairs']} pairs >= {threshold}): "
+        f"load {stats['load_s']:.1f}s, "
+        f"similarity {stats['pairs_s']:.1f}s ({comparisons / max(stats['pairs_s'], 1e-9):,.0f} pairs/s), "
+        f"union-find {stats['union_find_s']:.1f}s, write {stats['write_s']:.1f}s"
+    )
+    return stats
+
+
+def main() -> None:
+    settings = Settings()
+
+    parser = argparse.ArgumentParser(description="Group near-duplicate bugs into clusters")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=settings.duplicate_threshold,
+        help="Cosine similarity for two bugs to count as duplicates"
+    )
+    parser.add_argument("--block-size", type=int, default=4096, help="Rows per matmul tile")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=settings.log_level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    asyncio.run(run(settings, args.threshold, args.block_size, args.workers))
+
+
+@contextmanager
+def _single_threaded_blas():
+    """Limit BLAS to one thread in spawned workers (they read the environment at import)"""
+    saved = {var: os.environ.get(var) for var in _BLAS_THREAD_VARS}
+    os.environ.update({var: "1" for var in _BLAS_THREAD_VARS})
+    try:
+        yield
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+
+def _attach_matrix(name: str, shape: tuple, dtype: str) -> None:
+    global _worker_matrix, _worker_shm
+    _worker_shm = shared_memory.SharedMemory(name=name)
+    _worker_matrix = np.ndarray(shape, dtype=np.dtype(dtype), buffer=_worker_shm.buf)
+
+
+def _worker_tile_pairs(row_start: int, block_size: int, threshold: float) -> np.ndarray:
+    return tile_pairs(_worker_matrix, row_start, block_size, threshold)
+
+
+if __name__ == "__main__":
+    main()
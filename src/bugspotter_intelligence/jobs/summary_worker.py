@@ -0,0 +1,222 @@
+"""
+Resolution summary worker
+
+PATCH /bugs/{bug_id}/resolution writes the resolution at once and
+queues a row in summary_jobs; this worker generates the AI summaries.
+It runs inside the API process (SUMMARY_WORKER_ENABLED) and can also be
+run on its own, any number of times: jobs are claimed with SKIP LOCKED.
+
+Failed attempts are retried with exponential backoff up to
+summary_max_attempts, then the job is marked failed. A job held by a
+worker that stops or dies is retried once its lease expires.
+
+Usage:
+    python -m bugspotter_intelligence.jobs.summary_worker
+    python -m bugspotter_intelligence.jobs.summary_worker --concurrency 4
+    python -m bugspotter_intelligence.jobs.summary_worker --batch-size 16
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Optional
+
+from psycopg_pool import AsyncConnectionPool
+
+from bugspotter_intelligence.config import Settings
+from bugspotter_intelligence.db.database import create_pool
+from bugspotter_intelligence.db.summary_job_repository import SummaryJobRepository
+from bugspotter_intelligence.llm import LLMProvider, create_llm_provider
+from bugspotter_intelligence.services.bug_command_service import summarize_resolution, summarize_resolutions
+
+logger = logging.getLogger(__name__)
+
+
+def retry_delay(attempts: int, max_attempts: int, backoff: float) -> Optional[float]:
+    """Seconds until the next attempt, or None once attempts are used up"""
+    if attempts >= max_attempts:
+        return None
+    return backoff * 2 ** (attempts - 1)
+
+
+class SummaryWorker:
+    """
+    Polls summary_jobs and generates summaries, `concurrency` LLM calls at a time
+
+    Each call summarizes up to summary_batch_size jobs in one packed
+    prompt; jobs it doesn't summarize are retried one by one. Only as
+    many jobs as the free slots can take are claimed, so jobs this
+    worker can't start yet stay available to other workers.
+    """
+
+    def __init__(self, pool: AsyncConnectionPool, llm: LLMProvider, settings: Settings):
+        self.pool = pool
+        self.llm = llm
+        self.settings = settings
+        self.concurrency = settings.summary_worker_concurrency
+        self.batch_size = settings.summary_batch_size
+        self.repo = SummaryJobRepository()
+        self._running: set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> int:
+        """Claim jobs for the free slots and start them; returns the number claimed"""
+        free = self.concurrency - len(self._running)
+        if free <= 0:
+            return 0
+
+        async with self.pool.connection() as conn:
+            jobs = await self.repo.claim(conn, free * self.batch_size, self.settings.summary_job_lease)
+
+        for i in range(0, len(jobs), self.batch_size):
+            task = asyncio.create_task(self.process_batch(jobs[i:i + self.batch_size]))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+        return len(jobs)
+
+    async def process_batch(self, jobs: list[dict]) -> None:
+        """Summarize several jobs in one LLM call, falling back to one call per job"""
+        if len(jobs) == 1:
+            await self.process(jobs[0])
+            return
+
+        try:
+            summaries = await summarize_resolutions(self.llm, [job["resolution"] for job in jobs])
+        except Exception as e:
+            logger.warning(f"Packed summary of {len(jobs)} jobs failed, summarizing one by one: {e}")
+            summaries = [None] * len(jobs)
+
+        for job, summary in zip(jobs, summaries):
+            if summary is None:
+                await self.process(job)
+            else:
+                await self._record(self.repo.complete, job["bug_id"], job["resolution"], summary)
+
+    async def process(self, job: dict) -> None:
+        """Generate one summary and record the outcome"""
+        bug_id, resolution = job["bug_id"], job["resolution"]
+
+        try:
+            summary = await summarize_resolution(self.llm, resolution)
+        except Exception as e:
+            retry_in = retry_delay(
+                job["attempts"],
+                self.settings.summary_max_attempts,
+                self.settings.summary_retry_backoff
+            )
+            if retry_in is None:
+                logger.error(f"Summary for {bug_id} failed after {job['attempts']} attempts: {e}")
+            else:
+                logger.warning(f"Summary for {bug_id} failed (attempt {job['attempts']}), retrying in {retry_in:.0f}s: {e}")
+
+            await self._record(self.repo.fail, bug_id, resolution, str(e), retry_in)
+            return
+
+        await self._record(self.repo.complete, bug_id, resolution, summary)
+
+    async def start(self) -> None:
+        """Start polling in the background"""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop polling and cancel summaries in progress (their leases expire and they are retried)"""
+        tasks = [t for t in (self._task, *self._running) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.run_once()
+            except Exception as e:
+                logger.warning(f"Claiming summary jobs failed, will retry: {e}")
+                claimed = 0
+
+            if len(self._running) >= self.concurrency:
+                await asyncio.wait(self._running, return_when=asyncio.FIRST_COMPLETED)
+            elif not claimed:
+                await asyncio.sleep(self.settings.summary_poll_interval)
+
+    async def _record(self, write, *args) -> None:
+        try:
+            async with self.pool.connection() as conn:
+                await write(conn, *args)
+        except Exception as e:
+            # The job stays running and is retried when its lease expires
+            logger.warning(f"Recording summary job for {args[0]} failed: {e}")
+
+
+_worker: SummaryWorker | None = None
+
+
+async def init_summary_worker(settings: Settings, pool: AsyncConnectionPool, llm: LLMProvider) -> None:
+    """Start the in-process summary worker (no-op when disabled)"""
+    global _worker
+
+    if not (settings.summary_jobs_enabled and settings.summary_worker_enabled):
+        return
+
+    _worker = SummaryWorker(pool, llm, settings)
+    await _worker.start()
+
+
+async def close_summary_worker() -> None:
+    """Stop the in-process summary worker"""
+    global _worker
+    if _worker:
+        await _worker.stop()
+        _worker = None
+
+
+async def run(settings: Settings) -> None:
+    pool = create_pool(settings)
+    await pool.open()
+    llm = create_llm_provider(settings)
+    worker = SummaryWorker(pool, llm, settings)
+
+    logger.info(f"Summary worker started ({worker.concurrency} calls at a time, {worker.batch_size} per call)")
+    try:
+        await worker.start()
+        await worker._task
+    finally:
+        await worker.stop()
+        await llm.close()
+        await pool.close()
+
+
+def main() -> None:
+    settings = Settings()
+
+    parser = argparse.ArgumentParser(description="Generate queued resolution summaries")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.summary_worker_concurrency,
+        help="LLM calls run at once"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.summary_batch_size,
+        help="Resolutions summarized per LLM call"
+    )
+    args = parser.parse_args()
+    settings.summary_worker_concurrency = args.concurrency
+    settings.summary_batch_size = args.batch_size
+
+    logging.basicConfig(
+        level=settings.log_level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    try:
+        asyncio.run(run(settings))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
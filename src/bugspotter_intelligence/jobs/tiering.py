@@ -0,0 +1,155 @@
+"""
+Hot/cold tiering job
+
+Moves bugs untouched for N months from bug_embeddings to
+bug_embeddings_cold, which has no vector index. This keeps the hot
+ANN index small enough to stay cache-resident. Cold bugs are still
+readable by id and move back to the hot tier when accessed.
+
+Finished cold bugs untouched for longer are then moved to
+bug_embeddings_archive (half-precision vectors, compressed text), which
+is only searched when the hot tier returns too few matches.
+
+Usage:
+    python -m bugspotter_intelligence.jobs.tiering --months 6 --archive-months 12
+    python -m bugspotter_intelligence.jobs.tiering --report
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from psycopg import AsyncConnection
+
+from bugspotter_intelligence.config import Settings
+from bugspotter_intelligence.db.archive_repository import ArchiveRepository
+from bugspotter_intelligence.db.bug_repository import BugRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def demote_stale_bugs(
+        conn: AsyncConnection,
+        months: int,
+        batch_size: int = 1000
+) -> int:
+    """
+    Move all stale bugs to the cold tier in batches
+
+    Each batch is its own short transaction so the job never holds
+    locks on a large part of the hot table.
+
+    Returns the total number of bugs moved
+    """
+    repo = BugRepository()
+    total = 0
+
+    while moved := await repo.demote_stale_bugs(conn, months, batch_size):
+        total += moved
+        logger.info(f"Moved {moved} bugs to cold tier ({total} total)")
+
+    return total
+
+
+async def archive_cold_bugs(
+        conn: AsyncConnection,
+        months: int,
+        batch_size: int = 500
+) -> int:
+    """
+    Move all finished cold bugs untouched for `months` to the archive
+
+    Returns the total number of bugs archived
+    """
+    archive = ArchiveRepository()
+    total = 0
+
+    while moved := await archive.archive_cold_bugs(conn, months, batch_size):
+        total += moved
+        logger.info(f"Archived {moved} bugs ({total} total)")
+
+    return total
+
+
+def format_storage_report(report: list[dict]) -> str:
+    """Render ArchiveRepository.storage_report as a table"""
+    lines = [
+        f"{'tier':<8} {'rows':>10} {'total MB':>10} {'bytes/row':>10}",
+    ]
+    for tier in report:
+        lines.append(
+            f"{tier['tier']:<8} {tier['rows']:>10} "
+            f"{tier['total_bytes'] / 1024 / 1024:>10.1f} {tier['bytes_per_row']:>10.0f}"
+        )
+
+    per_row = {tier["tier"]: tier["bytes_per_row"] for tier in report}
+    if per_row.get("hot") and per_row.get("archive"):
+        lines.append(
+            f"archive rows are {per_row['hot'] / per_row['archive']:.1f}x smaller than hot rows"
+        )
+
+    return "\n".join(lines)
+
+
+async def run(
+        settings: Settings,
+        months: int,
+        batch_size: int,
+        archive_months: int | None = None
+) -> int:
+    start = time.perf_counter()
+
+    async with await AsyncConnection.connect(settings.database_url) as conn:
+        total = await demote_stale_bugs(conn, months, batch_size)
+        archived = await archive_cold_bugs(conn, archive_months, batch_size) if archive_months else 0
+
+    logger.info(
+        f"Tiering done: {total} bugs untouched for {months} months moved, "
+        f"{archived} archived in {time.perf_counter() - start:.1f}s"
+    )
+    return total
+
+
+async def report(settings: Settings) -> None:
+    async with await AsyncConnection.connect(settings.database_url) as conn:
+        print(format_storage_report(await ArchiveRepository.storage_report(conn)))
+
+
+def main() -> None:
+    settings = Settings()
+
+    parser = argparse.ArgumentParser(description="Move stale bugs to the cold and archive tiers")
+    parser.add_argument(
+        "--months",
+        type=int,
+        default=settings.cold_tier_after_months,
+        help="Demote bugs not accessed for this many months"
+    )
+    parser.add_argument(
+        "--archive-months",
+        type=int,
+        default=settings.archive_after_months,
+        help="Archive finished cold bugs not accessed for this many months (0 disables)"
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Only print per-tier row counts and storage sizes"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=settings.log_level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    if args.report:
+        asyncio.run(report(settings))
+    else:
+        asyncio.run(run(settings, args.months, args.batch_size, args.archive_months))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,27 @@
-from .base import LLMProvider
+from .base import LLMProvider, TokenUsage
 from .factory import create_llm_provider, list_providers, register_provider
+from .router import CircuitBreaker, RouterProvider
+from .scheduler import LLMOverloadedError, LLMScheduler, Priority, ScheduledLLMProvider
+from .single_flight import SingleFlightLLMProvider
 
 # Import providers to trigger registration
+from .claude import ClaudeProvider
 from .ollama import OllamaProvider
+from .openai_provider import OpenAIProvider
 
 __all__ = [
+    "CircuitBreaker",
+    "ClaudeProvider",
+    "LLMOverloadedError",
     "LLMProvider",
+    "LLMScheduler",
     "OllamaProvider",
+    "OpenAIProvider",
+    "Priority",
+    "RouterProvider",
+    "ScheduledLLMProvider",
+    "SingleFlightLLMProvider",
+    "TokenUsage",
     "create_llm_provider",
     "list_providers",
     "register_provider",
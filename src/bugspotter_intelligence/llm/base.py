@@ -1,5 +1,27 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Optional
+
+
+# Sent ahead of every request and never varied, so backends that cache
+# prompt prefixes (Ollama's KV cache, hosted prompt caching) can reuse it
+SYSTEM_PROMPT = "You are a helpful assistant analyzing bug reports."
+
+
+@dataclass
+class TokenUsage:
+    """Tokens used by a provider since startup (as reported by its API)"""
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    def record(self, input_tokens: Optional[int], output_tokens: Optional[int]) -> None:
+        self.requests += 1
+        self.input_tokens += input_tokens or 0
+        self.output_tokens += output_tokens or 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
 
 
 class LLMProvider(ABC):
@@ -8,6 +30,7 @@ class LLMProvider(ABC):
     def __init__(self, settings):
         """Store settings in all providers"""
         self.settings = settings
+        self.usage = TokenUsage()
 
     @abstractmethod
     async def generate(
@@ -31,20 +54,67 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def stream(
+            self,
+            prompt: str,
+            context: Optional[list[str]] = None,
+            temperature: float = 0.7,
+            max_tokens: int = 1000
+    ) -> AsyncIterator[str]:
+        """
+        Generate a response as a stream of text chunks
+
+        Same arguments as generate(). Providers with a streaming API
+        override this to yield tokens as they are produced; the default
+        yields the whole response once it is complete.
+        """
+        yield await self.generate(prompt, context, temperature, max_tokens)
+
+    async def ping(self) -> None:
+        """
+        Cheap reachability check used by health checks
+
+        Raises if the backend can't be reached. The default assumes it can.
+        """
+        pass
+
+    async def warm_up(self) -> None:
+        """
+        Get the backend ready before the first request (e.g. load the model)
+
+        Called once at startup. Must not raise or block for long (slow
+        work goes in a background task): a backend that isn't up yet is
+        handled when requests arrive. The default does nothing.
+        """
+        pass
+
+    async def close(self) -> None:
+        """Release long-lived resources such as HTTP connection pools"""
+        pass
+
     def _build_context_prompt(self, prompt: str, context: Optional[list[str]] = None) -> str:
         """
         Helper method to combine prompt with context
         This is concrete (not abstract) - all providers can use it
+
+        For backends without a separate system prompt; providers that
+        have one send SYSTEM_PROMPT there and _build_user_prompt() as
+        the message.
         """
         if not context:
             return prompt
 
-        context_text = "\n\n".join([f"Context {i + 1}:\n{ctx}" for i, ctx in enumerate(context)])
+        return f"{SYSTEM_PROMPT}\n\n{self._build_user_prompt(prompt, context)}"
 
-        return f"""You are a helpful assistant analyzing bug reports.
+    def _build_user_prompt(self, prompt: str, context: Optional[list[str]] = None) -> str:
+        """The request-specific part of the prompt: context, then the question"""
+        if not context:
+            return prompt
+
+        context_text = "\n\n".join([f"Context {i + 1}:\n{ctx}" for i, ctx in enumerate(context)])
 
-{context_text}
+        return f"""{context_text}
 
 User Question: {prompt}
 
-Answer:"""
\ No newline at end of file
+Answer:"""
@@ -0,0 +1,97 @@
+from typing import AsyncIterator, Optional
+
+import anthropic
+
+from .base import SYSTEM_PROMPT, LLMProvider
+from .factory import register_provider
+from .scheduler import LLMOverloadedError
+
+
+@register_provider("claude")
+class ClaudeProvider(LLMProvider):
+    """
+    LLM provider using the Anthropic Messages API
+
+    One SDK async client per provider, so all requests share its
+    keep-alive connection pool and never block the event loop.
+    ANTHROPIC_BASE_URL points it at a proxy or a local stub server.
+    Call close() on shutdown.
+    """
+
+    def __init__(self, settings):
+        super().__init__(settings)
+        if not settings.anthropic_api_key:
+            raise ValueError("ANTHROPIC_API_KEY is required for the claude provider")
+
+        self.client = anthropic.AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            base_url=settings.anthropic_base_url,
+            timeout=settings.llm_api_timeout,
+            max_retries=settings.llm_api_max_retries
+        )
+
+    async def generate(
+            self,
+            prompt: str,
+            context: Optional[list[str]] = None,
+            temperature: float = 0.7,
+            max_tokens: int = 1000
+    ) -> str:
+        """Generate a response from Claude"""
+        try:
+            message = await self.client.messages.create(**self._request(prompt, context, temperature, max_tokens))
+        except anthropic.APIError as e:
+            raise _api_error(e) from e
+
+        self.usage.record(message.usage.input_tokens, message.usage.output_tokens)
+        return "".join(block.text for block in message.content if block.type == "text")
+
+    async def stream(
+            self,
+            prompt: str,
+            context: Optional[list[str]] = None,
+            temperature: float = 0.7,
+            max_tokens: int = 1000
+    ) -> AsyncIterator[str]:
+        """Stream text deltas from the Messages API"""
+        try:
+            async with self.client.messages.stream(**self._request(prompt, context, temperature, max_tokens)) as stream:
+                async for text in stream.text_stream:
+                    yield text
+                message = await stream.get_final_message()
+        except anthropic.APIError as e:
+            raise _api_error(e) from e
+
+        self.usage.record(message.usage.input_tokens, message.usage.output_tokens)
+
+    async def close(self) -> None:
+        """Close the SDK client and its connection pool"""
+        await self.client.close()
+
+    def _request(
+            self,
+            prompt: str,
+            context: Optional[list[str]],
+            temperature: float,
+            max_tokens: int
+    ) -> dict:
+        return {
+            "model": self.settings.claude_model,
+            "max_tokens": max_tokens,
+            "system": SYSTEM_PROMPT,
+            "messages": [{"role": "user", "content": self._build_user_prompt(prompt, context)}],
+            "temperature": temperature
+        }
+
+
+def _api_error(e: anthropic.APIError) -> Exception:
+    """Map a rate limit to LLMOverloadedError (429 + Retry-After), anything else to a plain error"""
+    if isinstance(e, anthropic.RateLimitError):
+        retry_after = e.response.headers.get("retry-after", "")
+        return LLMOverloadedError(
+            "Claude API rate limit reached",
+            429,
+            int(float(retry_after)) if retry_after.replace(".", "", 1).isdigit() else 1
+        )
+    status = getattr(e, "status_code", None)
+    return Exception(f"Claude API error: {status} - {e.message}" if status else f"Claude API error: {e.message}")
@@ -1,6 +1,7 @@
 from typing import Type, Dict
 from bugspotter_intelligence.config import Settings
 from .base import LLMProvider
+from .router import RouterProvider
 
 # Registry of available providers
 _PROVIDER_REGISTRY: Dict[str, Type[LLMProvider]] = {}
@@ -36,6 +37,9 @@ def create_llm_provider(settings: Settings) -> LLMProvider:
     Returns:
         Configured LLM provider instance
 
+    With llm_provider "ollama" and ollama_base_urls set, returns a
+    RouterProvider over one OllamaProvider per URL.
+
     Raises:
         ValueError: If provider type is not supported
     """
@@ -50,6 +54,10 @@ def create_llm_provider(settings: Settings) -> LLMProvider:
             f"Available providers: {available}"
         )
 
+    if provider_type == "ollama" and settings.ollama_base_urls:
+        urls = [url.strip() for url in settings.ollama_base_urls.split(",") if url.strip()]
+        return RouterProvider(settings, {url: provider_class(settings, base_url=url) for url in urls})
+
     return provider_class(settings)
 
 
@@ -1,15 +1,51 @@
-import os
+import asyncio
+import json
+import logging
+import time
 import httpx
-from typing import Optional
-from .base import LLMProvider
+from typing import AsyncIterator, Optional
+from .base import SYSTEM_PROMPT, LLMProvider
 from .factory import register_provider
 
+logger = logging.getLogger(__name__)
+
 @register_provider("ollama")
 class OllamaProvider(LLMProvider):
-    """LLM provider using local Ollama"""
-    def __init__(self, settings):
+    """
+    LLM provider using local Ollama
+
+    Requests share one pooled HTTP client with keep-alive, so concurrent
+    generations reuse connections instead of opening one per call.
+    Call close() on shutdown.
+
+    Every request asks Ollama to keep the model loaded for keep_alive,
+    and sends SYSTEM_PROMPT as the system prompt ahead of the
+    request-specific text, so the prompt starts with the same tokens each
+    time and Ollama can reuse them from its KV cache. warm_up() loads
+    the model at startup and reloads it whenever the provider has been
+    idle for keep_warm_interval.
+
+    base_url overrides settings.ollama_base_url (used when routing
+    across several Ollama servers).
+    """
+    def __init__(self, settings, base_url: Optional[str] = None):
         super().__init__(settings)
-        self.API_TIMEOUT = float(os.getenv('OLLAMA_TIMEOUT', '120'))
+        self.API_TIMEOUT = settings.ollama_timeout
+        self.client = httpx.AsyncClient(
+            base_url=base_url or settings.ollama_base_url,
+            timeout=httpx.Timeout(self.API_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.ollama_max_connections,
+                max_keepalive_connections=settings.ollama_max_keepalive_connections,
+                keepalive_expiry=settings.ollama_keepalive_expiry
+            )
+        )
+        # Ollama takes a duration ("30m") or a number of seconds (-1: forever)
+        keep_alive = settings.ollama_keep_alive
+        self.keep_alive = int(keep_alive) if keep_alive.lstrip("-").isdigit() else keep_alive
+        self.keep_warm_interval = settings.ollama_keep_warm_interval
+        self._last_request = time.monotonic()
+        self._keep_warm_task: Optional[asyncio.Task] = None
 
     async def generate(
             self,
@@ -19,30 +55,109 @@ class OllamaProvider(LLMProvider):
             max_tokens: int = 1000
     ) -> str:
         """Generate a response from the Ollama LLM"""
-        full_prompt = self._build_context_prompt(prompt, context)
+        payload = self._payload(prompt, context, temperature, max_tokens, stream=False)
+        self._last_request = time.monotonic()
+
+        response = await self.client.post("/api/generate", json=payload)
+
+        try:
+            response.raise_for_status()
+            result = response.json()
+            self.usage.record(result.get("prompt_eval_count"), result.get("eval_count"))
+            return result["response"]
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"Ollama API error: {e.response.status_code} - {e.response.text}")
+        except KeyError:
+            raise Exception(f"Unexpected Ollama response format: {response.text}")
+
+    async def stream(
+            self,
+            prompt: str,
+            context: Optional[list[str]] = None,
+            temperature: float = 0.7,
+            max_tokens: int = 1000
+    ) -> AsyncIterator[str]:
+        """Stream tokens from Ollama's NDJSON API as they are generated"""
+        payload = self._payload(prompt, context, temperature, max_tokens, stream=True)
+        self._last_request = time.monotonic()
+
+        async with self.client.stream("POST", "/api/generate", json=payload) as response:
+            if response.is_error:
+                await response.aread()
+                raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
 
-        payload = {
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise Exception(f"Ollama API error: {chunk['error']}")
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    self.usage.record(chunk.get("prompt_eval_count"), chunk.get("eval_count"))
+                    break
+
+    async def ping(self) -> None:
+        """Check the Ollama server answers (GET /api/version)"""
+        response = await self.client.get("/api/version")
+        response.raise_for_status()
+
+    async def warm_up(self) -> None:
+        """Start loading the model (when ollama_warm_up is set) and keeping it loaded, in the background"""
+        if self._keep_warm_task is None and (self.settings.ollama_warm_up or self.keep_warm_interval > 0):
+            self._keep_warm_task = asyncio.create_task(self._keep_warm())
+
+    async def close(self) -> None:
+        """Stop keep-warm pings and close the pooled HTTP client"""
+        if self._keep_warm_task:
+            self._keep_warm_task.cancel()
+            await asyncio.gather(self._keep_warm_task, return_exceptions=True)
+            self._keep_warm_task = None
+        await self.client.aclose()
+
+    async def _load_model(self) -> None:
+        """Ask Ollama to load the model (a request without a prompt only loads it)"""
+        payload = {"model": self.settings.ollama_model, "keep_alive": self.keep_alive, "stream": False}
+        try:
+            response = await self.client.post("/api/generate", json=payload)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(f"Loading Ollama model {self.settings.ollama_model} failed: {e}")
+            return
+
+        self._last_request = time.monotonic()
+
+    async def _keep_warm(self) -> None:
+        if self.settings.ollama_warm_up:
+            await self._load_model()
+        if self.keep_warm_interval <= 0:
+            return
+
+        while True:
+            idle = time.monotonic() - self._last_request
+            if idle >= self.keep_warm_interval:
+                await self._load_model()
+                idle = 0.0
+            await asyncio.sleep(self.keep_warm_interval - idle)
+
+    def _payload(
+            self,
+            prompt: str,
+            context: Optional[list[str]],
+            temperature: float,
+            max_tokens: int,
+            stream: bool
+    ) -> dict:
+        return {
             "model": self.settings.ollama_model,
-            "prompt": full_prompt,
+            "system": SYSTEM_PROMPT,
+            "prompt": self._build_user_prompt(prompt, context),
+            "keep_alive": self.keep_alive,
             "options": {
                 "temperature": temperature,
                 "num_predict": max_tokens,
             },
-            "stream": False
+            "stream": stream
         }
-
-        timeout = httpx.Timeout(self.API_TIMEOUT, read=self.API_TIMEOUT)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                f"{self.settings.ollama_base_url}/api/generate",
-                json=payload,
-            )
-
-            try:
-                response.raise_for_status()
-                result = response.json()
-                return result["response"]
-            except httpx.HTTPStatusError as e:
-                raise Exception(f"Ollama API error: {e.response.status_code} - {e.response.text}")
-            except KeyError:
-                raise Exception(f"Unexpected Ollama response format: {response.text}")
\ No newline at end of file
@@ -0,0 +1,105 @@
+from typing import AsyncIterator, Optional
+
+import openai
+
+from .base import SYSTEM_PROMPT, LLMProvider
+from .factory import register_provider
+from .scheduler import LLMOverloadedError
+
+
+@register_provider("openai")
+class OpenAIProvider(LLMProvider):
+    """
+    LLM provider using the OpenAI Chat Completions API
+
+    One SDK async client per provider, sharing its keep-alive connection
+    pool. OPENAI_BASE_URL points it at any OpenAI-compatible server
+    (vLLM, llama.cpp) or a local stub. Call close() on shutdown.
+    """
+
+    def __init__(self, settings):
+        super().__init__(settings)
+        if not settings.openai_api_key:
+            raise ValueError("OPENAI_API_KEY is required for the openai provider")
+
+        self.client = openai.AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url,
+            timeout=settings.llm_api_timeout,
+            max_retries=settings.llm_api_max_retries
+        )
+
+    async def generate(
+            self,
+            prompt: str,
+            context: Optional[list[str]] = None,
+            temperature: float = 0.7,
+            max_tokens: int = 1000
+    ) -> str:
+        """Generate a chat completion"""
+        try:
+            completion = await self.client.chat.completions.create(
+                **self._request(prompt, context, temperature, max_tokens)
+            )
+        except openai.APIError as e:
+            raise _api_error(e) from e
+
+        if completion.usage:
+            self.usage.record(completion.usage.prompt_tokens, completion.usage.completion_tokens)
+        return completion.choices[0].message.content or ""
+
+    async def stream(
+            self,
+            prompt: str,
+            context: Optional[list[str]] = None,
+            temperature: float = 0.7,
+            max_tokens: int = 1000
+    ) -> AsyncIterator[str]:
+        """Stream content deltas; usage arrives in the final chunk"""
+        try:
+            chunks = await self.client.chat.completions.create(
+                **self._request(prompt, context, temperature, max_tokens),
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            async for chunk in chunks:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                if chunk.usage:
+                    self.usage.record(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+        except openai.APIError as e:
+            raise _api_error(e) from e
+
+    async def close(self) -> None:
+        """Close the SDK client and its connection pool"""
+        await self.client.close()
+
+    def _request(
+            self,
+            prompt: str,
+            context: Optional[list[str]],
+            temperature: float,
+            max_tokens: int
+    ) -> dict:
+        return {
+            "model": self.settings.openai_model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": self._build_user_prompt(prompt, context)}
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+
+
+def _api_error(e: openai.APIError) -> Exception:
+    """Map a rate limit to LLMOverloadedError (429 + Retry-After), anything else to a plain error"""
+    if isinstance(e, openai.RateLimitError):
+        retry_after = e.response.headers.get("retry-after", "")
+        return LLMOverloadedError(
+            "OpenAI API rate limit reached",
+            429,
+            int(float(retry_after)) if retry_after.replace(".", "", 1).isdigit() else 1
+        )
+    status = getattr(e, "status_code", None)
+    return Exception(f"OpenAI API error: {status} - {e.message}" if status else f"OpenAI API error: {e.message}")
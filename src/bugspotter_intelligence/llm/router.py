@@ -0,0 +1,374 @@
+"""Routing LLM calls across several backends"""
+
+import asyncio
+import itertools
+import logging
+import math
+import statistics
+import time
+from collections import deque
+from typing import AsyncIterator, Callable, Optional
+
+from .base import LLMProvider
+from .scheduler import LLMOverloadedError, LLMScheduler
+
+logger = logging.getLogger(__name__)
+
+# Recent call durations kept for the hedge delay
+LATENCY_WINDOW = 200
+# Calls observed before hedging starts (p95 of fewer is noise)
+HEDGE_MIN_SAMPLES = 20
+
+
+class CircuitBreaker:
+    """
+    Takes a failing backend out of rotation
+
+    Closed: calls go through. After failure_threshold consecutive
+    failures (or a failed health check) it opens and calls are refused.
+    After reset_timeout it is half-open: one trial call is let through,
+    and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self.clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allows(self) -> bool:
+        """Whether a call may be sent now"""
+        state = self.state
+        return state == "closed" or (state == "half_open" and not self._trial)
+
+    def begin(self) -> None:
+        """A call is being sent (claims the trial when half-open)"""
+        if self.state == "half_open":
+            self._trial = True
+
+    def success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._trial = False
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self._opened_at is not None or self.failures >= self.failure_threshold:
+            self.trip()
+
+    def abandon(self) -> None:
+        """A call ended without an outcome (cancelled); free the trial"""
+        self._trial = False
+
+    def trip(self) -> None:
+        """Open the breaker now"""
+        self._opened_at = self.clock()
+        self._trial = False
+
+    def retry_in(self) -> float:
+        """Seconds until the breaker lets a trial call through"""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - self.clock())
+
+
+class _Backend:
+    def __init__(self, name: str, provider: LLMProvider, breaker: CircuitBreaker):
+        self.name = name
+        self.provider = provider
+        self.breaker = breaker
+        self.outstanding = 0
+
+
+class RouterProvider(LLMProvider):
+    """
+    LLM provider that spreads calls over several backends
+
+    Each call goes to the available backend with the fewest calls in
+    flight. A backend whose circuit breaker is open (repeated errors or
+    failed health checks) is skipped; a call that fails is retried on
+    the next backend, so one server going down costs no requests.
+    Streams fail over only until their first token.
+
+    With hedging enabled, a generate() call still running after the
+    recent p95 latency is also sent to a second backend and the first
+    answer wins, cutting the tail from one slow server. Hedging doubles
+    the work of the calls it applies to, so background callers should
+    use without_hedging(). When the router sits behind an LLMScheduler,
+    set scheduler to it: the hedge then takes a slot of its own and is
+    only sent when one is free, so it never goes over the concurrency
+    limit or jumps the queue.
+
+    Health checks run every health_interval seconds once the first call
+    is made. Call close() on shutdown.
+    """
+
+    def __init__(self, settings, backends: dict[str, LLMProvider], clock: Callable[[], float] = time.monotonic):
+        super().__init__(settings)
+        if not backends:
+            raise ValueError("RouterProvider needs at least one backend")
+
+        self.backends = [
+            _Backend(name, provider, CircuitBreaker(settings.llm_breaker_failures, settings.llm_breaker_reset, clock))
+            for name, provider in backends.items()
+        ]
+        for backend in self.backends:
+            # One running total for the router
+            backend.provider.usage = self.usage
+
+        self.clock = clock
+        self.hedge = settings.llm_hedge_enabled
+        self.health_interval = settings.llm_health_interval
+        self.hedged_calls = 0
+        self.scheduler: Optional[LLMScheduler] = None
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._rotation = itertools.count()
+        self._health_task: Optional[asyncio.Task] = None
+
+    async def generate(
+            self,
+            prompt: str,
+            context: Optional[list[str]] = None,
+            temperature: float = 0.7,
+            max_tokens: int = 1000
+    ) -> str:
+        return await self.route(prompt, context, temperature, max_tokens, hedge=self.hedge)
+
+    async def route(
+            self,
+            prompt: str,
+            context: Optional[list[str]],
+            temperature: float,
+            max_tokens: int,
+            hedge: bool
+    ) -> str:
+        """generate() with failover, hedged or not"""
+        self._start_health_checks()
+        tried: list[_Backend] = []
+        error: Optional[Exception] = None
+
+        while (backend := self._pick(tried)) is not None:
+            tried.append(backend)
+            call = (prompt, context, temperature, max_tokens)
+            try:
+                if hedge:
+                    return await self._hedged(backend, tried, call)
+                return await self._attempt(backend, call)
+            except Exception as e:
+                error = e
+                logger.warning(f"LLM backend {backend.name} failed: {e}")
+
+        raise self._unavailable(error)
+
+    async def stream(
+            self,
+            prompt: str,
+            context: Optional[list[str]] = None,
+            temperature: float = 0.7,
+            max_tokens: int = 1000
+    ) -> AsyncIterator[str]:
+        """Stream from one backend, failing over only before the first chunk"""
+        self._start_health_checks()
+        tried: list[_Backend] = []
+        error: Optional[Exception] = None
+
+        while (backend := self._pick(tried)) is not None:
+            tried.append(backend)
+            started = False
+            backend.breaker.begin()
+            backend.outstanding += 1
+            try:
+                async for chunk in backend.provider.stream(prompt, context, temperature, max_tokens):
+                    started = True
+                    yield chunk
+            except Exception as e:
+                backend.breaker.failure()
+                if started:
+                    raise
+                error = e
+                logger.warning(f"LLM backend {backend.name} failed: {e}")
+                continue
+            except BaseException:
+                backend.breaker.abandon()
+                raise
+            finally:
+                backend.outstanding -= 1
+
+            backend.breaker.success()
+            return
+
+        raise self._unavailable(error)
+
+    def without_hedging(self) -> LLMProvider:
+        """This router for background calls: same backends, never hedged"""
+        return _UnhedgedRouter(self)
+
+    def hedge_delay(self) -> Optional[float]:
+        """p95 of recent call durations, or None until there are enough"""
+        if len(self._latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return statistics.quantiles(self._latencies, n=20)[-1]
+
+    def stats(self) -> dict:
+        return {
+            "backends": [
+                {
+                    "name": b.name,
+                    "state": b.breaker.state,
+                    "outstanding": b.outstanding,
+                    "failures": b.breaker.failures
+                }
+                for b in self.backends
+            ],
+            "hedged_calls": self.hedged_calls,
+            "hedge_delay": self.hedge_delay()
+        }
+
+    async def warm_up(self) -> None:
+        """Warm up every backend"""
+        await asyncio.gather(*(backend.provider.warm_up() for backend in self.backends))
+
+    async def close(self) -> None:
+        """Stop health checks and close every backend"""
+        if self._health_task:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+        for backend in self.backends:
+            await backend.provider.close()
+
+    def _pick(self, exclude: list[_Backend]) -> Optional[_Backend]:
+        """Available backend with the fewest calls in flight; ties rotate"""
+        start = next(self._rotation)
+        count = len(self.backends)
+        candidates = [
+            self.backends[(start + i) % count]
+            for i in range(count)
+            if self.backends[(start + i) % count] not in exclude
+        ]
+        candidates = [b for b in candidates if b.breaker.allows()]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda b: b.outstanding)
+
+    async def _attempt(self, backend: _Backend, call: tuple) -> str:
+        backend.breaker.begin()
+        backend.outstanding += 1
+        start = self.clock()
+        try:
+            result = await backend.provider.generate(*call)
+        except Exception:
+            backend.breaker.failure()
+            raise
+        except BaseException:
+            backend.breaker.abandon()
+            raise
+        finally:
+            backend.outstanding -= 1
+
+        backend.breaker.success()
+        self._latencies.append(self.clock() - start)
+        return result
+
+    async def _hedged(self, primary: _Backend, tried: list[_Backend], call: tuple) -> str:
+        """Run on primary; past the hedge delay, race a second backend too"""
+        tasks = [asyncio.create_task(self._attempt(primary, call))]
+        try:
+            delay = self.hedge_delay()
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                backup = None if done else self._pick(tried)
+                if backup is not None and self.scheduler and not self.scheduler.try_acquire():
+                    backup = None
+                if backup is not None:
+                    tried.append(backup)
+                    self.hedged_calls += 1
+                    hedge = asyncio.create_task(self._attempt(backup, call))
+                    if self.scheduler:
+                        # Runs even if the task is cancelled before it starts
+                        hedge.add_done_callback(lambda _: self.scheduler.release())
+                    tasks.append(hedge)
+
+            error: Optional[Exception] = None
+            for finished in asyncio.as_completed(tasks):
+                try:
+                    return await finished
+                except Exception as e:
+                    error = e
+            raise error
+        finally:
+            # The loser (or both, if the caller went away)
+            for task in tasks:
+                task.cancel()
+
+    def _unavailable(self, error: Optional[Exception]) -> Exception:
+        """The error for a call no backend could serve"""
+        if error is not None:
+            return error
+        retry_after = min(b.breaker.retry_in() for b in self.backends)
+        return LLMOverloadedError("No LLM backend is available", 503, max(1, math.ceil(retry_after)))
+
+    def _start_health_checks(self) -> None:
+        if self.health_interval > 0 and self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.gather(*(self._check(backend) for backend in self.backends))
+            await asyncio.sleep(self.health_interval)
+
+    async def _check(self, backend: _Backend) -> None:
+        try:
+            await asyncio.wait_for(backend.provider.ping(), self.health_interval)
+        except Exception as e:
+            if backend.breaker.state == "closed":
+                logger.warning(f"LLM backend {backend.name} failed its health check: {e}")
+            backend.breaker.trip()
+            return
+
+        # Only a tripped breaker is reset: a passing ping says nothing
+        # about errors that calls to a reachable backend keep getting
+        if backend.breaker.state != "closed":
+            logger.info(f"LLM backend {backend.name} passed its health check")
+            backend.breaker.success()
+
+
+class _UnhedgedRouter(LLMProvider):
+    """View of a RouterProvider whose generate() calls are never hedged"""
+
+    def __init__(self, router: RouterProvider):
+        super().__init__(router.settings)
+        self.router = router
+        self.usage = router.usage
+
+    async def generate(
+            self,
+            prompt: str,
+            context: Optional[list[str]] = None,
+            temperature: float = 0.7,
+            max_tokens: int = 1000
+    ) -> str:
+        return await self.router.route(prompt, context, temperature, max_tokens, hedge=False)
+
+    async def stream(
+            self,
+            prompt: str,
+            context: Optional[list[str]] = None,
+            temperature: float = 0.7,
+            max_tokens: int = 1000
+    ) -> AsyncIterator[str]:
+        async for chunk in self.router.stream(prompt, context, temperature, max_tokens):
+            yield chunk
+
+    async def close(self) -> None:
+        await self.router.close()
@@ -0,0 +1,177 @@
+"""Admission control for LLM calls"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator, Optional
+
+from .base import LLMProvider
+
+
+class Priority(IntEnum):
+    """Scheduling class of an LLM call; lower runs first"""
+    INTERACTIVE = 0  # /ask, mitigation: a user is waiting
+    BACKGROUND = 1  # resolution summaries
+
+
+class LLMOverloadedError(Exception):
+    """
+    The LLM is saturated and the call was not run
+
+    status_code is 429 when the queue was full on arrival and 503 when
+    the call waited past its queue deadline; retry_after is the
+    suggested wait in seconds.
+    """
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class LLMScheduler:
+    """
+    Bounded-concurrency gate in front of an LLM backend
+
+    At most max_concurrency calls run at once. Others wait in a priority
+    queue (interactive before background, FIFO within a class).
+    Interactive calls are rejected at once when max_queue of them are
+    already waiting, and give up after queue_timeout seconds in the
+    queue, so overload turns into quick errors rather than requests
+    stacking up behind the provider's own timeout. Background calls
+    wait as long as it takes.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._running = 0
+        self._waiting = {Priority.INTERACTIVE: 0, Priority.BACKGROUND: 0}
+        self._queue: list[tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        # Moving average of call duration, for Retry-After
+        self._service_time: Optional[float] = None
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.INTERACTIVE):
+        """Hold one of the concurrency slots for the duration of the block"""
+        await self.acquire(priority)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._observe(time.monotonic() - start)
+            self.release()
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE) -> None:
+        """
+        Wait for a slot
+
+        Raises:
+            LLMOverloadedError: If an interactive call finds the queue full
+                or waits longer than queue_timeout
+        """
+        if self._running < self.max_concurrency and not self._queue:
+            self._running += 1
+            return
+
+        interactive = priority == Priority.INTERACTIVE
+        if interactive and self._waiting[priority] >= self.max_queue:
+            raise LLMOverloadedError("LLM queue is full", 429, self.retry_after())
+
+        granted = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._order), granted))
+        self._waiting[priority] += 1
+
+        try:
+            await asyncio.wait_for(granted, self.queue_timeout if interactive else None)
+        except asyncio.TimeoutError:
+            raise LLMOverloadedError(
+                f"Waited more than {self.queue_timeout:.0f}s for the LLM", 503, self.retry_after()
+            ) from None
+        except BaseException:
+            if granted.done() and not granted.cancelled():
+                # The slot was handed over as the caller went away
+                self.release()
+            raise
+        finally:
+            self._waiting[priority] -= 1
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free and nobody is waiting for it"""
+        if self._running < self.max_concurrency and not self._queue:
+            self._running += 1
+            return True
+        return False
+
+    def release(self) -> None:
+        """Free a slot, handing it to the next waiter if there is one"""
+        while self._queue:
+            _, _, granted = heapq.heappop(self._queue)
+            if not granted.done():
+                granted.set_result(None)
+                return
+        self._running -= 1
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue has likely drained"""
+        service_time = self._service_time or self.queue_timeout
+        queued = sum(self._waiting.values())
+        return max(1, math.ceil(service_time * (queued + 1) / self.max_concurrency))
+
+    def stats(self) -> dict:
+        return {
+            "running": self._running,
+            "waiting_interactive": self._waiting[Priority.INTERACTIVE],
+            "waiting_background": self._waiting[Priority.BACKGROUND]
+        }
+
+    def _observe(self, seconds: float) -> None:
+        if self._service_time is None:
+            self._service_time = seconds
+        else:
+            self._service_time = 0.8 * self._service_time + 0.2 * seconds
+
+
+class ScheduledLLMProvider(LLMProvider):
+    """LLM provider whose calls go through an LLMScheduler at one priority"""
+
+    def __init__(self, provider: LLMProvider, scheduler: LLMScheduler, priority: Priority = Priority.INTERACTIVE):
+        super().__init__(provider.settings)
+        self.provider = provider
+        self.usage = provider.usage
+        self.scheduler = scheduler
+        self.priority = priority
+
+    async def generate(
+            self,
+            prompt: str,
+            context: Optional[list[str]] = None,
+            temperature: float = 0.7,
+            max_tokens: int = 1000
+    ) -> str:
+        async with self.scheduler.slot(self.priority):
+            return await self.provider.generate(prompt, context, temperature, max_tokens)
+
+    async def stream(
+            self,
+            prompt: str,
+            context: Optional[list[str]] = None,
+            temperature: float = 0.7,
+            max_tokens: int = 1000
+    ) -> AsyncIterator[str]:
+        """Holds the slot until the stream ends"""
+        async with self.scheduler.slot(self.priority):
+            async for chunk in self.provider.stream(prompt, context, temperature, max_tokens):
+                yield chunk
+
+    async def warm_up(self) -> None:
+        await self.provider.warm_up()
+
+    async def close(self) -> None:
+        await self.provider.close()
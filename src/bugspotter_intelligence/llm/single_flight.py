@@ -0,0 +1,184 @@
+"""Coalescing of identical concurrent LLM requests"""
+
+import asyncio
+import logging
+from contextlib import aclosing
+from typing import AsyncIterator, Optional
+
+from .base import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """One shared generation and the callers waiting on it"""
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+        # Streaming state: chunks so far, replayed to late joiners
+        self.chunks: list[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._changed = asyncio.Event()
+
+    def publish(self, chunk: str) -> None:
+        self.chunks.append(chunk)
+        self._wake()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.done = True
+        self.error = error
+        self._wake()
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        position = 0
+        while True:
+            while position < len(self.chunks):
+                yield self.chunks[position]
+                position += 1
+
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+
+            changed = self._changed
+            await changed.wait()
+
+    def _wake(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+
+class SingleFlightLLMProvider(LLMProvider):
+    """
+    LLM provider that shares one generation among identical requests
+
+    Requests with the same provider, model, prompt, context, temperature
+    and max_tokens that arrive while one is in flight wait for its
+    result instead of sending their own. For streams, every caller gets
+    all chunks: late joiners first receive what was already produced.
+
+    Errors reach every waiter. A caller that disconnects leaves the
+    others unaffected; the generation is cancelled only when its last
+    waiter is gone. Nothing is kept once a generation finishes.
+    """
+
+    def __init__(self, provider: LLMProvider, model: str):
+        super().__init__(provider.settings)
+        self.provider = provider
+        self.usage = provider.usage
+        self.model = model
+        self._generations: dict[tuple, _Flight] = {}
+        self._streams: dict[tuple, _Flight] = {}
+
+    async def generate(
+            self,
+            prompt: str,
+            context: Optional[list[str]] = None,
+            temperature: float = 0.7,
+            max_tokens: int = 1000
+    ) -> str:
+        key = self._key(prompt, context, temperature, max_tokens)
+
+        flight = self._generations.get(key)
+        if flight is None:
+            flight = _Flight()
+            flight.task = asyncio.create_task(
+                self.provider.generate(prompt, context, temperature, max_tokens)
+            )
+            flight.task.add_done_callback(lambda _: self._forget(self._generations, key, flight))
+            self._generations[key] = flight
+        else:
+            logger.debug("Joined in-flight LLM generation")
+
+        flight.waiters += 1
+        try:
+            # Shielded so one waiter's cancellation doesn't cancel the others
+            return await asyncio.shield(flight.task)
+        finally:
+            self._leave(self._generations, key, flight)
+
+    async def stream(
+            self,
+            prompt: str,
+            context: Optional[list[str]] = None,
+            temperature: float = 0.7,
+            max_tokens: int = 1000
+    ) -> AsyncIterator[str]:
+        key = self._key(prompt, context, temperature, max_tokens)
+
+        flight = self._streams.get(key)
+        if flight is None:
+            flight = _Flight()
+            flight.task = asyncio.create_task(
+                self._produce(flight, key, prompt, context, temperature, max_tokens)
+            )
+            self._streams[key] = flight
+        else:
+            logger.debug("Joined in-flight LLM stream")
+
+        flight.waiters += 1
+        try:
+            async with aclosing(flight.subscribe()) as chunks:
+                async for chunk in chunks:
+                    yield chunk
+        finally:
+            self._leave(self._streams, key, flight)
+
+    async def warm_up(self) -> None:
+        await self.provider.warm_up()
+
+    async def close(self) -> None:
+        await self.provider.close()
+
+    async def _produce(
+            self,
+            flight: _Flight,
+            key: tuple,
+            prompt: str,
+            context: Optional[list[str]],
+            temperature: float,
+            max_tokens: int
+    ) -> None:
+        error = None
+        try:
+            async for chunk in self.provider.stream(prompt, context, temperature, max_tokens):
+                flight.publish(chunk)
+        except Exception as e:
+            error = e
+        finally:
+            self._forget(self._streams, key, flight)
+            flight.finish(error)
+
+    def _key(
+            self,
+            prompt: str,
+            context: Optional[list[str]],
+            temperature: float,
+            max_tokens: int
+    ) -> tuple:
+        return (
+            self.settings.llm_provider,
+            self.model,
+            prompt,
+            tuple(context or ()),
+            temperature,
+            max_tokens
+        )
+
+    @classmethod
+    def _leave(cls, flights: dict[tuple, _Flight], key: tuple, flight: _Flight) -> None:
+        """Drop a waiter; the generation is cancelled when nobody is left"""
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            # Forget it now so a new caller doesn't join a cancelled flight
+            cls._forget(flights, key, flight)
+            flight.task.cancel()
+
+    @staticmethod
+    def _forget(flights: dict[tuple, _Flight], key: tuple, flight: _Flight) -> None:
+        # A newer flight may already use the key
+        if flights.get(key) is flight:
+            del flights[key]
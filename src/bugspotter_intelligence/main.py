@@ -1,12 +1,24 @@
 import logging
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from bugspotter_intelligence.config import Settings
-from bugspotter_intelligence.db.migrations import create_tables
+from bugspotter_intelligence.db.migrations import verify_schema
 from bugspotter_intelligence.db.database import init_db, close_db
+from bugspotter_intelligence.services.access_tracker import init_access_tracker, close_access_tracker
+from bugspotter_intelligence.services.semantic_cache import init_semantic_cache, close_semantic_cache
+from bugspotter_intelligence.services.vector_index import init_vector_index, close_vector_index
+from bugspotter_intelligence.api.deps import (
+    init_llm_provider,
+    close_llm_provider,
+    get_background_llm_provider,
+    get_llm_provider
+)
+from bugspotter_intelligence.jobs.summary_worker import init_summary_worker, close_summary_worker
 from bugspotter_intelligence.api.routes import ask, bugs
+from bugspotter_intelligence.llm import LLMOverloadedError
 
 logging.basicConfig(
     level=logging.INFO,
@@ -27,19 +39,39 @@ async def lifespan(app: FastAPI):
         await init_db(settings)
         logger.info("Database pool initialized")
 
-        # Run migrations
+        # Migrations run separately (bugspotter-migrate); just check they have
         from bugspotter_intelligence.db.database import get_pool
         pool = get_pool()
         async with pool.connection() as conn:
-            await create_tables(conn)
+            version = await verify_schema(conn)
+        logger.info(f"Database schema at version {version}")
 
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         raise  # Re-raise to prevent app from starting
 
+    try:
+        await init_vector_index(settings, pool)
+    except Exception as e:
+        # Similarity search still works through Postgres
+        logger.warning(f"Vector index disabled, failed to initialize: {e}")
+
+    await init_access_tracker(settings, pool)
+
+    init_llm_provider(settings)
+    await get_llm_provider().warm_up()
+    init_semantic_cache(settings)
+    await init_summary_worker(settings, pool, get_background_llm_provider())
+
     yield  # App runs here
 
     # Shutdown
+    await close_summary_worker()
+    close_semantic_cache()
+    await close_llm_provider()
+    await close_access_tracker()
+    await close_vector_index()
+
     try:
         await close_db()
         logger.info("Database pool closed")
@@ -72,6 +104,15 @@ def create_app() -> FastAPI:
 
     register_routes(app)
 
+    @app.exception_handler(LLMOverloadedError)
+    async def llm_overloaded(request: Request, exc: LLMOverloadedError) -> JSONResponse:
+        # 429 queue full / 503 queue deadline passed; clients back off for Retry-After
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={"detail": str(exc)},
+            headers={"Retry-After": str(exc.retry_after)}
+        )
+
     @app.get("/health")
     async def health_check():
         return {"status": "healthy"}
@@ -72,6 +72,11 @@ class AnalyzeBugRequest(BaseModel):
         description="Environment metadata (browser, OS, etc.)"
     )
 
+    detect_duplicates: bool = Field(
+        default=False,
+        description="Check for a duplicate before storing and mark the bug if one is found"
+    )
+
 
 class UpdateResolutionRequest(BaseModel):
     """Request model for updating bug resolution"""
@@ -88,4 +93,52 @@ class UpdateResolutionRequest(BaseModel):
         default="resolved",
         pattern="^(resolved|closed|wont_fix)$",
         description="New bug status"
-    )
\ No newline at end of file
+    )
+
+
+class ResolutionUpdate(UpdateResolutionRequest):
+    """One bug's resolution in a bulk update"""
+
+    bug_id: str = Field(
+        ...,
+        min_length=1,
+        description="Bug identifier",
+        examples=["bug-12345"]
+    )
+
+
+class BulkUpdateResolutionRequest(BaseModel):
+    """Request model for updating many bug resolutions at once"""
+
+    updates: list[ResolutionUpdate] = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="Resolutions to write; a bug listed twice gets its last update"
+    )
+
+
+class BatchSimilarBugsRequest(BaseModel):
+    """Request model for finding similar bugs for many bugs at once"""
+
+    bug_ids: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="Bug identifiers to find similar bugs for",
+        examples=[["bug-12345", "bug-12346"]]
+    )
+
+    threshold: float | None = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="Similarity threshold (defaults to SIMILARITY_THRESHOLD)"
+    )
+
+    limit: int | None = Field(
+        default=None,
+        ge=1,
+        le=20,
+        description="Maximum similar bugs per bug (defaults to MAX_SIMILAR_BUGS)"
+    )
@@ -21,6 +21,29 @@ class AskResponse(BaseModel):
     )
 
 
+class SemanticCacheStats(BaseModel):
+    """Response model for /ask/cache"""
+
+    enabled: bool
+    entries: int = 0
+    max_entries: int = 0
+    hits: int = 0
+    misses: int = 0
+    hit_rate: float = Field(0.0, ge=0.0, le=1.0, description="Hits / lookups since startup")
+    evictions: int = Field(0, description="Live entries dropped to make room")
+    expirations: int = Field(0, description="Expired entries replaced")
+
+
+class LLMUsageStats(BaseModel):
+    """Response model for /ask/usage"""
+
+    provider: str
+    model: str
+    requests: int = Field(..., description="Completed LLM calls since startup")
+    input_tokens: int
+    output_tokens: int
+
+
 class SimilarBug(BaseModel):
     """Model for a similar bug in search results"""
 
@@ -38,6 +61,12 @@ class AnalyzeBugResponse(BaseModel):
     bug_id: str
     embedding_generated: bool
     stored: bool = True
+    is_duplicate: Optional[bool] = Field(
+        default=None,
+        description="Whether the bug was marked as a duplicate (null when detect_duplicates was off)"
+    )
+    duplicate_of: Optional[str] = None
+    duplicate_similarity: Optional[float] = None
 
 
 class SimilarBugsResponse(BaseModel):
@@ -49,12 +78,33 @@ class SimilarBugsResponse(BaseModel):
     threshold_used: float
 
 
+class BatchSimilarBugsResponse(BaseModel):
+    """Response model for batched similar bugs query"""
+
+    results: list[SimilarBugsResponse]
+    not_found: list[str] = []
+
+
+class PromptStats(BaseModel):
+    """Size of a generated prompt and what context trimming saved (token counts are estimates)"""
+
+    prompt_tokens: int
+    context_tokens: int
+    context_snippets: int = Field(..., description="Similar bugs used as context")
+    summaries_used: int = Field(..., description="Snippets that used the resolution summary")
+    duplicates_dropped: int = Field(..., description="Similar bugs skipped as near-identical resolutions")
+    over_budget_dropped: int = Field(..., description="Similar bugs skipped to stay within the token budget")
+    tokens_saved: int = Field(..., description="Versus every similar bug's full resolution")
+    prefill_seconds_saved: float = Field(..., description="tokens_saved at LLM_PREFILL_TOKENS_PER_SECOND")
+
+
 class MitigationResponse(BaseModel):
     """Response model for mitigation suggestion"""
 
     bug_id: str
     mitigation_suggestion: str
     based_on_similar_bugs: bool
+    prompt_stats: Optional[PromptStats] = None
 
 
 class BugDetailResponse(BaseModel):
@@ -68,6 +118,10 @@ class BugDetailResponse(BaseModel):
     resolution_summary: Optional[str] = None
     created_at: str
     updated_at: str
+    summary_status: Optional[str] = Field(
+        None,
+        description="Resolution summary job: pending, running, done or failed (None if never queued)"
+    )
 
 
 class ResolutionUpdateResponse(BaseModel):
@@ -75,5 +129,13 @@ class ResolutionUpdateResponse(BaseModel):
 
     bug_id: str
     status: str
-    resolution_summary: str
-    updated: bool = True
\ No newline at end of file
+    resolution_summary: Optional[str] = Field(None, description="None while the summary job is pending")
+    summary_status: str = "done"
+    updated: bool = True
+
+
+class BulkResolutionUpdateResponse(BaseModel):
+    """Response model for bulk resolution update"""
+
+    results: list[ResolutionUpdateResponse]
+    not_found: list[str] = []
@@ -0,0 +1,105 @@
+"""Batched last_accessed tracking for bug reads"""
+
+import asyncio
+import logging
+from typing import Iterable, Optional
+
+from psycopg_pool import AsyncConnectionPool
+
+from bugspotter_intelligence.config import Settings
+from bugspotter_intelligence.db.bug_repository import BugRepository
+
+logger = logging.getLogger(__name__)
+
+
+class AccessTracker:
+    """
+    Records bug reads in memory and flushes them periodically
+
+    Reads only add ids to a set; a background task writes the whole set
+    with one bulk UPDATE every flush_interval seconds, so read traffic
+    never turns into one write per read.
+    """
+
+    def __init__(self, pool: AsyncConnectionPool, flush_interval: float = 5.0):
+        self.pool = pool
+        self.flush_interval = flush_interval
+        self.repo = BugRepository()
+        self._pending: set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, bug_ids: Iterable[str]) -> None:
+        """Mark bugs as accessed (no I/O)"""
+        self._pending.update(bug_ids)
+
+    async def flush(self) -> int:
+        """Write all pending accesses in a single statement"""
+        if not self._pending:
+            return 0
+
+        bug_ids, self._pending = self._pending, set()
+
+        try:
+            async with self.pool.connection() as conn:
+                touched = await self.repo.touch_bugs(conn, list(bug_ids))
+        except Exception:
+            # Keep the ids for the next attempt
+            self._pending.update(bug_ids)
+            raise
+
+        logger.debug(f"Flushed last_accessed for {touched} bugs")
+        return touched
+
+    async def start(self) -> None:
+        """Start the periodic flush task"""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write what is still pending"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"Final access flush failed: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Access flush failed, will retry: {e}")
+
+
+_tracker: AccessTracker | None = None
+
+
+async def init_access_tracker(settings: Settings, pool: AsyncConnectionPool) -> None:
+    """Start access tracking (no-op when disabled)"""
+    global _tracker
+
+    if not settings.access_tracking_enabled:
+        return
+
+    _tracker = AccessTracker(pool, settings.access_flush_interval)
+    await _tracker.start()
+
+
+async def close_access_tracker() -> None:
+    """Flush pending accesses and stop tracking"""
+    global _tracker
+    if _tracker:
+        await _tracker.stop()
+        _tracker = None
+
+
+def get_access_tracker() -> Optional[AccessTracker]:
+    """Get the access tracker, or None when disabled"""
+    return _tracker
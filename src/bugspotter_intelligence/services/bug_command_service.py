@@ -1,10 +1,17 @@
+import asyncio
+import json
+import logging
 from typing import Optional
 from psycopg import AsyncConnection
 
+from bugspotter_intelligence.config import Settings
 from bugspotter_intelligence.llm import LLMProvider
 from bugspotter_intelligence.db.bug_repository import BugRepository
 from bugspotter_intelligence.services.embeddings import EmbeddingProvider
 from bugspotter_intelligence.utils.log_extractor import build_embedding_text
+from bugspotter_intelligence.utils.minhash import estimate_jaccard, lsh_bands, minhash_signature
+
+logger = logging.getLogger(__name__)
 
 
 class BugCommandService:
@@ -17,10 +24,16 @@ class BugCommandService:
     - Mark bugs as duplicates
     """
 
-    def __init__(self, llm_provider: LLMProvider, embedding_provider: EmbeddingProvider):
+    def __init__(
+            self,
+            llm_provider: LLMProvider,
+            embedding_provider: EmbeddingProvider,
+            settings: Optional[Settings] = None
+    ):
         self.llm = llm_provider
         self.embeddings = embedding_provider
         self.repo = BugRepository()
+        self.settings = settings or Settings()
 
     async def analyze_and_store_bug(
             self,
@@ -30,19 +43,33 @@ class BugCommandService:
             description: Optional[str] = None,
             console_logs: Optional[list[dict]] = None,
             network_logs: Optional[list[dict]] = None,
-            metadata: Optional[dict] = None
+            metadata: Optional[dict] = None,
+            detect_duplicates: bool = False
     ) -> dict:
         """
         Command: Analyze bug and store its embedding
 
-        Returns analysis result without querying for similar bugs
-        (Query service handles that)
+        With detect_duplicates, the new embedding is searched before it is
+        stored; if the top match reaches duplicate_threshold the bug is
+        stored with status 'duplicate' and duplicate_of set, in the same
+        insert. This saves the separate /similar call after analyze.
+
+        Before any of that, near-verbatim copies of a stored bug (same
+        text up to ids, numbers and timestamps) are found with a
+        MinHash/LSH lookup. Those reuse the matched bug's embedding
+        instead of calling the embedding model. With detect_duplicates
+        they are also marked as its duplicate without searching vectors;
+        duplicate_similarity is then the estimated Jaccard similarity of
+        the two texts.
 
         Returns:
             {
                 "bug_id": str,
                 "embedding_generated": bool,
-                "embedding_text": str
+                "embedding_text": str,
+                "is_duplicate": bool | None,  # None when not checked
+                "duplicate_of": str | None,
+                "duplicate_similarity": float | None
             }
         """
         # Build text for embedding
@@ -54,8 +81,32 @@ class BugCommandService:
             metadata=metadata
         )
 
-        # Generate embedding with DedupKit
-        embedding = self.embeddings.embed(embedding_text)
+        signature = near_exact = None
+        if self.settings.minhash_dedup_enabled:
+            signature = minhash_signature(
+                embedding_text,
+                num_perm=self.settings.minhash_bands * self.settings.minhash_rows
+            )
+            near_exact = await self._find_near_exact(conn, bug_id, signature)
+
+        candidates = []
+        duplicate = None
+        if near_exact:
+            # Same report again: its embedding would come out the same
+            embedding = near_exact.pop("embedding")
+            if detect_duplicates:
+                duplicate = near_exact
+        else:
+            # Generate embedding with DedupKit
+            embedding = self.embeddings.embed(embedding_text)
+
+        # One KNN search serves duplicate detection and neighbor lists
+        searched = duplicate is None and (detect_duplicates or self.settings.neighbor_lists_enabled)
+        if searched:
+            candidates = await self._find_candidates(conn, bug_id, embedding, detect_duplicates)
+
+            if detect_duplicates and candidates and candidates[0]["similarity"] >= self.settings.duplicate_threshold:
+                duplicate = candidates[0]
 
         # Store in database
         await self.repo.insert_bug(
@@ -63,13 +114,31 @@ class BugCommandService:
             bug_id=bug_id,
             title=title,
             description=description,
-            embedding=embedding
+            embedding=embedding,
+            duplicate_of=duplicate["bug_id"] if duplicate else None,
+            embedding_text=embedding_text
         )
 
+        if self.settings.neighbor_lists_enabled:
+            if searched:
+                await self._update_neighbor_lists(conn, bug_id, candidates, is_duplicate=duplicate is not None)
+            else:
+                # No search ran, but a re-analyzed bug_id has a new embedding
+                await self.repo.invalidate_neighbors(conn, bug_id)
+
+        # Duplicates are never matched against, so only originals are indexed
+        if signature is not None and duplicate is None:
+            await self.repo.store_minhash(
+                conn, bug_id, signature, lsh_bands(signature, self.settings.minhash_bands)
+            )
+
         return {
             "bug_id": bug_id,
             "embedding_generated": True,
-            "embedding_text": embedding_text[:200] + "..."  # Truncate for response
+            "embedding_text": embedding_text[:200] + "...",  # Truncate for response
+            "is_duplicate": duplicate is not None if detect_duplicates else None,
+            "duplicate_of": duplicate["bug_id"] if duplicate else None,
+            "duplicate_similarity": duplicate["similarity"] if duplicate else None
         }
 
     async def update_bug_resolution(
@@ -82,38 +151,288 @@ class BugCommandService:
         """
         Command: Update bug with resolution information
 
-        This is called when a bug is fixed in the main BugSpotter app
+        This is called when a bug is fixed in the main BugSpotter app.
+        With summary jobs enabled the resolution is written right away
+        and its AI summary is queued for the background worker
+        (summary_status "pending"); otherwise the summary is generated
+        before writing.
+
+        Raises:
+            ValueError: If the bug doesn't exist
         """
-        # Optionally: Generate AI summary of the resolution
+        if self.settings.summary_jobs_enabled:
+            if not await self.repo.update_resolution(
+                conn=conn,
+                bug_id=bug_id,
+                resolution=resolution,
+                status=status,
+                queue_summary=True
+            ):
+                raise ValueError(f"Bug {bug_id} not found")
+
+            return {
+                "bug_id": bug_id,
+                "status": status,
+                "resolution_summary": None,
+                "summary_status": "pending"
+            }
+
         resolution_summary = await self._generate_resolution_summary(resolution)
 
         # Update in database
-        await self.repo.update_resolution(
+        if not await self.repo.update_resolution(
             conn=conn,
             bug_id=bug_id,
             resolution=resolution,
             resolution_summary=resolution_summary,
             status=status
-        )
+        ):
+            raise ValueError(f"Bug {bug_id} not found")
 
         return {
             "bug_id": bug_id,
             "status": status,
-            "resolution_summary": resolution_summary
+            "resolution_summary": resolution_summary,
+            "summary_status": "done"
         }
 
-    async def _generate_resolution_summary(self, resolution: str) -> str:
-        """Generate a concise summary of the resolution for future reference"""
-        prompt = (
-            f"Summarize this bug resolution in one concise sentence:\n\n"
-            f"{resolution}\n\n"
-            f"Summary:"
+    async def update_bug_resolutions(
+            self,
+            conn: AsyncConnection,
+            updates: list[dict]
+    ) -> dict:
+        """
+        Command: Update many bugs' resolutions at once
+
+        All resolutions are written in one transaction. With summary jobs
+        enabled their summaries are queued (the worker packs several per
+        LLM call); otherwise they are generated first, summary_batch_size
+        per call and summary_worker_concurrency calls at a time. A
+        summary that can't be generated leaves summary_status "failed".
+        When a bug appears more than once, its last update wins.
+
+        Args:
+            updates: {"bug_id", "resolution", "status"} per bug
+
+        Returns:
+            {"results": [same shape as update_bug_resolution], "not_found": [bug_id, ...]}
+        """
+        updates = list({u["bug_id"]: u for u in updates}.values())
+        queue = self.settings.summary_jobs_enabled
+
+        if queue:
+            summaries = [None] * len(updates)
+        else:
+            summaries = await summarize_in_batches(
+                self.llm,
+                [u["resolution"] for u in updates],
+                batch_size=self.settings.summary_batch_size,
+                concurrency=self.settings.summary_worker_concurrency
+            )
+
+        rows = [{**u, "resolution_summary": s} for u, s in zip(updates, summaries)]
+        updated = set(await self.repo.update_resolutions(conn, rows, queue_summaries=queue))
+
+        results = []
+        for row in rows:
+            if row["bug_id"] not in updated:
+                continue
+            if queue:
+                summary_status = "pending"
+            else:
+                summary_status = "done" if row["resolution_summary"] is not None else "failed"
+            results.append({
+                "bug_id": row["bug_id"],
+                "status": row["status"],
+                "resolution_summary": row["resolution_summary"],
+                "summary_status": summary_status
+            })
+
+        return {
+            "results": results,
+            "not_found": [row["bug_id"] for row in rows if row["bug_id"] not in updated]
+        }
+
+    async def _find_candidates(
+            self,
+            conn: AsyncConnection,
+            bug_id: str,
+            embedding: list[float],
+            detect_duplicates: bool
+    ) -> list[dict]:
+        """
+        Nearest existing bugs to a new embedding, best first
+
+        Sized for neighbor list maintenance when enabled, otherwise just
+        enough to check the top match for a duplicate
+        """
+        if self.settings.neighbor_lists_enabled:
+            limit = max(self.settings.neighbor_update_candidates, self.settings.neighbor_list_size)
+            threshold = self.settings.neighbor_min_similarity
+            if detect_duplicates:
+                threshold = min(threshold, self.settings.duplicate_threshold)
+        else:
+            limit = 1
+            threshold = self.settings.duplicate_threshold
+
+        candidates = await self.repo.find_similar(
+            conn=conn,
+            embedding=embedding,
+            limit=limit + 1,  # +1 because a re-analyzed bug finds its old self
+            threshold=threshold
         )
+        return [c for c in candidates if c["bug_id"] != bug_id][:limit]
 
-        summary = await self.llm.generate(
-            prompt=prompt,
-            temperature=0.3,
-            max_tokens=100
+    async def _find_near_exact(
+            self,
+            conn: AsyncConnection,
+            bug_id: str,
+            signature: list[int]
+    ) -> Optional[dict]:
+        """
+        Best stored bug whose text is a near-verbatim copy, if any
+
+        LSH buckets narrow the search to bugs sharing a signature band;
+        candidates are then checked against the full signature.
+
+        Returns {"bug_id", "similarity", "embedding"} or None
+        """
+        candidates = await self.repo.find_near_exact_candidates(
+            conn, bug_id, lsh_bands(signature, self.settings.minhash_bands)
         )
 
-        return summary.strip()
\ No newline at end of file
+        best = None
+        for candidate in candidates:
+            similarity = estimate_jaccard(signature, candidate["signature"])
+            if similarity >= self.settings.minhash_threshold and (best is None or similarity > best["similarity"]):
+                best = {"bug_id": candidate["bug_id"], "similarity": similarity, "embedding": candidate["embedding"]}
+
+        return best
+
+    async def _update_neighbor_lists(
+            self,
+            conn: AsyncConnection,
+            bug_id: str,
+            candidates: list[dict],
+            is_duplicate: bool = False
+    ) -> None:
+        """
+        Store the bug's top-K neighbor list and add it to its neighbors' lists
+
+        The ingest KNN search serves both: its top K become the bug's own
+        list, and every candidate is checked for whether the new bug beats
+        its current Kth neighbor. Candidates are the bug's own nearest
+        neighbors, so a bug that belongs in a list without that list's
+        owner being among its own candidates is missed: the same kind of
+        approximation the ANN index already makes.
+
+        A bug stored as a duplicate is never returned by searches, so it
+        isn't added to other bugs' lists: it would push out real neighbors.
+        """
+        list_size = self.settings.neighbor_list_size
+        candidates = [c for c in candidates if c["similarity"] >= self.settings.neighbor_min_similarity]
+
+        # A re-analyzed bug has a new embedding; lists holding the old one are stale
+        await self.repo.invalidate_neighbors(conn, bug_id)
+
+        await self.repo.store_neighbors(conn, bug_id, candidates[:list_size])
+        if not is_duplicate:
+            await self.repo.add_reverse_neighbors(conn, bug_id, candidates, list_size)
+
+    async def _generate_resolution_summary(self, resolution: str) -> str:
+        """Generate a concise summary of the resolution for future reference"""
+        return await summarize_resolution(self.llm, resolution)
+
+
+async def summarize_resolution(llm: LLMProvider, resolution: str) -> str:
+    """One-sentence summary of a bug resolution (also used by the summary worker)"""
+    prompt = (
+        f"Summarize this bug resolution in one concise sentence:\n\n"
+        f"{resolution}\n\n"
+        f"Summary:"
+    )
+
+    summary = await llm.generate(
+        prompt=prompt,
+        temperature=0.3,
+        max_tokens=100
+    )
+
+    return summary.strip()
+
+
+async def summarize_resolutions(llm: LLMProvider, resolutions: list[str]) -> list[Optional[str]]:
+    """
+    One-sentence summaries of several resolutions from a single LLM call
+
+    The instructions are sent once for the whole pack and the model
+    answers with a JSON array. If the answer can't be parsed or has the
+    wrong number of items, every entry is None; callers summarize those
+    one by one.
+    """
+    if len(resolutions) == 1:
+        return [await summarize_resolution(llm, resolutions[0])]
+
+    items = "\n\n".join(f"Resolution {i + 1}:\n{resolution}" for i, resolution in enumerate(resolutions))
+    prompt = (
+        f"Summarize each of these {len(resolutions)} bug resolutions in one concise sentence.\n"
+        f"Answer with only a JSON array of {len(resolutions)} strings, in the same order.\n\n"
+        f"{items}\n\n"
+        f"JSON:"
+    )
+
+    answer = await llm.generate(
+        prompt=prompt,
+        temperature=0.3,
+        max_tokens=100 * len(resolutions)
+    )
+
+    return _parse_summaries(answer, len(resolutions))
+
+
+def _parse_summaries(answer: str, count: int) -> list[Optional[str]]:
+    """The summaries in a JSON array answer, or all None if it isn't one of `count` items"""
+    start, end = answer.find("["), answer.rfind("]")
+    try:
+        items = json.loads(answer[start:end + 1]) if 0 <= start < end else None
+    except ValueError:
+        items = None
+
+    if not isinstance(items, list) or len(items) != count:
+        return [None] * count
+
+    return [item.strip() if isinstance(item, str) and item.strip() else None for item in items]
+
+
+async def summarize_in_batches(
+        llm: LLMProvider,
+        resolutions: list[str],
+        batch_size: int,
+        concurrency: int
+) -> list[Optional[str]]:
+    """
+    Summaries of many resolutions, batch_size per LLM call, `concurrency` calls at a time
+
+    Resolutions a packed call didn't summarize are retried alone; any
+    that still fail come back as None.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def summarize_pack(pack: list[str]) -> list[Optional[str]]:
+        try:
+            async with semaphore:
+                summaries = await summarize_resolutions(llm, pack)
+        except Exception as e:
+            logger.warning(f"Summarizing {len(pack)} resolutions failed: {e}")
+            summaries = [None] * len(pack)
+
+        if len(pack) > 1:
+            for i, summary in enumerate(summaries):
+                if summary is None:
+                    summaries[i] = (await summarize_pack([pack[i]]))[0]
+        return summaries
+
+    packs = [resolutions[i:i + batch_size] for i in range(0, len(resolutions), batch_size)]
+    results = await asyncio.gather(*(summarize_pack(pack) for pack in packs))
+    return [summary for pack in results for summary in pack]
+
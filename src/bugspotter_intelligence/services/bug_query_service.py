@@ -1,10 +1,44 @@
-from typing import Optional
+import hashlib
+import json
+import logging
+from contextlib import aclosing
+from typing import AsyncIterator, Optional
 from psycopg import AsyncConnection
 
 from bugspotter_intelligence.config import Settings
 from bugspotter_intelligence.llm import LLMProvider
+from bugspotter_intelligence.db.archive_repository import ArchiveRepository
 from bugspotter_intelligence.db.bug_repository import BugRepository
+from bugspotter_intelligence.services.access_tracker import AccessTracker
+from bugspotter_intelligence.services.context_assembler import ContextAssembler
 from bugspotter_intelligence.services.embeddings import EmbeddingProvider
+from bugspotter_intelligence.utils.pagination import encode_cursor
+from bugspotter_intelligence.services.vector_index import (
+    IndexSearchBackend,
+    PgVectorSearchBackend,
+    VectorIndex
+)
+
+logger = logging.getLogger(__name__)
+
+# Generation settings for mitigation suggestions
+MITIGATION_TEMPERATURE = 0.3
+MITIGATION_MAX_TOKENS = 300
+
+
+def mitigation_fingerprint(model: str, prompt: str, context_bugs: list[tuple[str, str]]) -> str:
+    """
+    Digest of everything a mitigation suggestion is generated from
+
+    context_bugs holds (bug_id, context text) for each resolved similar
+    bug; the text includes its resolution, so resolving or re-resolving
+    a context bug changes the fingerprint.
+    """
+    payload = json.dumps(
+        [model, MITIGATION_TEMPERATURE, MITIGATION_MAX_TOKENS, prompt, context_bugs],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
 
 
 class BugQueryService:
@@ -17,11 +51,36 @@ class BugQueryService:
     - Get mitigation suggestions
     """
 
-    def __init__(self, settings: Settings, llm_provider: LLMProvider, embedding_provider: EmbeddingProvider):
+    def __init__(
+            self,
+            settings: Settings,
+            llm_provider: LLMProvider,
+            embedding_provider: EmbeddingProvider,
+            vector_index: Optional[VectorIndex] = None,
+            access_tracker: Optional[AccessTracker] = None
+    ):
         self.llm = llm_provider
         self.embeddings = embedding_provider
         self.repo = BugRepository()
+        self.archive = ArchiveRepository()
         self.settings = settings
+        self.vector_index = vector_index
+        self.db_search = PgVectorSearchBackend(
+            self.repo,
+            rerank_candidates=settings.binary_rerank_candidates if settings.binary_search_enabled else None,
+            dimension=settings.embedding_dimension
+        )
+        self.index_search = IndexSearchBackend(
+            self.repo,
+            vector_index,
+            rerank_candidates=settings.hnsw_rerank_candidates
+        ) if vector_index is not None else None
+        self.access_tracker = access_tracker
+        self.context_assembler = ContextAssembler(
+            token_budget=settings.context_token_budget,
+            dedup_threshold=settings.context_dedup_threshold,
+            prefill_tokens_per_second=settings.llm_prefill_tokens_per_second
+        )
 
     async def get_bug(
             self,
@@ -33,7 +92,12 @@ class BugQueryService:
 
         Returns None if bug not found
         """
-        return await self.repo.get_bug(conn, bug_id)
+        bug = await self._load_bug(conn, bug_id)
+
+        if bug:
+            self._record_access([bug_id])
+
+        return bug
 
     async def find_similar_bugs(
             self,
@@ -52,28 +116,323 @@ class BugQueryService:
                 "similar_bugs": list[dict]
             }
         """
-        # Get the bug's embedding
-        bug = await self.repo.get_bug(conn, bug_id)
+        threshold = similarity_threshold if similarity_threshold is not None else self.settings.similarity_threshold
+        max_bugs = limit if limit is not None else self.settings.max_similar_bugs
+
+        similar = await self._find_similar_in_neighbor_lists(conn, bug_id, threshold, max_bugs)
+
+        if similar is None:
+            similar = await self._find_similar_in_search(conn, bug_id, threshold, max_bugs)
+
+        similar = await self._fill_from_archive(conn, bug_id, similar, threshold, max_bugs)
+
+        self._record_access([bug_id, *(b["bug_id"] for b in similar)])
+
+        return self._similar_result(bug_id, similar, threshold)
+
+    async def get_query_embedding(
+            self,
+            conn: AsyncConnection,
+            bug_id: str
+    ):
+        """
+        Query: Get the embedding to search with for bugs similar to bug_id
+
+        Raises:
+            ValueError: If the bug or its embedding doesn't exist
+        """
+        bug = await self._load_bug(conn, bug_id)
 
         if not bug:
             raise ValueError(f"Bug {bug_id} not found")
 
+        return await self._get_query_embedding(conn, bug_id)
+
+    async def iter_similar_bugs(
+            self,
+            conn: AsyncConnection,
+            bug_id: str,
+            embedding,
+            similarity_threshold: float | None = None,
+            after: Optional[tuple[float, str]] = None,
+            limit: int | None = None
+    ) -> AsyncIterator[dict]:
+        """
+        Query: Stream all bugs similar to the given bug, best first
+
+        Unlike find_similar_bugs there is no max_similar_bugs cap. Each
+        bug carries a "cursor" token; pass the decoded cursor of the last
+        bug received as `after` to resume the stream.
+        """
+        threshold = similarity_threshold if similarity_threshold is not None else self.settings.similarity_threshold
+        sent = 0
+
+        async with aclosing(self.repo.iter_similar(conn, embedding, threshold, after=after)) as batches:
+            async for batch in batches:
+                for bug in batch:
+                    distance = bug.pop("distance")
+                    if bug["bug_id"] == bug_id:
+                        continue
+
+                    yield {**bug, "cursor": encode_cursor(distance, bug["bug_id"])}
+
+                    sent += 1
+                    if limit is not None and sent >= limit:
+                        return
+
+    async def find_similar_bugs_batch(
+            self,
+            conn: AsyncConnection,
+            bug_ids: list[str],
+            similarity_threshold: float | None = None,
+            limit: int | None = None
+    ) -> dict:
+        """
+        Query: Find similar bugs for many bugs at once
+
+        Indexed bugs are answered with one batched in-memory search,
+        the rest with one batched pgvector query.
+
+        Returns:
+            {
+                "results": list[dict],  # same shape as find_similar_bugs
+                "not_found": list[str]
+            }
+        """
         threshold = similarity_threshold if similarity_threshold is not None else self.settings.similarity_threshold
         max_bugs = limit if limit is not None else self.settings.max_similar_bugs
+        bug_ids = list(dict.fromkeys(bug_ids))
+
+        similar_by_id: dict[str, list[dict]] = {}
+
+        indexed = [b for b in bug_ids if self.vector_index is not None and b in self.vector_index]
+        index_results = await self._find_similar_in_index(conn, indexed, threshold, max_bugs)
+        if index_results is not None:
+            similar_by_id.update(zip(indexed, index_results))
+
+        remaining = [b for b in bug_ids if b not in similar_by_id]
+        embeddings = await self.repo.get_embeddings(conn, remaining)
+        found = [b for b in remaining if b in embeddings]
+
+        if found:
+            db_results = await self.db_search.find_similar_batch(
+                conn=conn,
+                embeddings=[embeddings[b] for b in found],
+                limit=max_bugs + 1,  # +1 because it includes itself
+                threshold=threshold
+            )
+            for query_id, similar in zip(found, db_results):
+                similar_by_id[query_id] = [b for b in similar if b["bug_id"] != query_id][:max_bugs]
+
+        for query_id, similar in similar_by_id.items():
+            similar_by_id[query_id] = await self._fill_from_archive(conn, query_id, similar, threshold, max_bugs)
+
+        for query_id, similar in similar_by_id.items():
+            self._record_access([query_id, *(b["bug_id"] for b in similar)])
+
+        return {
+            "results": [
+                self._similar_result(b, similar_by_id[b], threshold)
+                for b in bug_ids if b in similar_by_id
+            ],
+            "not_found": [b for b in bug_ids if b not in similar_by_id]
+        }
+
+    async def _load_bug(self, conn: AsyncConnection, bug_id: str) -> Optional[dict]:
+        """
+        Get a bug from the hot/cold tiers, rehydrating it from the archive if needed
+
+        The archive lookup is by primary key and only runs on a miss, so
+        it doesn't depend on archive_search_enabled.
+        """
+        bug = await self.repo.get_bug(conn, bug_id)
+
+        if bug is None:
+            bug = await self.archive.get_bug(conn, bug_id)
+            if bug is not None:
+                await self.archive.rehydrate(conn, [bug_id])
+
+        return bug
+
+    async def _fill_from_archive(
+            self,
+            conn: AsyncConnection,
+            bug_id: str,
+            similar_bugs: list[dict],
+            threshold: float,
+            max_bugs: int
+    ) -> list[dict]:
+        """
+        Top up short hot-tier results from the archive
+
+        Off unless archive_search_enabled: the scan is unindexed and would
+        otherwise run on every query with a short result. The archive is
+        only scanned when the hot tier returned fewer than max_bugs
+        matches. Archived bugs that make the final list are moved back to
+        the hot tier.
+        """
+        if not self.settings.archive_search_enabled or len(similar_bugs) >= max_bugs:
+            return similar_bugs
+
+        embedding = await self._get_query_embedding(conn, bug_id)
+        archived = await self.archive.search(
+            conn=conn,
+            embedding=embedding,
+            limit=max_bugs + 1,  # +1 because it may include itself
+            threshold=threshold
+        )
+        archived = [b for b in archived if b["bug_id"] != bug_id]
+        if not archived:
+            return similar_bugs
+
+        merged = sorted(similar_bugs + archived, key=lambda b: b["similarity"], reverse=True)[:max_bugs]
+
+        archived_ids = {b["bug_id"] for b in archived}
+        rehydrate = [b["bug_id"] for b in merged if b["bug_id"] in archived_ids]
+        if rehydrate:
+            restored = await self.archive.rehydrate(conn, rehydrate)
+            logger.info(f"Rehydrated {restored} archived bugs similar to {bug_id}")
+
+        return merged
+
+    async def _get_query_embedding(self, conn: AsyncConnection, bug_id: str):
+        """Get a bug's embedding from the in-memory index or the hot/cold tables"""
+        if self.vector_index is not None and bug_id in self.vector_index:
+            return self.vector_index.get_embedding(bug_id)
 
         async with conn.cursor() as cursor:
+            # Cold-tier bugs can still be used as the query
             await cursor.execute(
-                "SELECT embedding FROM bug_embeddings WHERE bug_id = %s",
-                (bug_id,)
+                """
+                SELECT embedding FROM bug_embeddings WHERE bug_id = %s
+                UNION ALL
+                SELECT embedding FROM bug_embeddings_cold WHERE bug_id = %s
+                LIMIT 1
+                """,
+                (bug_id, bug_id)
             )
             row = await cursor.fetchone()
             if not row:
                 raise ValueError(f"Embedding not found for bug {bug_id}")
 
-            embedding = row[0]
+            return row[0]
+
+    def _record_access(self, bug_ids: list[str]) -> None:
+        """Note bug reads for the batched last_accessed flush"""
+        if self.access_tracker is not None:
+            self.access_tracker.record(bug_ids)
+
+    def _similar_result(self, bug_id: str, similar_bugs: list[dict], threshold: float) -> dict:
+        """Build the find_similar_bugs result and flag duplicates"""
+        # Determine if it's a duplicate (hybrid results aren't ordered by similarity)
+        is_duplicate = any(b["similarity"] >= self.settings.duplicate_threshold for b in similar_bugs)
+
+        return {
+            "bug_id": bug_id,
+            "is_duplicate": is_duplicate,
+            "similar_bugs": similar_bugs,
+            "threshold_used": threshold
+        }
+
+    async def _find_similar_in_neighbor_lists(
+            self,
+            conn: AsyncConnection,
+            bug_id: str,
+            threshold: float,
+            max_bugs: int
+    ) -> Optional[list[dict]]:
+        """
+        Serve a query from the precomputed neighbor list
+
+        Lists hold the top neighbor_list_size bugs down to
+        neighbor_min_similarity, so they can answer any query within
+        those bounds. A list that is missing or stale is recomputed with
+        one search at those bounds and the query is answered from it.
+
+        Returns None when the query is outside the lists' bounds
+        """
+        list_size = self.settings.neighbor_list_size
+        min_similarity = self.settings.neighbor_min_similarity
+
+        if not self.settings.neighbor_lists_enabled or self.settings.search_mode == "hybrid":
+            return None
+        if threshold < min_similarity or max_bugs > list_size:
+            return None
+
+        similar = await self.repo.get_neighbors(conn, bug_id, threshold, max_bugs, list_size)
+        if similar is not None:
+            return similar
+
+        neighbors = await self._find_similar_in_search(conn, bug_id, min_similarity, list_size)
+        await self.repo.store_neighbors(conn, bug_id, neighbors)
+
+        return [b for b in neighbors if b["similarity"] >= threshold][:max_bugs]
+
+    async def _find_similar_in_search(
+            self,
+            conn: AsyncConnection,
+            bug_id: str,
+            threshold: float,
+            max_bugs: int
+    ) -> list[dict]:
+        """KNN search in the vector index, falling back to Postgres"""
+        if self.settings.search_mode == "hybrid":
+            return await self._find_similar_hybrid(conn, bug_id, threshold, max_bugs)
+
+        similar_bugs = await self._find_similar_in_index(conn, [bug_id], threshold, max_bugs)
+
+        if similar_bugs is None:
+            similar_bugs = [await self._find_similar_in_db(conn, bug_id, threshold, max_bugs)]
+
+        return similar_bugs[0]
+
+    async def _find_similar_in_index(
+            self,
+            conn: AsyncConnection,
+            bug_ids: list[str],
+            threshold: float,
+            max_bugs: int
+    ) -> Optional[list[list[dict]]]:
+        """
+        KNN search against the in-memory vector index
+
+        Returns None when the index can't answer (disabled, not loaded,
+        a bug not indexed yet or an error) so the caller falls back to Postgres
+        """
+        if self.index_search is None or not bug_ids:
+            return None
+        if any(bug_id not in self.vector_index for bug_id in bug_ids):
+            return None
+
+        try:
+            results = await self.index_search.find_similar_batch(
+                conn=conn,
+                embeddings=[self.vector_index.get_embedding(bug_id) for bug_id in bug_ids],
+                limit=max_bugs + 1,  # +1 because it includes itself
+                threshold=threshold
+            )
+        except Exception as e:
+            logger.warning(f"Vector index search failed for {bug_ids}, falling back to Postgres: {e}")
+            return None
+
+        return [
+            [b for b in similar if b["bug_id"] != bug_id][:max_bugs]
+            for bug_id, similar in zip(bug_ids, results)
+        ]
+
+    async def _find_similar_in_db(
+            self,
+            conn: AsyncConnection,
+            bug_id: str,
+            threshold: float,
+            max_bugs: int
+    ) -> list[dict]:
+        """KNN search in Postgres with pgvector"""
+        # Get the bug's embedding
+        embedding = await self.get_query_embedding(conn, bug_id)
 
         # Find similar bugs
-        similar_bugs = await self.repo.find_similar(
+        similar_bugs = await self.db_search.find_similar(
             conn=conn,
             embedding=embedding,
             limit=max_bugs + 1,  # +1 because it includes itself
@@ -81,69 +440,187 @@ class BugQueryService:
         )
 
         # Remove the bug itself from results
-        similar_bugs = [b for b in similar_bugs if b["bug_id"] != bug_id][:max_bugs]
+        return [b for b in similar_bugs if b["bug_id"] != bug_id][:max_bugs]
+
+    async def _find_similar_hybrid(
+            self,
+            conn: AsyncConnection,
+            bug_id: str,
+            threshold: float,
+            max_bugs: int
+    ) -> list[dict]:
+        """Vector + full-text search in Postgres, fused with reciprocal rank fusion"""
+        embedding = await self.get_query_embedding(conn, bug_id)
+        query_text = await self.repo.get_search_text(conn, bug_id)
+
+        similar_bugs = await self.repo.find_similar(
+            conn=conn,
+            embedding=embedding,
+            limit=max_bugs + 1,  # +1 because it includes itself
+            threshold=threshold,
+            query_text=query_text or "",
+            hybrid_candidates=self.settings.hybrid_candidates,
+            rrf_k=self.settings.hybrid_rrf_k,
+            hybrid_max_terms=self.settings.hybrid_max_terms
+        )
+
+        return [b for b in similar_bugs if b["bug_id"] != bug_id][:max_bugs]
 
-        # Determine if it's a duplicate
-        is_duplicate = False
-        if similar_bugs and similar_bugs[0]["similarity"] >= self.settings.duplicate_threshold:
-            is_duplicate = True
+    async def get_mitigation_suggestion(
+            self,
+            conn: AsyncConnection,
+            bug_id: str,
+            use_similar_bugs: bool = True
+    ) -> dict:
+        """
+        Query: Get AI-powered mitigation suggestion for a bug
+
+        Optionally uses similar bugs with resolutions as context. A stored
+        suggestion is returned without calling the LLM (see
+        prepare_mitigation); a new one is stored for the next call.
+        """
+        request = await self.prepare_mitigation(conn, bug_id, use_similar_bugs)
+
+        suggestion = request["cached_suggestion"]
+        if suggestion is None:
+            suggestion = await self.llm.generate(
+                prompt=request["prompt"],
+                context=request["context"] or None,
+                temperature=MITIGATION_TEMPERATURE,
+                max_tokens=MITIGATION_MAX_TOKENS
+            )
+
+            if self.settings.mitigation_cache_enabled:
+                await self.repo.store_mitigation(
+                    conn,
+                    bug_id,
+                    use_similar_bugs,
+                    model=request["model"],
+                    fingerprint=request["fingerprint"],
+                    suggestion=suggestion,
+                    based_on_similar_bugs=request["based_on_similar_bugs"],
+                    context_bug_ids=request["context_bug_ids"]
+                )
 
         return {
             "bug_id": bug_id,
-            "is_duplicate": is_duplicate,
-            "similar_bugs": similar_bugs,
-            "threshold_used": threshold
+            "mitigation_suggestion": suggestion,
+            "based_on_similar_bugs": request["based_on_similar_bugs"],
+            "prompt_stats": request["prompt_stats"]
         }
 
-    async def get_mitigation_suggestion(
+    async def prepare_mitigation(
             self,
             conn: AsyncConnection,
             bug_id: str,
             use_similar_bugs: bool = True
     ) -> dict:
         """
-        Query: Get AI-powered mitigation suggestion for a bug
+        Query: Load a bug and build its mitigation prompt
+
+        Split from generation so a streaming caller can fail (bug not
+        found) before it starts its response. Similar bugs become context
+        through the ContextAssembler (summaries first, deduplicated,
+        within context_token_budget).
 
-        Optionally uses similar bugs with resolutions as context
+        A suggestion stored by the configured model is served as is, with
+        one read and no similarity search: stored rows are dropped when
+        the bug is re-ingested or a context bug is resolved, so they stay
+        valid until then. A bug that became similar after the suggestion
+        was stored is not picked up until one of those happens. On a hit
+        only cached_suggestion, based_on_similar_bugs and model are set.
+
+        Returns:
+            {
+                "prompt": str | None,
+                "context": list[str],
+                "context_bug_ids": list[str],
+                "based_on_similar_bugs": bool,
+                "model": str,
+                "fingerprint": str | None,
+                "cached_suggestion": str | None,
+                "prompt_stats": dict | None (see ContextAssembler.report)
+            }
+
+        Raises:
+            ValueError: If the bug doesn't exist
         """
+        model_name = getattr(self.settings, f"{self.settings.llm_provider}_model")
+        model = f"{self.settings.llm_provider}:{model_name}"
+
+        if self.settings.mitigation_cache_enabled:
+            stored = await self.repo.get_mitigation(conn, bug_id, use_similar_bugs)
+            if stored and stored["model"] == model:
+                self._record_access([bug_id])
+                return {
+                    "prompt": None,
+                    "context": [],
+                    "context_bug_ids": [],
+                    "based_on_similar_bugs": stored["based_on_similar_bugs"],
+                    "model": model,
+                    "fingerprint": None,
+                    "cached_suggestion": stored["mitigation_suggestion"],
+                    "prompt_stats": None
+                }
+
         # Get the bug
-        bug = await self.repo.get_bug(conn, bug_id)
+        bug = await self._load_bug(conn, bug_id)
 
         if not bug:
             raise ValueError(f"Bug {bug_id} not found")
 
+        self._record_access([bug_id])
+
         # Get similar bugs if requested
-        context = []
+        similar_bugs = []
+        summaries = {}
         if use_similar_bugs:
             similar_result = await self.find_similar_bugs(conn, bug_id)
+            similar_bugs = similar_result["similar_bugs"]
 
-            for similar_bug in similar_result["similar_bugs"]:
-                if similar_bug.get("resolution"):
-                    context.append(
-                        f"Similar bug: {similar_bug['title']}\n"
-                        f"Resolution: {similar_bug['resolution']}"
-                    )
-
-        # Generate mitigation
-        suggestion = await self._generate_mitigation(
-            title=bug["title"],
-            description=bug.get("description"),
-            context=context
-        )
+            resolved_ids = [b["bug_id"] for b in similar_bugs if b.get("resolution")]
+            summaries = await self.repo.get_resolution_summaries(conn, resolved_ids)
+
+        assembled = self.context_assembler.assemble(similar_bugs, summaries)
+        context_bugs = assembled.snippets
+
+        prompt = self._mitigation_prompt(bug["title"], bug.get("description"))
+        prompt_stats = self.context_assembler.report(prompt, assembled)
+        logger.debug(f"Mitigation prompt for {bug_id}: {prompt_stats}")
 
         return {
-            "bug_id": bug_id,
-            "mitigation_suggestion": suggestion,
-            "based_on_similar_bugs": len(context) > 0
+            "prompt": prompt,
+            "context": [text for _, text in context_bugs],
+            "context_bug_ids": [context_bug_id for context_bug_id, _ in context_bugs],
+            "based_on_similar_bugs": len(context_bugs) > 0,
+            "model": model,
+            "fingerprint": mitigation_fingerprint(model, prompt, context_bugs),
+            "cached_suggestion": None,
+            "prompt_stats": prompt_stats
         }
 
-    async def _generate_mitigation(
-            self,
-            title: str,
-            description: Optional[str],
-            context: list[str]
-    ) -> str:
-        """Generate AI mitigation suggestion"""
+    async def stream_mitigation(self, request: dict) -> AsyncIterator[str]:
+        """
+        Query: Stream the mitigation text for a prepare_mitigation() request
+
+        A stored suggestion is sent as a single chunk. Streamed
+        suggestions are not stored: the request's connection may already
+        be released while the response is still being sent.
+        """
+        if request["cached_suggestion"] is not None:
+            yield request["cached_suggestion"]
+            return
+
+        async for chunk in self.llm.stream(
+                prompt=request["prompt"],
+                context=request["context"] or None,
+                temperature=MITIGATION_TEMPERATURE,
+                max_tokens=MITIGATION_MAX_TOKENS
+        ):
+            yield chunk
+
+    def _mitigation_prompt(self, title: str, description: Optional[str]) -> str:
+        """Build the mitigation prompt for a bug"""
         prompt_parts = [f"Bug: {title}"]
 
         if description:
@@ -153,13 +630,4 @@ class BugQueryService:
             "\nProvide a concise, actionable suggestion for how to fix or mitigate this issue."
         )
 
-        prompt = "\n".join(prompt_parts)
-
-        suggestion = await self.llm.generate(
-            prompt=prompt,
-            context=context if context else None,
-            temperature=0.3,
-            max_tokens=300
-        )
-
-        return suggestion
\ No newline at end of file
+        return "\n".join(prompt_parts)
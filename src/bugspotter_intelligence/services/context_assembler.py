@@ -0,0 +1,126 @@
+"""Token-budgeted context for RAG prompts"""
+
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+from bugspotter_intelligence.utils.minhash import shingles
+
+# Rough characters per token of English text and code for llama/GPT
+# tokenizers; the configured model's tokenizer isn't available here
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate number of tokens the LLM will see for a text"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def jaccard(a: set[str], b: set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass
+class AssembledContext:
+    """Context snippets chosen for a prompt, with what they cost and saved"""
+    snippets: list[tuple[str, str]]  # (bug_id, text), most similar first
+    tokens: int  # Estimated tokens of the kept snippets
+    full_tokens: int  # Estimated tokens if every resolution went in whole
+    summaries_used: int
+    duplicates_dropped: int
+    over_budget_dropped: int
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(0, self.full_tokens - self.tokens)
+
+
+class ContextAssembler:
+    """
+    Builds the similar-bug context of a prompt within a token budget
+
+    Resolved bugs are taken most similar first. Each contributes its
+    resolution_summary when there is one, otherwise its full resolution.
+    A bug whose resolution is near-identical (word-shingle Jaccard at or
+    above dedup_threshold) to one already taken adds nothing and is
+    skipped, as is any snippet that would overrun the budget.
+    """
+
+    def __init__(self, token_budget: int, dedup_threshold: float, prefill_tokens_per_second: float):
+        self.token_budget = token_budget
+        self.dedup_threshold = dedup_threshold
+        self.prefill_tokens_per_second = prefill_tokens_per_second
+
+    def assemble(self, similar_bugs: list[dict], summaries: Optional[dict[str, str]] = None) -> AssembledContext:
+        """
+        Choose context snippets from similar bugs
+
+        Args:
+            similar_bugs: Search results ("bug_id", "title", "resolution",
+                "similarity"); bugs without a resolution are ignored
+            summaries: resolution_summary by bug_id, where available
+        """
+        summaries = summaries or {}
+        resolved = sorted(
+            (bug for bug in similar_bugs if bug.get("resolution")),
+            key=lambda bug: bug.get("similarity", 0.0),
+            reverse=True
+        )
+
+        snippets: list[tuple[str, str]] = []
+        kept_shingles: list[set[str]] = []
+        tokens = full_tokens = summaries_used = duplicates = over_budget = 0
+
+        for bug in resolved:
+            full_tokens += estimate_tokens(_snippet(bug["title"], bug["resolution"]))
+
+            summary = summaries.get(bug["bug_id"])
+            resolution = summary or bug["resolution"]
+            bug_shingles = shingles(resolution)
+            if any(jaccard(bug_shingles, kept) >= self.dedup_threshold for kept in kept_shingles):
+                duplicates += 1
+                continue
+
+            text = _snippet(bug["title"], resolution)
+            cost = estimate_tokens(text)
+            if tokens + cost > self.token_budget:
+                over_budget += 1
+                continue
+
+            snippets.append((bug["bug_id"], text))
+            kept_shingles.append(bug_shingles)
+            tokens += cost
+            summaries_used += summary is not None
+
+        return AssembledContext(
+            snippets=snippets,
+            tokens=tokens,
+            full_tokens=full_tokens,
+            summaries_used=summaries_used,
+            duplicates_dropped=duplicates,
+            over_budget_dropped=over_budget
+        )
+
+    def report(self, prompt: str, context: AssembledContext) -> dict:
+        """
+        Prompt size and the prefill time the trimming saved
+
+        Savings are against sending every similar bug's full resolution,
+        at prefill_tokens_per_second.
+        """
+        return {
+            "prompt_tokens": estimate_tokens(prompt) + context.tokens,
+            "context_tokens": context.tokens,
+            "context_snippets": len(context.snippets),
+            "summaries_used": context.summaries_used,
+            "duplicates_dropped": context.duplicates_dropped,
+            "over_budget_dropped": context.over_budget_dropped,
+            "tokens_saved": context.saved_tokens,
+            "prefill_seconds_saved": round(context.saved_tokens / self.prefill_tokens_per_second, 2)
+        }
+
+
+def _snippet(title: str, resolution: str) -> str:
+    return f"Similar bug: {title}\nResolution: {resolution}"
@@ -1,9 +1,22 @@
 """Abstract base class for embedding providers"""
 
+import math
 from abc import ABC, abstractmethod
 
+
+def l2_normalize(vector: list[float]) -> list[float]:
+    """Scale a vector to unit length (zero vectors are returned unchanged)"""
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm > 0 else list(vector)
+
+
 class EmbeddingProvider(ABC):
-    """Abstract base class for embedding providers"""
+    """
+    Abstract base class for embedding providers
+
+    Embeddings are L2-normalized, so cosine similarity between two of
+    them is their inner product; similarity search relies on this.
+    """
 
     @abstractmethod
     def embed(self, text: str) -> list[float]:
@@ -34,7 +34,7 @@ class LocalEmbeddingProvider(EmbeddingProvider):
             raise ValueError("Text cannot be empty")
 
         logger.debug(f"Generating embedding (length: {len(text)} chars)")
-        embedding = self.model.encode(text, convert_to_numpy=True)
+        embedding = self.model.encode(text, convert_to_numpy=True, normalize_embeddings=True)
         return embedding.tolist()
 
     def embed_batch(self, texts: list[str]) -> list[list[float]]:
@@ -43,7 +43,7 @@ class LocalEmbeddingProvider(EmbeddingProvider):
             raise ValueError("Texts list cannot be empty")
 
         logger.debug(f"Generating {len(texts)} embeddings")
-        embeddings = self.model.encode(texts, convert_to_numpy=True)
+        embeddings = self.model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
         return [emb.tolist() for emb in embeddings]
 
     def dimension(self) -> int:
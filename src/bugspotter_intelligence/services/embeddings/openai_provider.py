@@ -1,6 +1,6 @@
 import logging
 from openai import OpenAI
-from .base import EmbeddingProvider
+from .base import EmbeddingProvider, l2_normalize
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +34,7 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
             model=self.model_name
         )
 
-        return response.data[0].embedding
+        return l2_normalize(response.data[0].embedding)
 
     def embed_batch(self, texts: list[str]) -> list[list[float]]:
         """Generate embeddings for multiple texts"""
@@ -48,7 +48,7 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
             model=self.model_name
         )
 
-        return [item.embedding for item in response.data]
+        return [l2_normalize(item.embedding) for item in response.data]
 
     def dimension(self) -> int:
         """Get embedding dimension"""
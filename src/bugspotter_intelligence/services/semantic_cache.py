@@ -0,0 +1,271 @@
+"""Semantic response cache in front of an LLM provider"""
+
+import hashlib
+import itertools
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Optional
+
+import numpy as np
+
+from bugspotter_intelligence.config import Settings
+from bugspotter_intelligence.llm import LLMProvider
+from bugspotter_intelligence.services.embeddings import EmbeddingProvider
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Bounded in-memory cache of LLM answers, looked up by embedding
+
+    An answer is served for a new request when the request's embedding
+    has cosine similarity >= threshold to the cached one and it was
+    stored under the same key (an exact match, e.g. model, settings and
+    context). Entries expire ttl_seconds after they are stored; when
+    full, the least recently used entry is evicted. A key is forgotten
+    with its last entry, so the key map never outgrows the cache.
+
+    Embeddings are expected to be unit length (as EmbeddingProvider
+    returns them), so cosine similarity is a dot product and a lookup is
+    one matrix-vector product over all entries.
+    """
+
+    def __init__(
+            self,
+            threshold: float,
+            ttl_seconds: float,
+            max_entries: int,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+
+        # Slot-indexed storage; the matrix is allocated on the first store
+        self._vectors: Optional[np.ndarray] = None
+        self._expires = np.full(max_entries, -np.inf)
+        self._key_ids = np.full(max_entries, -1, dtype=np.int64)
+        self._answers: list[Optional[str]] = [None] * max_entries
+        self._lru: OrderedDict[int, None] = OrderedDict()
+        self._free = list(range(max_entries - 1, -1, -1))
+        self._key_index: dict[tuple, int] = {}
+        self._key_slots: dict[int, int] = {}  # key id -> live entries
+        self._keys: dict[int, tuple] = {}
+        self._key_order = itertools.count()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def lookup(self, embedding: list[float], key: tuple) -> Optional[str]:
+        """Best cached answer for this embedding and key, or None"""
+        slot = self._best_slot(embedding, key)
+        if slot is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._lru.move_to_end(slot)
+        return self._answers[slot]
+
+    def store(self, embedding: list[float], key: tuple, answer: str) -> None:
+        """Cache an answer generated for this embedding and key"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        if self._vectors is None:
+            self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+
+        slot = self._take_slot()
+        self._vectors[slot] = vector
+        self._expires[slot] = self._clock() + self.ttl_seconds
+        self._key_ids[slot] = self._key_id(key)
+        self._answers[slot] = answer
+        self._lru[slot] = None
+
+    def clear(self) -> None:
+        """Drop all entries (counters are kept)"""
+        for slot in list(self._lru):
+            self._release(slot)
+
+    def stats(self) -> dict:
+        """Counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._lru),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+    def _best_slot(self, embedding: list[float], key: tuple) -> Optional[int]:
+        key_id = self._key_index.get(key)
+        if self._vectors is None or key_id is None or not self._lru:
+            return None
+
+        candidates = (self._key_ids == key_id) & (self._expires > self._clock())
+        if not candidates.any():
+            return None
+
+        scores = self._vectors @ np.asarray(embedding, dtype=np.float32)
+        scores[~candidates] = -np.inf
+        slot = int(np.argmax(scores))
+        return slot if scores[slot] >= self.threshold else None
+
+    def _take_slot(self) -> int:
+        if self._free:
+            return self._free.pop()
+
+        # Full: reuse an expired entry before evicting a live one
+        slot = int(np.argmin(self._expires))
+        if self._expires[slot] <= self._clock():
+            self.expirations += 1
+        else:
+            slot = next(iter(self._lru))
+            self.evictions += 1
+
+        self._release(slot)
+        return self._free.pop()
+
+    def _key_id(self, key: tuple) -> int:
+        key_id = self._key_index.get(key)
+        if key_id is None:
+            key_id = self._key_index[key] = next(self._key_order)
+            self._keys[key_id] = key
+        self._key_slots[key_id] = self._key_slots.get(key_id, 0) + 1
+        return key_id
+
+    def _release(self, slot: int) -> None:
+        key_id = int(self._key_ids[slot])
+        if key_id >= 0:
+            self._key_slots[key_id] -= 1
+            if not self._key_slots[key_id]:
+                del self._key_slots[key_id]
+                del self._key_index[self._keys.pop(key_id)]
+
+        self._lru.pop(slot, None)
+        self._expires[slot] = -np.inf
+        self._key_ids[slot] = -1
+        self._answers[slot] = None
+        self._free.append(slot)
+
+
+class CachedLLMProvider(LLMProvider):
+    """
+    LLM provider that answers from a SemanticCache when it can
+
+    The cache is looked up with the embedding of the prompt, among
+    answers generated with exactly the same context (by digest), model
+    and settings, so rewordings of a question already answered with the
+    same context skip generation. Misses are generated by the wrapped
+    provider and stored. Embedding failures bypass the cache.
+    """
+
+    def __init__(
+            self,
+            provider: LLMProvider,
+            embeddings: EmbeddingProvider,
+            cache: SemanticCache,
+            model: str
+    ):
+        super().__init__(provider.settings)
+        self.provider = provider
+        self.usage = provider.usage
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model = model
+
+    async def generate(
+            self,
+            prompt: str,
+            context: Optional[list[str]] = None,
+            temperature: float = 0.7,
+            max_tokens: int = 1000
+    ) -> str:
+        embedding, key = self._cache_key(prompt, context, temperature, max_tokens)
+        if embedding is not None:
+            answer = self.cache.lookup(embedding, key)
+            if answer is not None:
+                return answer
+
+        answer = await self.provider.generate(prompt, context, temperature, max_tokens)
+
+        if embedding is not None:
+            self.cache.store(embedding, key, answer)
+        return answer
+
+    async def stream(
+            self,
+            prompt: str,
+            context: Optional[list[str]] = None,
+            temperature: float = 0.7,
+            max_tokens: int = 1000
+    ) -> AsyncIterator[str]:
+        """Stream from the wrapped provider, or the cached answer as one chunk"""
+        embedding, key = self._cache_key(prompt, context, temperature, max_tokens)
+        if embedding is not None:
+            answer = self.cache.lookup(embedding, key)
+            if answer is not None:
+                yield answer
+                return
+
+        chunks = []
+        async for chunk in self.provider.stream(prompt, context, temperature, max_tokens):
+            chunks.append(chunk)
+            yield chunk
+
+        # Only complete answers are cached
+        if embedding is not None:
+            self.cache.store(embedding, key, "".join(chunks))
+
+    def _cache_key(
+            self,
+            prompt: str,
+            context: Optional[list[str]],
+            temperature: float,
+            max_tokens: int
+    ) -> tuple[Optional[list[float]], tuple]:
+        # Context is matched exactly: its embedding would be truncated
+        # and could match an answer written for other bugs
+        context_digest = hashlib.sha256(json.dumps(context or []).encode()).hexdigest()
+        key = (self.settings.llm_provider, self.model, temperature, max_tokens, context_digest)
+
+        try:
+            return self.embeddings.embed(prompt), key
+        except Exception as e:
+            logger.warning(f"Semantic cache bypassed, embedding failed: {e}")
+            return None, key
+
+
+_cache: SemanticCache | None = None
+
+
+def init_semantic_cache(settings: Settings) -> None:
+    """Create the /ask response cache (no-op when disabled)"""
+    global _cache
+
+    if not settings.semantic_cache_enabled:
+        return
+
+    _cache = SemanticCache(
+        threshold=settings.semantic_cache_threshold,
+        ttl_seconds=settings.semantic_cache_ttl,
+        max_entries=settings.semantic_cache_max_entries
+    )
+
+
+def close_semantic_cache() -> None:
+    """Drop the cache"""
+    global _cache
+    _cache = None
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """Get the /ask response cache, or None when disabled"""
+    return _cache
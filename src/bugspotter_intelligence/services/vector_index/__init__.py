@@ -0,0 +1,18 @@
+from .base import VectorIndex
+from .exact import ExactVectorIndex
+from .factory import create_vector_index
+from .search import IndexSearchBackend, PgVectorSearchBackend, SimilaritySearchBackend
+from .sync import VectorIndexSync, close_vector_index, get_vector_index, init_vector_index
+
+__all__ = [
+    "ExactVectorIndex",
+    "IndexSearchBackend",
+    "PgVectorSearchBackend",
+    "SimilaritySearchBackend",
+    "VectorIndex",
+    "VectorIndexSync",
+    "close_vector_index",
+    "create_vector_index",
+    "get_vector_index",
+    "init_vector_index",
+]
@@ -0,0 +1,119 @@
+"""Abstract base class for in-memory vector indexes"""
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+
+
+class VectorIndex(ABC):
+    """
+    Abstract base class for in-process vector indexes
+
+    Mirrors the embedding column of bug_embeddings so similarity
+    lookups can be answered without a round trip to Postgres.
+    Similarity scores are cosine similarity (0-1), same as BugRepository.find_similar.
+    """
+
+    # Statuses that never appear in search results (same filter as find_similar)
+    EXCLUDED_STATUSES = frozenset({"duplicate"})
+
+    # Whether search can miss true neighbors (IndexSearchBackend re-ranks these)
+    approximate = False
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self._statuses: dict[str, str] = {}
+
+    @abstractmethod
+    def upsert(self, bug_id: str, embedding: list[float], status: Optional[str] = None) -> None:
+        """Add a bug to the index or replace its embedding"""
+        pass
+
+    @abstractmethod
+    def remove(self, bug_id: str) -> None:
+        """Remove a bug from the index (no-op if missing)"""
+        pass
+
+    @abstractmethod
+    def get_embedding(self, bug_id: str) -> Optional[list[float]]:
+        """Get the stored embedding for a bug, or None if not indexed"""
+        pass
+
+    @abstractmethod
+    def search(
+            self,
+            embedding: list[float],
+            limit: int = 5,
+            threshold: float = 0.7
+    ) -> list[tuple[str, float]]:
+        """
+        Find nearest bugs by cosine similarity
+
+        Returns:
+            List of (bug_id, similarity) ordered by similarity descending,
+            excluding bugs with an excluded status
+        """
+        pass
+
+    def search_batch(
+            self,
+            embeddings: list[list[float]],
+            limit: int = 5,
+            threshold: float = 0.7
+    ) -> list[list[tuple[str, float]]]:
+        """Search several queries at once (one result list per query)"""
+        return [self.search(embedding, limit=limit, threshold=threshold) for embedding in embeddings]
+
+    def rerank(
+            self,
+            embedding: list[float],
+            candidate_ids: list[str],
+            limit: int = 5,
+            threshold: float = 0.7
+    ) -> list[tuple[str, float]]:
+        """
+        Re-score candidates with exact cosine similarity on the stored embeddings
+
+        Candidates that are unknown or excluded are dropped.
+        """
+        candidates = [
+            bug_id
+            for bug_id in dict.fromkeys(candidate_ids)
+            if bug_id in self and not self.is_excluded(bug_id)
+        ]
+        if not candidates or limit <= 0:
+            return []
+
+        query = np.asarray(embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        vectors = np.asarray([self.get_embedding(bug_id) for bug_id in candidates], dtype=np.float32)
+        scores = vectors @ query
+
+        ranked = sorted(zip(candidates, scores.tolist()), key=lambda hit: hit[1], reverse=True)
+        return [(bug_id, min(score, 1.0)) for bug_id, score in ranked[:limit] if score >= threshold]
+
+    @property
+    @abstractmethod
+    def backend_name(self) -> str:
+        """Get the backend name"""
+        pass
+
+    def set_status(self, bug_id: str, status: Optional[str]) -> None:
+        """Update the status used for result filtering"""
+        if bug_id in self:
+            self._statuses[bug_id] = status or "open"
+
+    def is_excluded(self, bug_id: str) -> bool:
+        """Check whether a bug is filtered out of search results"""
+        return self._statuses.get(bug_id) in self.EXCLUDED_STATUSES
+
+    def bug_ids(self) -> list[str]:
+        """Get the ids of all indexed bugs"""
+        return list(self._statuses)
+
+    def __contains__(self, bug_id: str) -> bool:
+        return bug_id in self._statuses
+
+    def __len__(self) -> int:
+        return len(self._statuses)
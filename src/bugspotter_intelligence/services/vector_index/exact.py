@@ -0,0 +1,213 @@
+import logging
+from typing import Optional
+
+import numpy as np
+
+from .base import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+
+def top_k_rows(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Column indices of the k highest scores in each row, best first
+
+    argpartition selects the top k in O(n) per row; only those k are
+    then sorted, instead of sorting the whole row.
+    """
+    n = scores.shape[1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.intp)
+
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(n), (scores.shape[0], n))
+
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+class ExactVectorIndex(VectorIndex):
+    """
+    Exact (brute-force) in-memory index backed by a NumPy matrix
+
+    Perfect recall; best for small corpora (up to ~200k vectors) where a
+    single BLAS matmul over a contiguous float32 matrix is cheaper than
+    maintaining an ANN graph. Rows are stored L2-normalized so a dot
+    product is cosine similarity.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, dimension: int):
+        super().__init__(dimension)
+        self._matrix = np.zeros((self.INITIAL_CAPACITY, dimension), dtype=np.float32)
+        self._excluded = np.zeros(self.INITIAL_CAPACITY, dtype=bool)
+        self._ids: list[str] = []
+        self._positions: dict[str, int] = {}
+
+    def upsert(self, bug_id: str, embedding: list[float], status: Optional[str] = None) -> None:
+        """Add or replace a row"""
+        vector = self._normalize(np.asarray(embedding, dtype=np.float32))
+
+        position = self._positions.get(bug_id)
+        if position is None:
+            position = len(self._ids)
+            self._ensure_capacity(position + 1)
+            self._ids.append(bug_id)
+            self._positions[bug_id] = position
+
+        self._matrix[position] = vector
+        self._statuses[bug_id] = status or "open"
+        self._excluded[position] = self.is_excluded(bug_id)
+
+    def set_status(self, bug_id: str, status: Optional[str]) -> None:
+        """Update the status and the exclusion mask"""
+        super().set_status(bug_id, status)
+
+        position = self._positions.get(bug_id)
+        if position is not None:
+            self._excluded[position] = self.is_excluded(bug_id)
+
+    def remove(self, bug_id: str) -> None:
+        """Remove a row by swapping the last row into its slot"""
+        position = self._positions.pop(bug_id, None)
+        if position is None:
+            return
+
+        self._statuses.pop(bug_id, None)
+        last = len(self._ids) - 1
+
+        if position != last:
+            moved_id = self._ids[last]
+            self._matrix[position] = self._matrix[last]
+            self._excluded[position] = self._excluded[last]
+            self._ids[position] = moved_id
+            self._positions[moved_id] = position
+
+        self._excluded[last] = False
+        self._ids.pop()
+
+    def get_embedding(self, bug_id: str) -> Optional[list[float]]:
+        """Get the stored (normalized) embedding"""
+        position = self._positions.get(bug_id)
+        if position is None:
+            return None
+        return self._matrix[position].tolist()
+
+    def search(
+            self,
+            embedding: list[float],
+            limit: int = 5,
+            threshold: float = 0.7
+    ) -> list[tuple[str, float]]:
+        """Score every row and return the best matches above threshold"""
+        return self.search_batch([embedding], limit=limit, threshold=threshold)[0]
+
+    def search_batch(
+            self,
+            embeddings: list[list[float]],
+            limit: int = 5,
+            threshold: float = 0.7
+    ) -> list[list[tuple[str, float]]]:
+        """
+        Score many queries with one matmul
+
+        (queries x dim) @ (dim x rows) runs as a single BLAS call,
+        which is far cheaper than one matrix-vector product per query.
+        """
+        count = len(self._ids)
+        if len(embeddings) == 0:
+            return []
+        if count == 0 or limit <= 0:
+            return [[] for _ in embeddings]
+
+        queries = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        scores = queries @ self._matrix[:count].T
+
+        # Excluded rows can never win, whatever their score
+        scores[:, self._excluded[:count]] = -np.inf
+
+        top = top_k_rows(scores, limit)
+        return [self._collect(scores[row], top[row], threshold) for row in range(len(embeddings))]
+
+    def rerank(
+            self,
+            embedding: list[float],
+            candidate_ids: list[str],
+            limit: int = 5,
+            threshold: float = 0.7
+    ) -> list[tuple[str, float]]:
+        """
+        Re-score candidates with exact cosine similarity
+
+        Gathers the candidate rows straight from the matrix. Candidates
+        that are unknown or excluded are dropped.
+        """
+        positions = [
+            self._positions[bug_id]
+            for bug_id in dict.fromkeys(candidate_ids)
+            if bug_id in self._positions and not self.is_excluded(bug_id)
+        ]
+        if not positions or limit <= 0:
+            return []
+
+        query = self._normalize(np.asarray(embedding, dtype=np.float32))
+        rows = np.asarray(positions, dtype=np.intp)
+        scores = self._matrix[rows] @ query
+
+        top = top_k_rows(scores[np.newaxis, :], limit)[0]
+        return [
+            (self._ids[rows[i]], min(float(scores[i]), 1.0))
+            for i in top
+            if scores[i] >= threshold
+        ]
+
+    @property
+    def backend_name(self) -> str:
+        return "exact"
+
+    def _collect(
+            self,
+            scores: np.ndarray,
+            positions: np.ndarray,
+            threshold: float
+    ) -> list[tuple[str, float]]:
+        results = []
+        for position in positions:
+            score = float(scores[position])
+            if score < threshold:
+                break
+            results.append((self._ids[position], min(score, 1.0)))
+        return results
+
+    def _ensure_capacity(self, required: int) -> None:
+        """Grow the matrix geometrically so appends stay amortized O(1)"""
+        capacity = self._matrix.shape[0]
+        if required <= capacity:
+            return
+
+        while capacity < required:
+            capacity *= 2
+
+        count = len(self._ids)
+        grown = np.zeros((capacity, self.dimension), dtype=np.float32)
+        grown[:count] = self._matrix[:count]
+        self._matrix = grown
+
+        excluded = np.zeros(capacity, dtype=bool)
+        excluded[:count] = self._excluded[:count]
+        self._excluded = excluded
+
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize a vector or each row of a matrix"""
+        if vectors.shape[-1] != self.dimension:
+            raise ValueError(
+                f"Embedding dimension mismatch: expected {self.dimension}, got {vectors.shape[-1]}"
+            )
+
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
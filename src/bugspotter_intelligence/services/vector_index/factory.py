@@ -0,0 +1,43 @@
+import logging
+from typing import Optional
+
+from bugspotter_intelligence.config import Settings
+from .base import VectorIndex
+from .exact import ExactVectorIndex
+
+logger = logging.getLogger(__name__)
+
+
+def create_vector_index(settings: Settings) -> Optional[VectorIndex]:
+    """
+    Create in-memory vector index based on settings
+
+    Backend types:
+    - none: disabled, all similarity searches go to Postgres
+    - exact: NumPy brute force (small corpora, perfect recall)
+    - hnsw: hnswlib approximate index (large corpora)
+    """
+    backend = settings.vector_index_backend.lower()
+
+    if backend == "none":
+        return None
+
+    logger.info(f"Creating vector index: {backend}")
+
+    if backend == "exact":
+        return ExactVectorIndex(dimension=settings.embedding_dimension)
+
+    if backend == "hnsw":
+        from .hnsw import HNSWVectorIndex
+
+        return HNSWVectorIndex(
+            dimension=settings.embedding_dimension,
+            m=settings.hnsw_m,
+            ef_construction=settings.hnsw_ef_construction,
+            ef_search=settings.hnsw_ef_search
+        )
+
+    raise ValueError(
+        f"Unsupported vector index backend: '{backend}'. "
+        f"Supported: none, exact, hnsw"
+    )
@@ -0,0 +1,138 @@
+import logging
+from typing import Optional
+
+from .base import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+
+class HNSWVectorIndex(VectorIndex):
+    """
+    Approximate in-memory index using hnswlib (HNSW graph)
+
+    Sub-millisecond queries on large corpora at the cost of
+    slightly imperfect recall (tunable with ef_search).
+    Requires the optional 'hnswlib' package.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    approximate = True
+
+    def __init__(
+            self,
+            dimension: int,
+            m: int = 16,
+            ef_construction: int = 200,
+            ef_search: int = 64
+    ):
+        super().__init__(dimension)
+
+        try:
+            import hnswlib
+        except ImportError as e:
+            raise ImportError(
+                "hnswlib is required for the 'hnsw' vector index backend. "
+                "Install it with: pip install -e \".[ann]\""
+            ) from e
+
+        self._index = hnswlib.Index(space="cosine", dim=dimension)
+        self._index.init_index(
+            max_elements=self.INITIAL_CAPACITY,
+            M=m,
+            ef_construction=ef_construction,
+            allow_replace_deleted=True
+        )
+        self._index.set_ef(ef_search)
+
+        self._labels: dict[str, int] = {}
+        self._ids: dict[int, str] = {}
+        self._next_label = 0
+
+    def upsert(self, bug_id: str, embedding: list[float], status: Optional[str] = None) -> None:
+        """Add a new element or update an existing one in place"""
+        if len(embedding) != self.dimension:
+            raise ValueError(
+                f"Embedding dimension mismatch: expected {self.dimension}, got {len(embedding)}"
+            )
+
+        label = self._labels.get(bug_id)
+
+        if label is None:
+            self._ensure_capacity(len(self._labels) + 1)
+            label = self._next_label
+            self._next_label += 1
+            self._labels[bug_id] = label
+            self._ids[label] = bug_id
+            self._index.add_items([embedding], [label], replace_deleted=True)
+        else:
+            # Re-adding an existing label updates its vector
+            self._index.add_items([embedding], [label])
+
+        self._statuses[bug_id] = status or "open"
+
+    def remove(self, bug_id: str) -> None:
+        """Mark the element deleted; its slot is reused by later inserts"""
+        label = self._labels.pop(bug_id, None)
+        if label is None:
+            return
+
+        self._ids.pop(label, None)
+        self._statuses.pop(bug_id, None)
+        self._index.mark_deleted(label)
+
+    def get_embedding(self, bug_id: str) -> Optional[list[float]]:
+        """Get the stored (normalized) embedding"""
+        label = self._labels.get(bug_id)
+        if label is None:
+            return None
+        return [float(x) for x in self._index.get_items([label])[0]]
+
+    def search(
+            self,
+            embedding: list[float],
+            limit: int = 5,
+            threshold: float = 0.7
+    ) -> list[tuple[str, float]]:
+        """Query the HNSW graph, skipping excluded statuses during traversal"""
+        k = min(limit, len(self))
+        if k <= 0:
+            return []
+
+        def allowed(label: int) -> bool:
+            bug_id = self._ids.get(label)
+            return bug_id is not None and not self.is_excluded(bug_id)
+
+        while k > 0:
+            try:
+                labels, distances = self._index.knn_query([embedding], k=k, filter=allowed)
+                break
+            except RuntimeError:
+                # Fewer than k eligible elements reachable
+                k //= 2
+        else:
+            return []
+
+        results = []
+        for label, distance in zip(labels[0], distances[0]):
+            similarity = 1.0 - float(distance)
+            if similarity < threshold:
+                break
+            results.append((self._ids[int(label)], min(similarity, 1.0)))
+
+        return results
+
+    @property
+    def backend_name(self) -> str:
+        return "hnsw"
+
+    def _ensure_capacity(self, required: int) -> None:
+        capacity = self._index.get_max_elements()
+        if required <= capacity:
+            return
+
+        while capacity < required:
+            capacity *= 2
+
+        logger.debug(f"Resizing HNSW index to {capacity} elements")
+        self._index.resize_index(capacity)
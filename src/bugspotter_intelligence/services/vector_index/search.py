@@ -0,0 +1,162 @@
+"""Common interface over the pgvector and in-memory similarity search paths"""
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from psycopg import AsyncConnection
+
+from bugspotter_intelligence.db.bug_repository import BugRepository
+from .base import VectorIndex
+
+
+class SimilaritySearchBackend(ABC):
+    """
+    Abstract KNN search over bug embeddings
+
+    Results use the same dict shape as BugRepository.find_similar:
+    bug_id, title, description, status, resolution, similarity.
+    """
+
+    def __init__(self, repo: BugRepository):
+        self.repo = repo
+
+    @abstractmethod
+    async def find_similar(
+            self,
+            conn: AsyncConnection,
+            embedding: list[float],
+            limit: int = 5,
+            threshold: float = 0.7
+    ) -> list[dict]:
+        """Find bugs similar to one embedding"""
+        pass
+
+    @abstractmethod
+    async def find_similar_batch(
+            self,
+            conn: AsyncConnection,
+            embeddings: list[list[float]],
+            limit: int = 5,
+            threshold: float = 0.7
+    ) -> list[list[dict]]:
+        """Find bugs similar to several embeddings (one list per embedding)"""
+        pass
+
+    @property
+    @abstractmethod
+    def backend_name(self) -> str:
+        """Get the backend name"""
+        pass
+
+
+class PgVectorSearchBackend(SimilaritySearchBackend):
+    """
+    KNN search in Postgres with pgvector
+
+    With rerank_candidates set, searches binary-quantized embeddings
+    first and re-ranks that many candidates with exact cosine similarity.
+    """
+
+    def __init__(self, repo: BugRepository, rerank_candidates: Optional[int] = None, dimension: int = 384):
+        super().__init__(repo)
+        self.rerank_candidates = rerank_candidates
+        self.dimension = dimension
+
+    async def find_similar(
+            self,
+            conn: AsyncConnection,
+            embedding: list[float],
+            limit: int = 5,
+            threshold: float = 0.7
+    ) -> list[dict]:
+        return await self.repo.find_similar(
+            conn=conn,
+            embedding=embedding,
+            limit=limit,
+            threshold=threshold,
+            rerank_candidates=self.rerank_candidates,
+            dimension=self.dimension
+        )
+
+    async def find_similar_batch(
+            self,
+            conn: AsyncConnection,
+            embeddings: list[list[float]],
+            limit: int = 5,
+            threshold: float = 0.7
+    ) -> list[list[dict]]:
+        return await self.repo.find_similar_batch(
+            conn=conn,
+            embeddings=embeddings,
+            limit=limit,
+            threshold=threshold,
+            rerank_candidates=self.rerank_candidates,
+            dimension=self.dimension
+        )
+
+    @property
+    def backend_name(self) -> str:
+        return "pgvector-binary" if self.rerank_candidates else "pgvector"
+
+
+class IndexSearchBackend(SimilaritySearchBackend):
+    """
+    KNN search against an in-memory VectorIndex
+
+    Scores come from the index; only the display fields of the winners
+    are read from Postgres, with a single primary-key lookup per call.
+
+    With rerank_candidates set and an approximate index, that many
+    candidates are fetched per query and re-ranked with exact cosine
+    similarity, so a true neighbor the graph ranked just outside the top
+    `limit` is still found.
+    """
+
+    def __init__(self, repo: BugRepository, index: VectorIndex, rerank_candidates: Optional[int] = None):
+        super().__init__(repo)
+        self.index = index
+        self.rerank_candidates = rerank_candidates
+
+    async def find_similar(
+            self,
+            conn: AsyncConnection,
+            embedding: list[float],
+            limit: int = 5,
+            threshold: float = 0.7
+    ) -> list[dict]:
+        return (await self.find_similar_batch(conn, [embedding], limit, threshold))[0]
+
+    async def find_similar_batch(
+            self,
+            conn: AsyncConnection,
+            embeddings: list[list[float]],
+            limit: int = 5,
+            threshold: float = 0.7
+    ) -> list[list[dict]]:
+        if self.rerank_candidates and self.index.approximate:
+            candidates = self.index.search_batch(
+                embeddings, limit=max(self.rerank_candidates, limit), threshold=threshold
+            )
+            hits = [
+                self.index.rerank(embedding, [bug_id for bug_id, _ in query_hits], limit, threshold)
+                for embedding, query_hits in zip(embeddings, candidates)
+            ]
+        else:
+            hits = self.index.search_batch(embeddings, limit=limit, threshold=threshold)
+
+        hit_ids = list(dict.fromkeys(bug_id for query_hits in hits for bug_id, _ in query_hits))
+        bugs = await self.repo.get_bugs_by_ids(conn, hit_ids)
+
+        # Keep index order; skip rows deleted or marked duplicate since the last sync
+        return [
+            [
+                {**bugs[bug_id], "similarity": similarity}
+                for bug_id, similarity in query_hits
+                if bug_id in bugs and bugs[bug_id]["status"] != "duplicate"
+            ]
+            for query_hits in hits
+        ]
+
+    @property
+    def backend_name(self) -> str:
+        return self.index.backend_name
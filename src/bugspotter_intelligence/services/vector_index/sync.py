@@ -0,0 +1,174 @@
+"""Keep the in-memory vector index in sync with bug_embeddings"""
+
+import asyncio
+import json
+import logging
+from typing import Optional
+
+from psycopg import AsyncConnection
+from psycopg_pool import AsyncConnectionPool
+
+from bugspotter_intelligence.config import Settings
+from bugspotter_intelligence.db.bug_repository import BugRepository
+from .base import VectorIndex
+from .factory import create_vector_index
+
+logger = logging.getLogger(__name__)
+
+# Must match the channel used by the notify_bug_embeddings_change() trigger
+NOTIFY_CHANNEL = "bug_embeddings_changes"
+
+
+class VectorIndexSync:
+    """
+    Loads the index from bug_embeddings and applies LISTEN/NOTIFY changes
+
+    A dedicated autocommit connection LISTENs before the initial load,
+    so changes committed during the load are queued and replayed.
+    If the listener connection drops, the index is reloaded and reconciled
+    because notifications sent while disconnected are lost.
+    """
+
+    RECONNECT_DELAY = 1.0
+    MAX_RECONNECT_DELAY = 30.0
+
+    def __init__(self, index: VectorIndex, pool: AsyncConnectionPool, database_url: str):
+        self.index = index
+        self.pool = pool
+        self.database_url = database_url
+        self.repo = BugRepository()
+        self.ready = False
+        self._conn: Optional[AsyncConnection] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Connect the listener, load the snapshot and start applying changes"""
+        await self._connect_and_load()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and close the listener connection"""
+        self.ready = False
+
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self._close_connection()
+
+    async def load(self) -> int:
+        """Load every embedding from the database into the index"""
+        seen: set[str] = set()
+        async with self.pool.connection() as conn:
+            async for batch in self.repo.iter_embeddings(conn):
+                for bug_id, embedding, status in batch:
+                    self.index.upsert(bug_id, embedding, status)
+                    seen.add(bug_id)
+
+        # Drop rows deleted while we weren't listening (reload after reconnect)
+        for bug_id in self.index.bug_ids():
+            if bug_id not in seen:
+                self.index.remove(bug_id)
+
+        count = len(seen)
+        logger.info(f"Vector index loaded: {count} embeddings ({self.index.backend_name})")
+        return count
+
+    async def apply(self, payload: dict) -> None:
+        """Apply a single change notification to the index"""
+        bug_id = payload.get("bug_id")
+        if not bug_id:
+            return
+
+        op = payload.get("op")
+
+        if op == "DELETE":
+            self.index.remove(bug_id)
+            return
+
+        # Status-only updates don't need a round trip for the vector
+        if op == "UPDATE" and not payload.get("embedding_changed") and bug_id in self.index:
+            self.index.set_status(bug_id, payload.get("status"))
+            return
+
+        async with self.pool.connection() as conn:
+            row = await self.repo.get_embedding(conn, bug_id)
+
+        if row is None:
+            self.index.remove(bug_id)
+        else:
+            embedding, status = row
+            self.index.upsert(bug_id, embedding, status)
+
+    async def _connect_and_load(self) -> None:
+        self._conn = await AsyncConnection.connect(self.database_url, autocommit=True)
+        await self._conn.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        await self.load()
+        self.ready = True
+
+    async def _run(self) -> None:
+        delay = self.RECONNECT_DELAY
+
+        while True:
+            try:
+                if self._conn is None or self._conn.closed:
+                    await self._connect_and_load()
+                    delay = self.RECONNECT_DELAY
+
+                async for notify in self._conn.notifies():
+                    try:
+                        await self.apply(json.loads(notify.payload))
+                    except Exception as e:
+                        logger.warning(f"Failed to apply vector index change {notify.payload}: {e}")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Notifications may have been missed; serve from Postgres until reloaded
+                self.ready = False
+                logger.warning(f"Vector index listener disconnected: {e}. Reconnecting in {delay:.0f}s")
+                await self._close_connection()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+
+    async def _close_connection(self) -> None:
+        if self._conn is not None:
+            try:
+                await self._conn.close()
+            except Exception as e:
+                logger.debug(f"Error closing vector index listener: {e}")
+            self._conn = None
+
+
+_sync: VectorIndexSync | None = None
+
+
+async def init_vector_index(settings: Settings, pool: AsyncConnectionPool) -> None:
+    """Create, load and start syncing the vector index (no-op when disabled)"""
+    global _sync
+
+    index = create_vector_index(settings)
+    if index is None:
+        return
+
+    _sync = VectorIndexSync(index, pool, settings.database_url)
+    await _sync.start()
+
+
+async def close_vector_index() -> None:
+    """Stop syncing and drop the vector index"""
+    global _sync
+    if _sync:
+        await _sync.stop()
+        _sync = None
+
+
+def get_vector_index() -> Optional[VectorIndex]:
+    """Get the vector index if enabled and in sync, otherwise None"""
+    if _sync is None or not _sync.ready:
+        return None
+    return _sync.index
@@ -0,0 +1,92 @@
+"""MinHash signatures and LSH banding for near-exact duplicate detection"""
+
+import hashlib
+import re
+
+import numpy as np
+
+# Volatile tokens that differ between copies of the same report
+_VOLATILE_PATTERNS = [
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b"), " <uuid> "),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[t ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(z|[+-]\d{2}:?\d{2})?\b"), " <ts> "),
+    (re.compile(r"\b\d{1,2}:\d{2}:\d{2}(\.\d+)?\b"), " <time> "),
+    (re.compile(r"\b0x[0-9a-f]+\b"), " <n> "),  # addresses
+    (re.compile(r"\b[0-9a-f]*\d[0-9a-f]*\b"), " <n> "),  # numbers and hex ids
+]
+_TOKEN = re.compile(r"<\w+>|\w+")
+
+# Universal hashing (a * x + b) mod p over 32-bit shingle hashes
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_SEED = 1
+
+
+def normalize_text(text: str) -> list[str]:
+    """Lowercase, replace ids/timestamps/numbers with placeholders and tokenize"""
+    text = text.lower()
+    for pattern, placeholder in _VOLATILE_PATTERNS:
+        text = pattern.sub(placeholder, text)
+    return _TOKEN.findall(text)
+
+
+def shingles(text: str, size: int = 3) -> set[str]:
+    """Word n-grams of the normalized text (the whole text if shorter)"""
+    tokens = normalize_text(text)
+    if len(tokens) <= size:
+        return {" ".join(tokens)}
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def minhash_signature(text: str, num_perm: int = 128) -> list[int]:
+    """
+    MinHash signature of a text's shingles
+
+    The share of equal positions in two signatures estimates the Jaccard
+    similarity of their shingle sets. Signatures are only comparable
+    when computed with the same num_perm.
+    """
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little")
+         for s in shingles(text)),
+        dtype=np.uint64
+    )
+    a, b = _permutations(num_perm)
+
+    # uint64 products wrap around; that is fine for hashing
+    permuted = (np.outer(hashes, a) + b) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0).tolist()
+
+
+def lsh_bands(signature: list[int], bands: int) -> list[int]:
+    """
+    Hash each band of a signature to a signed 64-bit bucket key
+
+    Two signatures with any equal band land in the same bucket; with r
+    rows per band the chance of that at Jaccard s is 1 - (1 - s^r)^bands.
+    """
+    rows = len(signature) // bands
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                np.asarray(signature[band * rows:(band + 1) * rows], dtype=np.uint64).tobytes(),
+                digest_size=8
+            ).digest(),
+            "little",
+            signed=True
+        )
+        for band in range(bands)
+    ]
+
+
+def estimate_jaccard(a: list[int], b: list[int]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    if not a or len(a) != len(b):
+        return 0.0
+    return float(np.mean(np.asarray(a) == np.asarray(b)))
+
+
+def _permutations(num_perm: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(_SEED)
+    a = rng.integers(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+    return a, b
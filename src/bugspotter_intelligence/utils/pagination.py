@@ -0,0 +1,30 @@
+"""Opaque keyset cursors for similarity result streams"""
+
+import base64
+import json
+
+
+def encode_cursor(distance: float, bug_id: str) -> str:
+    """
+    Encode a (distance, bug_id) keyset position as an opaque token
+
+    Results are ordered by cosine distance, then bug_id, so this pair
+    uniquely identifies the last row a client has seen.
+    """
+    raw = json.dumps([distance, bug_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[float, str]:
+    """
+    Decode a token from encode_cursor
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        distance, bug_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(distance), str(bug_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
@@ -0,0 +1,81 @@
+"""Server-Sent Events formatting for streamed LLM output"""
+
+import json
+import logging
+from typing import AsyncIterator, Optional
+
+from bugspotter_intelligence.llm import LLMOverloadedError
+
+logger = logging.getLogger(__name__)
+
+# Stop proxies (nginx) and clients from buffering the event stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def format_event(data: dict, event: Optional[str] = None) -> str:
+    """Encode one event: optional `event:` line, JSON `data:` line, blank line"""
+    lines = [f"event: {event}"] if event else []
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def start_stream(tokens: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Run a token stream up to its first chunk before the response starts
+
+    A stream takes its LLM scheduler slot when it is first iterated, so
+    calling this before building the StreamingResponse lets a full queue
+    raise LLMOverloadedError to the exception handler: a 429/503 with
+    Retry-After, as on the non-streaming endpoints. The response headers
+    then wait for the first token. Other failures are left in the stream
+    for token_events to report.
+
+    Returns the whole stream, first chunk included
+    """
+    try:
+        head = [await anext(tokens)]
+    except StopAsyncIteration:
+        head = []
+    except LLMOverloadedError:
+        raise
+    except Exception as e:
+        return _resume([], tokens, error=e)
+
+    return _resume(head, tokens)
+
+
+async def _resume(
+        head: list[str],
+        rest: AsyncIterator[str],
+        error: Optional[Exception] = None
+) -> AsyncIterator[str]:
+    """The chunks start_stream already read, then the rest (or its error)"""
+    if error is not None:
+        raise error
+    for chunk in head:
+        yield chunk
+    async for chunk in rest:
+        yield chunk
+
+
+async def token_events(tokens: AsyncIterator[str], done: dict) -> AsyncIterator[str]:
+    """
+    One `token` event per text chunk, then a `done` event carrying `done`
+
+    The response status is already sent once tokens flow, so a failure
+    mid-generation is reported as an `error` event instead. When the LLM
+    was too busy to start, the event carries `retry_after` (seconds).
+    """
+    try:
+        async for token in tokens:
+            yield format_event({"text": token}, "token")
+    except LLMOverloadedError as e:
+        logger.warning(f"Streaming generation rejected: {e}")
+        yield format_event({"detail": str(e), "retry_after": e.retry_after}, "error")
+        return
+    except Exception as e:
+        logger.error(f"Streaming generation failed: {e}")
+        yield format_event({"detail": str(e)}, "error")
+        return
+
+    yield format_event(done, "done")
@@ -3,8 +3,10 @@ import sys
 import pytest
 import time
 import httpx
+import psycopg
 from testcontainers.core.container import DockerContainer
 from bugspotter_intelligence.config import Settings
+from bugspotter_intelligence.db.migrations.runner import migrate
 
 
 # Platform-specific testcontainers configuration
@@ -77,4 +79,61 @@ def settings_with_testcontainer(ollama_container):
     settings = Settings()
     settings.ollama_base_url = ollama_container["base_url"]
     settings.ollama_model = "tinyllama:1.1b"
-    return settings
\ No newline at end of file
+    return settings
+
+
+@pytest.fixture(scope="session")
+def postgres_url():
+    """
+    Start pgvector Postgres for integration tests
+    Scope: session (shared across all tests)
+
+    Set TEST_DATABASE_URL to use an existing (disposable) database instead.
+    """
+    if os.environ.get("TEST_DATABASE_URL"):
+        yield os.environ["TEST_DATABASE_URL"]
+        return
+
+    container = DockerContainer("pgvector/pgvector:pg16")
+    container.with_exposed_ports(5432)
+    container.with_env("POSTGRES_USER", "postgres")
+    container.with_env("POSTGRES_PASSWORD", "postgres")
+    container.with_env("POSTGRES_DB", "bugspotter_test")
+    container.start()
+
+    url = (
+        f"postgresql://postgres:postgres@{container.get_container_host_ip()}:"
+        f"{container.get_exposed_port(5432)}/bugspotter_test"
+    )
+
+    for _ in range(30):
+        try:
+            psycopg.connect(url).close()
+            break
+        except psycopg.OperationalError:
+            time.sleep(1)
+    else:
+        container.stop()
+        raise TimeoutError("Postgres failed to start after 30 seconds")
+
+    yield url
+
+    container.stop()
+
+
+@pytest.fixture
+async def db_conn(postgres_url):
+    """Connection to a migrated database, emptied after each test"""
+    async with await psycopg.AsyncConnection.connect(postgres_url, autocommit=True) as admin:
+        await migrate(admin)
+
+    async with await psycopg.AsyncConnection.connect(postgres_url) as conn:
+        yield conn
+
+    async with await psycopg.AsyncConnection.connect(postgres_url, autocommit=True) as admin:
+        await admin.execute(
+            """
+            TRUNCATE bug_embeddings, bug_embeddings_cold, bug_embeddings_archive,
+                     bug_neighbors, bug_minhash, bug_lsh_bands, bug_mitigations, summary_jobs
+            """
+        )
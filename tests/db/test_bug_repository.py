@@ -0,0 +1,127 @@
+"""BugRepository against real Postgres (testcontainers)"""
+
+import pytest
+
+from bugspotter_intelligence.db.archive_repository import ArchiveRepository
+from bugspotter_intelligence.db.bug_repository import BugRepository
+
+pytestmark = pytest.mark.integration
+
+
+def _unit(i: int) -> list[float]:
+    vector = [0.0] * 384
+    vector[i] = 1.0
+    return vector
+
+
+async def _archive(conn, bug_id: str) -> None:
+    """Resolve a bug and move it through the cold tier into the archive"""
+    await BugRepository.insert_bug(conn, bug_id, "Login fails", "ECONNRESET", _unit(0))
+    await BugRepository.update_resolution(conn, bug_id, "Raised the pool size")
+    assert await BugRepository.demote_stale_bugs(conn, months=0) == 1
+    assert await ArchiveRepository.archive_cold_bugs(conn, months=0) == 1
+
+
+async def _tiers(conn, bug_id: str) -> list[str]:
+    cursor = await conn.execute(
+        """
+        SELECT 'hot' FROM bug_embeddings WHERE bug_id = %(id)s
+        UNION ALL SELECT 'cold' FROM bug_embeddings_cold WHERE bug_id = %(id)s
+        UNION ALL SELECT 'archive' FROM bug_embeddings_archive WHERE bug_id = %(id)s
+        """,
+        {"id": bug_id}
+    )
+    return [row[0] for row in await cursor.fetchall()]
+
+
+async def _summary_jobs(conn) -> list[tuple]:
+    cursor = await conn.execute("SELECT bug_id, resolution FROM summary_jobs ORDER BY bug_id")
+    return await cursor.fetchall()
+
+
+class TestUpdateResolution:
+    """Test suite for resolution writes"""
+
+    @pytest.mark.asyncio
+    async def test_queues_summary_for_existing_bug(self, db_conn):
+        """Should write the resolution and queue its summary"""
+        await BugRepository.insert_bug(db_conn, "bug-001", "Login fails", None, _unit(0))
+
+        assert await BugRepository.update_resolution(
+            db_conn, "bug-001", "Added null check", queue_summary=True
+        ) is True
+
+        assert await _summary_jobs(db_conn) == [("bug-001", "Added null check")]
+
+    @pytest.mark.asyncio
+    async def test_unknown_bug_queues_nothing(self, db_conn):
+        """Should not queue an LLM summary for a bug that doesn't exist"""
+        assert await BugRepository.update_resolution(
+            db_conn, "bug-404", "Added null check", queue_summary=True
+        ) is False
+
+        assert await _summary_jobs(db_conn) == []
+
+
+class TestArchivedBugWrites:
+    """Writes to archived bugs bring them back to the hot tier"""
+
+    @pytest.mark.asyncio
+    async def test_reanalyzed_bug_leaves_no_archive_copy(self, db_conn):
+        """Should rehydrate an archived bug on re-ingest, keeping its resolution"""
+        await _archive(db_conn, "bug-001")
+
+        await BugRepository.insert_bug(db_conn, "bug-001", "Login fails again", "ECONNRESET", _unit(1))
+
+        assert await _tiers(db_conn, "bug-001") == ["hot"]
+        bug = await BugRepository.get_bug(db_conn, "bug-001")
+        assert bug["title"] == "Login fails again"
+        assert bug["status"] == "resolved"
+        assert bug["resolution"] == "Raised the pool size"
+
+    @pytest.mark.asyncio
+    async def test_resolution_of_archived_bug_is_written(self, db_conn):
+        """Should rehydrate an archived bug instead of losing its new resolution"""
+        await _archive(db_conn, "bug-001")
+
+        assert await BugRepository.update_resolution(
+            db_conn, "bug-001", "Reverted the pool change", status="closed", queue_summary=True
+        ) is True
+
+        assert await _tiers(db_conn, "bug-001") == ["hot"]
+        bug = await BugRepository.get_bug(db_conn, "bug-001")
+        assert (bug["status"], bug["resolution"]) == ("closed", "Reverted the pool change")
+        assert await _summary_jobs(db_conn) == [("bug-001", "Reverted the pool change")]
+
+    @pytest.mark.asyncio
+    async def test_bulk_resolutions_reach_archived_bugs(self, db_conn):
+        """Should update archived, cold and hot bugs alike in a bulk write"""
+        await _archive(db_conn, "bug-001")
+        await BugRepository.insert_bug(db_conn, "bug-002", "Checkout slow", None, _unit(2))
+
+        updated = await BugRepository.update_resolutions(db_conn, [
+            {"bug_id": "bug-001", "resolution": "Reverted", "status": "closed"},
+            {"bug_id": "bug-002", "resolution": "Added an index", "status": "resolved"},
+            {"bug_id": "bug-404", "resolution": "Nothing", "status": "resolved"}
+        ])
+
+        assert sorted(updated) == ["bug-001", "bug-002"]
+        assert await _tiers(db_conn, "bug-001") == ["hot"]
+
+
+class TestTierRoundTrip:
+    """Moving a bug through the tiers keeps its columns"""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_cluster_survives_archive(self, db_conn):
+        """Should keep the cluster assignment through the cold tier and the archive"""
+        await BugRepository.insert_bug(db_conn, "bug-001", "Login fails", "ECONNRESET", _unit(0))
+        await BugRepository.write_duplicate_clusters(db_conn, {"bug-001": "bug-000"})
+        await BugRepository.update_resolution(db_conn, "bug-001", "Raised the pool size")
+        assert await BugRepository.demote_stale_bugs(db_conn, months=0) == 1
+        assert await ArchiveRepository.archive_cold_bugs(db_conn, months=0) == 1
+
+        assert await ArchiveRepository.rehydrate(db_conn, ["bug-001"]) == 1
+
+        cursor = await db_conn.execute("SELECT duplicate_cluster_id FROM bug_embeddings WHERE bug_id = 'bug-001'")
+        assert (await cursor.fetchone())[0] == "bug-000"
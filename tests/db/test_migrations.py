@@ -0,0 +1,124 @@
+"""Tests for the versioned migration runner"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from bugspotter_intelligence.db.migrations import runner
+from bugspotter_intelligence.db.migrations.runner import (
+    ADVISORY_LOCK_KEY,
+    Migration,
+    SchemaVersionError,
+    load_migrations,
+    migrate,
+    verify_schema,
+)
+
+
+def _migration(version: int, calls: list, transactional: bool = True) -> Migration:
+    async def upgrade(conn):
+        calls.append(version)
+
+    return Migration(version, f"step{version}", upgrade, transactional)
+
+
+@pytest.fixture
+def autocommit_conn():
+    """Connection mock in autocommit mode"""
+    conn = MagicMock()
+    conn.autocommit = True
+    conn.execute = AsyncMock()
+    transaction = MagicMock()
+    transaction.__aenter__ = AsyncMock()
+    transaction.__aexit__ = AsyncMock(return_value=None)
+    conn.transaction = MagicMock(return_value=transaction)
+    return conn
+
+
+class TestLoadMigrations:
+    """Test suite for migration discovery"""
+
+    def test_versions_are_contiguous(self):
+        """Should load the shipped migrations in order starting at 1"""
+        migrations = load_migrations()
+
+        assert [m.version for m in migrations] == list(range(1, len(migrations) + 1))
+        assert migrations[0].name == "initial"
+        assert all(callable(m.upgrade) for m in migrations)
+
+
+class TestVerifySchema:
+    """Test suite for the startup version check"""
+
+    @pytest.mark.asyncio
+    async def test_behind_raises(self):
+        """Should refuse to start with pending migrations"""
+        with patch.object(runner, 'get_schema_version', new_callable=AsyncMock, return_value=0), \
+                patch.object(runner, 'latest_version', return_value=2):
+            with pytest.raises(SchemaVersionError, match="bugspotter-migrate"):
+                await verify_schema(MagicMock())
+
+    @pytest.mark.asyncio
+    async def test_current_or_newer_passes(self):
+        """Should accept the expected version and a newer one"""
+        with patch.object(runner, 'latest_version', return_value=2):
+            for version in (2, 3):
+                with patch.object(runner, 'get_schema_version', new_callable=AsyncMock, return_value=version):
+                    assert await verify_schema(MagicMock()) == version
+
+
+class TestMigrate:
+    """Test suite for applying migrations"""
+
+    @pytest.mark.asyncio
+    async def test_applies_pending_in_order_under_lock(self, autocommit_conn):
+        """Should apply only newer migrations, in order, holding the advisory lock"""
+        calls = []
+        migrations = [_migration(1, calls), _migration(2, calls), _migration(3, calls, transactional=False)]
+
+        with patch.object(runner, 'load_migrations', return_value=migrations), \
+                patch.object(runner, 'get_schema_version', new_callable=AsyncMock, return_value=1):
+            applied = await migrate(autocommit_conn)
+
+        assert applied == [2, 3]
+        assert calls == [2, 3]
+        # Only the transactional migration got a transaction
+        assert autocommit_conn.transaction.call_count == 1
+
+        statements = [c.args[0] for c in autocommit_conn.execute.call_args_list]
+        assert "pg_advisory_lock" in statements[0]
+        assert "pg_advisory_unlock" in statements[-1]
+        assert autocommit_conn.execute.call_args_list[0].args[1] == (ADVISORY_LOCK_KEY,)
+        recorded = [c.args[1] for c in autocommit_conn.execute.call_args_list if "INSERT INTO schema_version" in c.args[0]]
+        assert recorded == [(2, "step2"), (3, "step3")]
+
+    @pytest.mark.asyncio
+    async def test_stops_at_target(self, autocommit_conn):
+        """Should not go past the target version"""
+        calls = []
+        migrations = [_migration(1, calls), _migration(2, calls)]
+
+        with patch.object(runner, 'load_migrations', return_value=migrations), \
+                patch.object(runner, 'get_schema_version', new_callable=AsyncMock, return_value=0):
+            assert await migrate(autocommit_conn, target=1) == [1]
+
+    @pytest.mark.asyncio
+    async def test_unlocks_on_failure(self, autocommit_conn):
+        """Should release the advisory lock when a migration fails"""
+        async def broken(conn):
+            raise RuntimeError("boom")
+
+        with patch.object(runner, 'load_migrations', return_value=[Migration(1, "broken", broken)]), \
+                patch.object(runner, 'get_schema_version', new_callable=AsyncMock, return_value=0):
+            with pytest.raises(RuntimeError):
+                await migrate(autocommit_conn)
+
+        assert "pg_advisory_unlock" in autocommit_conn.execute.call_args_list[-1].args[0]
+
+    @pytest.mark.asyncio
+    async def test_requires_autocommit(self, autocommit_conn):
+        """Should reject connections with an implicit transaction"""
+        autocommit_conn.autocommit = False
+
+        with pytest.raises(ValueError):
+            await migrate(autocommit_conn)
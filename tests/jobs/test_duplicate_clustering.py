@@ -0,0 +1,117 @@
+"""Tests for the offline duplicate clustering job"""
+
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from bugspotter_intelligence.db.bug_repository import BugRepository
+from bugspotter_intelligence.jobs.duplicate_clustering import (
+    UnionFind,
+    cluster_pairs,
+    find_duplicate_pairs,
+    load_embeddings,
+    tile_pairs
+)
+
+
+@pytest.fixture
+def matrix():
+    """Random unit vectors with two planted duplicate groups: {0, 7, 19} and {3, 11}"""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((25, 16)).astype(np.float32)
+    vectors[7] = vectors[0] + 0.01
+    vectors[19] = vectors[7] + 0.01
+    vectors[11] = vectors[3]
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _brute_force_pairs(matrix: np.ndarray, threshold: float) -> set[tuple[int, int]]:
+    scores = matrix @ matrix.T
+    return {(i, j) for i, j in zip(*np.nonzero(scores >= threshold)) if i < j}
+
+
+class TestUnionFind:
+    """Test suite for UnionFind"""
+
+    def test_merges_transitively(self):
+        """Should put chained pairs into one set"""
+        sets = UnionFind(6)
+        sets.union(0, 1)
+        sets.union(4, 1)
+        sets.union(2, 3)
+
+        assert sorted(sorted(c) for c in sets.components()) == [[0, 1, 4], [2, 3]]
+
+
+class TestFindDuplicatePairs:
+    """Test suite for blocked all-pairs similarity"""
+
+    def test_blocked_tiles_match_brute_force(self, matrix):
+        """Should find exactly the brute-force pairs whatever the block size"""
+        expected = _brute_force_pairs(matrix, 0.9)
+
+        for block_size in (4, 7, 25, 100):
+            pairs = np.concatenate([tile_pairs(matrix, s, block_size, 0.9) for s in range(0, 25, block_size)])
+            assert set(map(tuple, pairs.tolist())) == expected
+
+    def test_worker_processes_match_single_process(self, matrix):
+        """Should give the same pairs when tiles run in worker processes"""
+        single = find_duplicate_pairs(matrix, 0.9, block_size=8, workers=1)
+        parallel = find_duplicate_pairs(matrix, 0.9, block_size=8, workers=2)
+
+        assert set(map(tuple, parallel.tolist())) == set(map(tuple, single.tolist()))
+
+    def test_empty_matrix(self):
+        """Should return no pairs for an empty table"""
+        assert len(find_duplicate_pairs(np.empty((0, 16), dtype=np.float32), 0.9)) == 0
+
+
+class TestClusterPairs:
+    """Test suite for cluster assignment"""
+
+    def test_cluster_id_is_smallest_bug_id(self, matrix):
+        """Should label each cluster with its smallest bug_id and skip singletons"""
+        bug_ids = [f"bug-{i:02}" for i in range(25)]
+
+        clusters = cluster_pairs(bug_ids, find_duplicate_pairs(matrix, 0.9, block_size=8))
+
+        assert clusters == {
+            "bug-00": "bug-00", "bug-07": "bug-00", "bug-19": "bug-00",
+            "bug-03": "bug-03", "bug-11": "bug-03"
+        }
+
+
+def _batches(rows: list[tuple], size: int):
+    async def iter_embeddings(conn, batch_size):
+        for start in range(0, len(rows), size):
+            yield rows[start:start + size]
+    return iter_embeddings
+
+
+class TestLoadEmbeddings:
+    """Test suite for reading the embedding matrix"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("counted", [2, 4, 9])
+    async def test_fills_matrix_whatever_the_count(self, counted):
+        """Should return every streamed row, normalized, even if the count was stale"""
+        rows = [(f"bug-{i}", [float(i + 1), 0.0, 0.0], "open") for i in range(4)]
+
+        with patch.object(BugRepository, 'count_embeddings', new_callable=AsyncMock, return_value=counted), \
+                patch.object(BugRepository, 'iter_embeddings', _batches(rows, 3)):
+            bug_ids, matrix = await load_embeddings(None, batch_size=3)
+
+        assert bug_ids == ["bug-0", "bug-1", "bug-2", "bug-3"]
+        assert matrix.dtype == np.float32
+        np.testing.assert_allclose(matrix, [[1.0, 0.0, 0.0]] * 4)
+
+    @pytest.mark.asyncio
+    async def test_empty_table(self):
+        """Should return an empty matrix when there is nothing to cluster"""
+        with patch.object(BugRepository, 'count_embeddings', new_callable=AsyncMock, return_value=0), \
+                patch.object(BugRepository, 'iter_embeddings', _batches([], 3)):
+            bug_ids, matrix = await load_embeddings(None)
+
+        assert bug_ids == []
+        assert matrix.shape == (0, 0)
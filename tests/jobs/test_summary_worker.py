@@ -0,0 +1,137 @@
+"""Tests for the resolution summary worker"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from bugspotter_intelligence.config import Settings
+from bugspotter_intelligence.db.summary_job_repository import SummaryJobRepository
+from bugspotter_intelligence.jobs.summary_worker import SummaryWorker, retry_delay
+
+
+@pytest.fixture
+def pool():
+    """Pool whose connections are plain mocks"""
+    pool = MagicMock()
+
+    @asynccontextmanager
+    async def connection():
+        yield MagicMock()
+
+    pool.connection = connection
+    return pool
+
+
+@pytest.fixture
+def llm():
+    llm = MagicMock()
+    llm.generate = AsyncMock(return_value="  Added a null check.  ")
+    return llm
+
+
+@pytest.fixture
+def worker(pool, llm):
+    settings = Settings()
+    settings.summary_worker_concurrency = 2
+    settings.summary_batch_size = 1
+    settings.summary_max_attempts = 3
+    settings.summary_retry_backoff = 10.0
+    return SummaryWorker(pool, llm, settings)
+
+
+JOB = {"bug_id": "bug-005", "resolution": "Added null check in AuthService.java:42", "attempts": 1}
+
+
+def test_retry_delay_backs_off_then_gives_up():
+    """Should double the delay per attempt and stop at max_attempts"""
+    assert [retry_delay(n, 4, 10.0) for n in (1, 2, 3, 4)] == [10.0, 20.0, 40.0, None]
+
+
+class TestSummaryWorker:
+    """Test suite for SummaryWorker"""
+
+    @pytest.mark.asyncio
+    async def test_success_stores_summary(self, worker):
+        """Should store the stripped summary for the claimed resolution"""
+        with patch.object(SummaryJobRepository, 'complete', new_callable=AsyncMock) as mock_complete:
+            await worker.process(JOB)
+
+        args = mock_complete.call_args.args
+        assert args[1:] == ("bug-005", JOB["resolution"], "Added a null check.")
+
+    @pytest.mark.asyncio
+    async def test_failure_schedules_retry(self, worker, llm):
+        """Should record the error with a backoff delay"""
+        llm.generate.side_effect = RuntimeError("Ollama API error: 503")
+
+        with patch.object(SummaryJobRepository, 'fail', new_callable=AsyncMock) as mock_fail:
+            await worker.process({**JOB, "attempts": 2})
+
+        assert mock_fail.call_args.args[1:] == ("bug-005", JOB["resolution"], "Ollama API error: 503", 20.0)
+
+    @pytest.mark.asyncio
+    async def test_last_attempt_marks_failed(self, worker, llm):
+        """Should give up after max_attempts"""
+        llm.generate.side_effect = RuntimeError("timeout")
+
+        with patch.object(SummaryJobRepository, 'fail', new_callable=AsyncMock) as mock_fail:
+            await worker.process({**JOB, "attempts": 3})
+
+        assert mock_fail.call_args.args[-1] is None
+
+    @pytest.mark.asyncio
+    async def test_claims_only_free_slots(self, worker, llm):
+        """Should never run more than `concurrency` summaries at once"""
+        release = asyncio.Event()
+
+        async def slow_generate(**kwargs):
+            await release.wait()
+            return "Summary"
+
+        llm.generate = AsyncMock(side_effect=slow_generate)
+        jobs = [{**JOB, "bug_id": f"bug-{i}"} for i in range(2)]
+
+        with patch.object(SummaryJobRepository, 'claim', new_callable=AsyncMock, return_value=jobs) as mock_claim, \
+                patch.object(SummaryJobRepository, 'complete', new_callable=AsyncMock):
+            assert await worker.run_once() == 2
+            assert await worker.run_once() == 0
+            assert mock_claim.call_args.args[1] == 2
+            assert mock_claim.call_count == 1
+
+            release.set()
+            await worker.stop()
+
+    @pytest.mark.asyncio
+    async def test_packs_jobs_into_one_call(self, worker, llm):
+        """Should summarize a batch of jobs with one LLM call"""
+        worker.batch_size = 3
+        llm.generate = AsyncMock(return_value='["Null check.", "Bigger pool.", "Pinned urllib3."]')
+        jobs = [{**JOB, "bug_id": f"bug-{i}"} for i in range(3)]
+
+        with patch.object(SummaryJobRepository, 'claim', new_callable=AsyncMock, return_value=jobs) as mock_claim, \
+                patch.object(SummaryJobRepository, 'complete', new_callable=AsyncMock) as mock_complete:
+            assert await worker.run_once() == 3
+            await asyncio.gather(*worker._running)
+
+        assert mock_claim.call_args.args[1] == 6  # 2 free slots x 3 per call
+        llm.generate.assert_awaited_once()
+        assert [c.args[1:] for c in mock_complete.call_args_list] == [
+            ("bug-0", JOB["resolution"], "Null check."),
+            ("bug-1", JOB["resolution"], "Bigger pool."),
+            ("bug-2", JOB["resolution"], "Pinned urllib3.")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unparsed_batch_falls_back_to_single_jobs(self, worker, llm):
+        """Should summarize jobs one by one when the packed answer can't be used"""
+        llm.generate = AsyncMock(side_effect=["not json", "Summary A", "Summary B"])
+        jobs = [{**JOB, "bug_id": f"bug-{i}"} for i in range(2)]
+
+        with patch.object(SummaryJobRepository, 'complete', new_callable=AsyncMock) as mock_complete:
+            await worker.process_batch(jobs)
+
+        assert llm.generate.await_count == 3
+        assert [c.args[-1] for c in mock_complete.call_args_list] == ["Summary A", "Summary B"]
+
@@ -0,0 +1,43 @@
+"""Tests for the tiering job"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from bugspotter_intelligence.db.archive_repository import ArchiveRepository
+from bugspotter_intelligence.db.bug_repository import BugRepository
+from bugspotter_intelligence.jobs.tiering import archive_cold_bugs, demote_stale_bugs, format_storage_report
+
+
+@pytest.mark.asyncio
+async def test_demotes_in_batches_until_done():
+    """Should keep moving batches until a batch moves nothing"""
+    with patch.object(BugRepository, 'demote_stale_bugs', new_callable=AsyncMock,
+                      side_effect=[1000, 250, 0]) as mock_demote:
+        total = await demote_stale_bugs(AsyncMock(), months=6, batch_size=1000)
+
+    assert total == 1250
+    assert mock_demote.call_count == 3
+    assert mock_demote.call_args.args[1:] == (6, 1000)
+
+
+@pytest.mark.asyncio
+async def test_archives_in_batches_until_done():
+    """Should keep archiving batches until a batch moves nothing"""
+    with patch.object(ArchiveRepository, 'archive_cold_bugs', new_callable=AsyncMock,
+                      side_effect=[500, 20, 0]) as mock_archive:
+        total = await archive_cold_bugs(AsyncMock(), months=12, batch_size=500)
+
+    assert total == 520
+    assert mock_archive.call_args.args[1:] == (12, 500)
+
+
+def test_storage_report_shows_savings():
+    """Should report how much smaller archive rows are"""
+    report = format_storage_report([
+        {"tier": "hot", "rows": 100, "total_bytes": 400_000, "bytes_per_row": 4000.0},
+        {"tier": "cold", "rows": 0, "total_bytes": 8192, "bytes_per_row": 0.0},
+        {"tier": "archive", "rows": 100, "total_bytes": 100_000, "bytes_per_row": 1000.0},
+    ])
+
+    assert "4.0x smaller" in report
@@ -0,0 +1,66 @@
+import threading
+import time
+from typing import Callable
+
+import pytest
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+
+class StubLLMServer:
+    """
+    Local HTTP server standing in for the Anthropic and OpenAI APIs
+
+    Tests set `reply` to a function from the request body to a response
+    and read back what was sent from `requests`.
+    """
+
+    def __init__(self):
+        self.requests: list[tuple[str, dict]] = []
+        self.reply: Callable[[dict], Response] = lambda body: JSONResponse({})
+
+        app = FastAPI()
+
+        @app.post("/v1/messages")
+        @app.post("/v1/chat/completions")
+        async def handle(request: Request) -> Response:
+            body = await request.json()
+            self.requests.append((request.url.path, body))
+            return self.reply(body)
+
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        port = self.server.servers[0].sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    def start(self) -> None:
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Stub LLM server did not start")
+            time.sleep(0.01)
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join()
+
+
+@pytest.fixture(scope="module")
+def _stub_server():
+    server = StubLLMServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def stub_server(_stub_server):
+    """The module's stub server, with requests and reply reset"""
+    _stub_server.requests.clear()
+    _stub_server.reply = lambda body: JSONResponse({})
+    return _stub_server
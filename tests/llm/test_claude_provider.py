@@ -0,0 +1,102 @@
+import json
+
+import pytest
+from fastapi.responses import JSONResponse, Response
+from bugspotter_intelligence.config import Settings
+from bugspotter_intelligence.llm import LLMOverloadedError
+from bugspotter_intelligence.llm.claude import ClaudeProvider
+
+MESSAGE = {
+    "id": "msg_01",
+    "type": "message",
+    "role": "assistant",
+    "model": "claude-sonnet-4-20250514",
+    "content": [{"type": "text", "text": "Add a null check."}],
+    "stop_reason": "end_turn",
+    "stop_sequence": None,
+    "usage": {"input_tokens": 12, "output_tokens": 5}
+}
+
+
+def _sse(*events: dict) -> str:
+    return "".join(f"event: {e['type']}\ndata: {json.dumps(e)}\n\n" for e in events)
+
+
+STREAM = _sse(
+    {"type": "message_start", "message": {**MESSAGE, "content": [], "usage": {"input_tokens": 12, "output_tokens": 0}}},
+    {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+    {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "Add a "}},
+    {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "null check."}},
+    {"type": "content_block_stop", "index": 0},
+    {"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None}, "usage": {"output_tokens": 5}},
+    {"type": "message_stop"}
+)
+
+
+@pytest.fixture
+def claude_provider(stub_server):
+    """ClaudeProvider talking to the local stub server"""
+    settings = Settings()
+    settings.anthropic_api_key = "test-key"
+    settings.anthropic_base_url = stub_server.url
+    settings.llm_api_max_retries = 0
+    return ClaudeProvider(settings)
+
+
+class TestClaudeProvider:
+    """Tests against a stub Messages API"""
+
+    def test_requires_api_key(self):
+        """Should refuse to start without an API key"""
+        settings = Settings()
+        settings.anthropic_api_key = None
+
+        with pytest.raises(ValueError, match="ANTHROPIC_API_KEY"):
+            ClaudeProvider(settings)
+
+    @pytest.mark.asyncio
+    async def test_generate_records_usage(self, claude_provider, stub_server):
+        """Should send the prompt with context and count reported tokens"""
+        stub_server.reply = lambda body: JSONResponse(MESSAGE)
+
+        response = await claude_provider.generate(
+            "How to fix?", context=["NPE in login"], temperature=0.3, max_tokens=50
+        )
+
+        assert response == "Add a null check."
+        path, body = stub_server.requests[0]
+        assert path == "/v1/messages"
+        assert body["model"] == "claude-sonnet-4-20250514"
+        assert body["max_tokens"] == 50
+        assert body["temperature"] == 0.3
+        assert "NPE in login" in body["messages"][0]["content"]
+        assert claude_provider.usage.as_dict() == {"requests": 1, "input_tokens": 12, "output_tokens": 5}
+        await claude_provider.close()
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_deltas(self, claude_provider, stub_server):
+        """Should yield text deltas and record usage when the stream ends"""
+        stub_server.reply = lambda body: Response(STREAM, media_type="text/event-stream")
+
+        chunks = [chunk async for chunk in claude_provider.stream("How to fix?")]
+
+        assert chunks == ["Add a ", "null check."]
+        assert stub_server.requests[0][1]["stream"] is True
+        assert claude_provider.usage.as_dict() == {"requests": 1, "input_tokens": 12, "output_tokens": 5}
+        await claude_provider.close()
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_maps_to_overloaded(self, claude_provider, stub_server):
+        """Should surface a 429 as LLMOverloadedError with the server's Retry-After"""
+        stub_server.reply = lambda body: JSONResponse(
+            {"type": "error", "error": {"type": "rate_limit_error", "message": "slow down"}},
+            status_code=429,
+            headers={"retry-after": "7"}
+        )
+
+        with pytest.raises(LLMOverloadedError) as exc_info:
+            await claude_provider.generate("Hi")
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.retry_after == 7
+        await claude_provider.close()
@@ -3,6 +3,7 @@ from bugspotter_intelligence.config import Settings
 from bugspotter_intelligence.llm import (
     create_llm_provider,
     list_providers,
+    ClaudeProvider,
     OllamaProvider
 )
 
@@ -15,6 +16,8 @@ class TestLLMFactory:
         providers = list_providers()
         assert isinstance(providers, list)
         assert "ollama" in providers
+        assert "claude" in providers
+        assert "openai" in providers
 
     def test_create_ollama_provider(self):
         """Test creating Ollama provider"""
@@ -24,6 +27,15 @@ class TestLLMFactory:
         provider = create_llm_provider(settings)
         assert isinstance(provider, OllamaProvider)
 
+    def test_create_claude_provider(self):
+        """Test creating Claude provider"""
+        settings = Settings()
+        settings.llm_provider = "claude"
+        settings.anthropic_api_key = "test-key"
+
+        provider = create_llm_provider(settings)
+        assert isinstance(provider, ClaudeProvider)
+
     def test_invalid_provider(self):
         """Test error for invalid provider"""
         settings = Settings()
@@ -1,6 +1,11 @@
+import asyncio
+import json
+
+import httpx
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from bugspotter_intelligence.config import Settings
+from bugspotter_intelligence.llm.base import SYSTEM_PROMPT
 from bugspotter_intelligence.llm.ollama import OllamaProvider
 
 
@@ -27,13 +32,12 @@ class TestOllamaProviderUnit:
     @pytest.mark.asyncio
     async def test_generate_simple_mocked(self, ollama_provider):
         """Test simple generation (mocked HTTP call)"""
-        with patch('httpx.AsyncClient') as mock_client:
+        with patch.object(ollama_provider.client, 'post', new_callable=AsyncMock) as mock_post:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {"response": "Hello!"}
 
-            mock_post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = mock_post
+            mock_post.return_value = mock_response
 
             response = await ollama_provider.generate(
                 prompt="Say hello",
@@ -46,15 +50,14 @@ class TestOllamaProviderUnit:
     @pytest.mark.asyncio
     async def test_generate_with_context_mocked(self, ollama_provider):
         """Test generation with context (mocked)"""
-        with patch('httpx.AsyncClient') as mock_client:
+        with patch.object(ollama_provider.client, 'post', new_callable=AsyncMock) as mock_post:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {
                 "response": "The common issue is null pointer errors."
             }
 
-            mock_post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = mock_post
+            mock_post.return_value = mock_response
 
             context = [
                 "Bug #1: Null pointer in login",
@@ -73,7 +76,7 @@ class TestOllamaProviderUnit:
     @pytest.mark.asyncio
     async def test_error_handling(self, ollama_provider):
         """Test error handling for API failures"""
-        with patch('httpx.AsyncClient') as mock_client:
+        with patch.object(ollama_provider.client, 'post', new_callable=AsyncMock) as mock_post:
             mock_response = MagicMock()
             mock_response.status_code = 500
             mock_response.text = "Internal Server Error"
@@ -86,14 +89,157 @@ class TestOllamaProviderUnit:
                 response=mock_response
             )
 
-            mock_post = AsyncMock(return_value=mock_response)
-            mock_client.return_value.__aenter__.return_value.post = mock_post
+            mock_post.return_value = mock_response
 
             with pytest.raises(Exception) as exc_info:
                 await ollama_provider.generate("test")
 
             assert "500" in str(exc_info.value)
 
+    def test_timeout_and_pool_from_settings(self):
+        """Should configure the shared client from Settings"""
+        settings = Settings(ollama_timeout=30.0, ollama_max_connections=4)
+        provider = OllamaProvider(settings)
+
+        assert provider.API_TIMEOUT == 30.0
+        assert provider.client.timeout.read == 30.0
+        assert provider.client.base_url == settings.ollama_base_url
+
+    @pytest.mark.asyncio
+    async def test_client_reused_across_calls(self, ollama_provider):
+        """Should send every request through the same pooled client"""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"response": "ok"}
+
+        with patch.object(ollama_provider.client, 'post', new_callable=AsyncMock) as mock_post:
+            mock_post.return_value = mock_response
+            client = ollama_provider.client
+
+            await ollama_provider.generate("one")
+            await ollama_provider.generate("two")
+
+            assert mock_post.call_count == 2
+            assert ollama_provider.client is client
+            assert mock_post.call_args.args[0] == "/api/generate"
+
+    @pytest.mark.asyncio
+    async def test_close(self, ollama_provider):
+        """Should close the pooled client on shutdown"""
+        await ollama_provider.close()
+
+        assert ollama_provider.client.is_closed
+
+
+def _ndjson_transport(chunks: list[dict], status_code: int = 200) -> httpx.MockTransport:
+    """Transport answering /api/generate with NDJSON chunks"""
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["stream"] is True
+        body = "".join(json.dumps(chunk) + "\n" for chunk in chunks)
+        return httpx.Response(status_code, content=body.encode())
+
+    return httpx.MockTransport(handler)
+
+
+class TestOllamaStreaming:
+    """Unit tests for token streaming (mocked transport)"""
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_tokens(self, ollama_provider):
+        """Should yield each response chunk until done"""
+        ollama_provider.client = httpx.AsyncClient(
+            base_url="http://ollama",
+            transport=_ndjson_transport([
+                {"response": "Add ", "done": False},
+                {"response": "a null check", "done": False},
+                {"response": "", "done": True}
+            ])
+        )
+
+        tokens = [token async for token in ollama_provider.stream("Fix?")]
+
+        assert tokens == ["Add ", "a null check"]
+
+    @pytest.mark.asyncio
+    async def test_stream_error_chunk_raises(self, ollama_provider):
+        """Should raise when Ollama reports an error mid-stream"""
+        ollama_provider.client = httpx.AsyncClient(
+            base_url="http://ollama",
+            transport=_ndjson_transport([{"response": "Add", "done": False}, {"error": "model unloaded"}])
+        )
+
+        with pytest.raises(Exception, match="model unloaded"):
+            _ = [token async for token in ollama_provider.stream("Fix?")]
+
+    @pytest.mark.asyncio
+    async def test_stream_http_error_raises(self, ollama_provider):
+        """Should raise with the status code on HTTP errors"""
+        ollama_provider.client = httpx.AsyncClient(
+            base_url="http://ollama",
+            transport=_ndjson_transport([{"error": "not found"}], status_code=404)
+        )
+
+        with pytest.raises(Exception, match="404"):
+            _ = [token async for token in ollama_provider.stream("Fix?")]
+
+
+class TestOllamaResidency:
+    """Unit tests for keep_alive, warm-up and the stable prompt prefix (mocked transport)"""
+
+    @staticmethod
+    def _recording_client(requests: list) -> httpx.AsyncClient:
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, json={"response": "ok", "done": True})
+
+        return httpx.AsyncClient(base_url="http://ollama", transport=httpx.MockTransport(handler))
+
+    @pytest.mark.asyncio
+    async def test_payload_has_stable_prefix_and_keep_alive(self, settings):
+        """Should send the fixed system prompt separately and ask Ollama to keep the model loaded"""
+        settings.ollama_keep_alive = "-1"
+        provider = OllamaProvider(settings)
+        requests = []
+        provider.client = self._recording_client(requests)
+
+        await provider.generate("How to fix?", context=["NPE in login"])
+        await provider.generate("Other question")
+
+        assert requests[0]["system"] == requests[1]["system"] == SYSTEM_PROMPT
+        assert requests[0]["prompt"].startswith("Context 1:\nNPE in login")
+        assert requests[1]["prompt"] == "Other question"
+        assert requests[0]["keep_alive"] == -1
+
+    @pytest.mark.asyncio
+    async def test_warm_up_loads_and_keeps_model_warm(self, settings):
+        """Should load the model at startup and again after each idle interval"""
+        settings.ollama_keep_warm_interval = 0.02
+        provider = OllamaProvider(settings)
+        requests = []
+        provider.client = self._recording_client(requests)
+
+        await provider.warm_up()
+        await asyncio.sleep(0.07)
+        await provider.close()
+
+        assert len(requests) >= 2
+        assert requests[0] == {"model": settings.ollama_model, "keep_alive": "30m", "stream": False}
+
+    @pytest.mark.asyncio
+    async def test_warm_up_survives_ollama_down(self, settings):
+        """Should log and carry on when Ollama can't be reached"""
+        settings.ollama_keep_warm_interval = 0
+        provider = OllamaProvider(settings)
+
+        def refuse(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused")
+
+        provider.client = httpx.AsyncClient(base_url="http://ollama", transport=httpx.MockTransport(refuse))
+
+        await provider.warm_up()
+        await provider._keep_warm_task
+
+        await provider.close()
+
 
 @pytest.mark.integration
 class TestOllamaProviderIntegration:
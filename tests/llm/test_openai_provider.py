@@ -0,0 +1,88 @@
+import json
+
+import pytest
+from fastapi.responses import JSONResponse, Response
+from bugspotter_intelligence.config import Settings
+from bugspotter_intelligence.llm.openai_provider import OpenAIProvider
+
+USAGE = {"prompt_tokens": 12, "completion_tokens": 5, "total_tokens": 17}
+
+COMPLETION = {
+    "id": "chatcmpl-1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4",
+    "choices": [{
+        "index": 0,
+        "message": {"role": "assistant", "content": "Add a null check."},
+        "finish_reason": "stop"
+    }],
+    "usage": USAGE
+}
+
+
+def _chunk(content=None, usage=None) -> str:
+    choices = [] if content is None else [{"index": 0, "delta": {"content": content}, "finish_reason": None}]
+    chunk = {"id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4",
+             "choices": choices, "usage": usage}
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+STREAM = _chunk("Add a ") + _chunk("null check.") + _chunk(usage=USAGE) + "data: [DONE]\n\n"
+
+
+@pytest.fixture
+def openai_provider(stub_server):
+    """OpenAIProvider talking to the local stub server"""
+    settings = Settings()
+    settings.openai_api_key = "test-key"
+    settings.openai_base_url = f"{stub_server.url}/v1"
+    settings.llm_api_max_retries = 0
+    return OpenAIProvider(settings)
+
+
+class TestOpenAIProvider:
+    """Tests against a stub Chat Completions API"""
+
+    @pytest.mark.asyncio
+    async def test_generate_records_usage(self, openai_provider, stub_server):
+        """Should send the prompt with context and count reported tokens"""
+        stub_server.reply = lambda body: JSONResponse(COMPLETION)
+
+        response = await openai_provider.generate("How to fix?", context=["NPE in login"], max_tokens=50)
+
+        assert response == "Add a null check."
+        path, body = stub_server.requests[0]
+        assert path == "/v1/chat/completions"
+        assert body["model"] == "gpt-4"
+        assert body["max_tokens"] == 50
+        assert body["messages"][0]["role"] == "system"
+        assert "NPE in login" in body["messages"][1]["content"]
+        assert openai_provider.usage.as_dict() == {"requests": 1, "input_tokens": 12, "output_tokens": 5}
+        await openai_provider.close()
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_deltas(self, openai_provider, stub_server):
+        """Should yield content deltas and record usage from the final chunk"""
+        stub_server.reply = lambda body: Response(STREAM, media_type="text/event-stream")
+
+        chunks = [chunk async for chunk in openai_provider.stream("How to fix?")]
+
+        assert chunks == ["Add a ", "null check."]
+        body = stub_server.requests[0][1]
+        assert body["stream"] is True
+        assert body["stream_options"] == {"include_usage": True}
+        assert openai_provider.usage.as_dict() == {"requests": 1, "input_tokens": 12, "output_tokens": 5}
+        await openai_provider.close()
+
+    @pytest.mark.asyncio
+    async def test_api_error_is_wrapped(self, openai_provider, stub_server):
+        """Should raise a plain error naming the API on other failures"""
+        stub_server.reply = lambda body: JSONResponse(
+            {"error": {"message": "bad model", "type": "invalid_request_error"}},
+            status_code=400
+        )
+
+        with pytest.raises(Exception, match="OpenAI API error: 400"):
+            await openai_provider.generate("Hi")
+        await openai_provider.close()
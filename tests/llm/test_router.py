@@ -0,0 +1,282 @@
+"""Tests for routing across LLM backends"""
+
+import asyncio
+from typing import Optional
+
+import pytest
+
+from bugspotter_intelligence.config import Settings
+from bugspotter_intelligence.llm import (
+    CircuitBreaker,
+    LLMOverloadedError,
+    LLMProvider,
+    LLMScheduler,
+    OllamaProvider,
+    RouterProvider,
+    create_llm_provider
+)
+
+
+class FakeBackend(LLMProvider):
+    """Backend that answers with its name, optionally after a gate or with an error"""
+
+    def __init__(self, settings, name: str):
+        super().__init__(settings)
+        self.name = name
+        self.calls = 0
+        self.error: Optional[Exception] = None
+        self.gate: Optional[asyncio.Event] = None
+        self.healthy = True
+
+    async def generate(self, prompt, context=None, temperature=0.7, max_tokens=1000) -> str:
+        self.calls += 1
+        if self.gate:
+            await self.gate.wait()
+        if self.error:
+            raise self.error
+        return self.name
+
+    async def stream(self, prompt, context=None, temperature=0.7, max_tokens=1000):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        for part in (self.name, "!"):
+            yield part
+
+    async def ping(self) -> None:
+        if not self.healthy:
+            raise ConnectionError("refused")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def settings():
+    settings = Settings()
+    settings.llm_breaker_failures = 2
+    settings.llm_breaker_reset = 30.0
+    settings.llm_health_interval = 0
+    return settings
+
+
+@pytest.fixture
+def backends(settings):
+    return {"a": FakeBackend(settings, "a"), "b": FakeBackend(settings, "b")}
+
+
+class TestCircuitBreaker:
+    """Test suite for CircuitBreaker"""
+
+    def test_opens_then_allows_one_trial(self):
+        """Should open after the threshold and let a single trial through after the reset timeout"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+
+        breaker.failure()
+        assert breaker.allows()
+        breaker.failure()
+        assert breaker.state == "open" and not breaker.allows()
+
+        clock.now = 30
+        assert breaker.state == "half_open"
+        breaker.begin()
+        assert not breaker.allows()
+
+        breaker.failure()
+        assert breaker.state == "open"
+        assert breaker.retry_in() == 30
+
+        clock.now = 60
+        breaker.begin()
+        breaker.success()
+        assert breaker.state == "closed"
+
+
+class TestRouterProvider:
+    """Test suite for RouterProvider"""
+
+    @pytest.mark.asyncio
+    async def test_least_outstanding_backend(self, settings, backends):
+        """Should send a call to the backend with fewer calls in flight"""
+        router = RouterProvider(settings, backends)
+        backends["a"].gate = backends["b"].gate = gate = asyncio.Event()
+
+        first = asyncio.create_task(router.generate("one"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(router.generate("two"))
+        await asyncio.sleep(0)
+        gate.set()
+
+        assert sorted(await asyncio.gather(first, second)) == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_fails_over_and_opens_breaker(self, settings, backends):
+        """Should retry a failed call on another backend and stop using one that keeps failing"""
+        router = RouterProvider(settings, backends)
+        backends["a"].error = RuntimeError("Ollama API error: 500")
+
+        results = [await router.generate("q") for _ in range(4)]
+
+        assert results == ["b"] * 4
+        assert backends["a"].calls == 2
+        assert router.stats()["backends"][0]["state"] == "open"
+
+    @pytest.mark.asyncio
+    async def test_no_backend_available(self, settings, backends):
+        """Should raise LLMOverloadedError when every breaker is open"""
+        router = RouterProvider(settings, backends)
+        for backend in router.backends:
+            backend.breaker.trip()
+
+        with pytest.raises(LLMOverloadedError) as exc_info:
+            await router.generate("q")
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.retry_after == 30
+
+    @pytest.mark.asyncio
+    async def test_all_backends_fail(self, settings, backends):
+        """Should raise the last backend error when every backend fails"""
+        router = RouterProvider(settings, backends)
+        for backend in backends.values():
+            backend.error = RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await router.generate("q")
+
+    @pytest.mark.asyncio
+    async def test_hedges_slow_call(self, settings, backends):
+        """Should send a call still running after the p95 latency to a second backend"""
+        settings.llm_hedge_enabled = True
+        router = RouterProvider(settings, backends)
+        router._latencies.extend([0.01] * 20)
+        backends["a"].gate = asyncio.Event()  # First in rotation, and hangs
+
+        assert await router.generate("q") == "b"
+        assert router.hedged_calls == 1
+        await asyncio.sleep(0)
+        assert router.backends[0].outstanding == 0
+        assert router.backends[0].breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_hedge_takes_a_scheduler_slot(self, settings, backends):
+        """Should hold a second scheduler slot while the hedge runs, and free it after"""
+        settings.llm_hedge_enabled = True
+        router = RouterProvider(settings, backends)
+        router.scheduler = LLMScheduler(max_concurrency=2, max_queue=10, queue_timeout=5.0)
+        router._latencies.extend([0.01] * 20)
+        backends["a"].gate = asyncio.Event()
+        backends["b"].gate = asyncio.Event()
+
+        await router.scheduler.acquire()  # The slot the primary call holds
+        call = asyncio.create_task(router.generate("q"))
+        await asyncio.sleep(0.05)
+        assert router.hedged_calls == 1
+        assert router.scheduler.stats()["running"] == 2
+
+        backends["b"].gate.set()
+        assert await call == "b"
+        await asyncio.sleep(0)
+        assert router.scheduler.stats()["running"] == 1
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_a_free_slot(self, settings, backends):
+        """Should not hedge when the scheduler has no slot free"""
+        settings.llm_hedge_enabled = True
+        router = RouterProvider(settings, backends)
+        router.scheduler = LLMScheduler(max_concurrency=1, max_queue=10, queue_timeout=5.0)
+        router._latencies.extend([0.01] * 20)
+        backends["a"].gate = asyncio.Event()
+
+        await router.scheduler.acquire()
+        call = asyncio.create_task(router.generate("q"))
+        await asyncio.sleep(0.05)
+        backends["a"].gate.set()
+
+        assert await call == "a"
+        assert router.hedged_calls == 0
+        assert backends["b"].calls == 0
+
+    @pytest.mark.asyncio
+    async def test_background_view_never_hedges(self, settings, backends):
+        """Should not hedge calls made through without_hedging()"""
+        settings.llm_hedge_enabled = True
+        router = RouterProvider(settings, backends)
+        router._latencies.extend([0.001] * 20)
+        gate = asyncio.Event()
+        backends["a"].gate = backends["b"].gate = gate
+
+        call = asyncio.create_task(router.without_hedging().generate("q"))
+        await asyncio.sleep(0.05)
+        gate.set()
+        await call
+
+        assert router.hedged_calls == 0
+        assert backends["a"].calls + backends["b"].calls == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_fails_over_before_first_chunk(self, settings, backends):
+        """Should move a stream to another backend if it fails before yielding"""
+        router = RouterProvider(settings, backends)
+        backends["a"].error = RuntimeError("connection refused")
+
+        chunks = [chunk async for chunk in router.stream("q")]
+
+        assert chunks == ["b", "!"]
+
+    @pytest.mark.asyncio
+    async def test_failed_health_check_trips_breaker(self, settings, backends):
+        """Should take a backend that fails its health check out of rotation"""
+        settings.llm_health_interval = 1
+        router = RouterProvider(settings, backends)
+        backends["a"].healthy = False
+
+        await asyncio.gather(*(router._check(backend) for backend in router.backends))
+
+        assert [b.breaker.state for b in router.backends] == ["open", "closed"]
+        assert await router.generate("q") == "b"
+        await router.close()
+
+    @pytest.mark.asyncio
+    async def test_passed_health_check_closes_breaker(self, settings, backends):
+        """Should put a tripped backend back in rotation once its health check passes"""
+        settings.llm_health_interval = 1
+        router = RouterProvider(settings, backends)
+        backends["a"].healthy = False
+        await router._check(router.backends[0])
+        assert router.backends[0].breaker.state == "open"
+
+        backends["a"].healthy = True
+        await router._check(router.backends[0])
+
+        assert router.backends[0].breaker.state == "closed"
+        assert router.backends[0].breaker.allows()
+
+    @pytest.mark.asyncio
+    async def test_passed_health_check_keeps_call_failures(self, settings, backends):
+        """Should not reset the failure count of a closed breaker on a passing ping"""
+        settings.llm_health_interval = 1
+        router = RouterProvider(settings, backends)
+        router.backends[0].breaker.failure()
+
+        await router._check(router.backends[0])
+
+        assert router.backends[0].breaker.failures == 1
+
+    def test_factory_builds_router(self, settings):
+        """Should route across OLLAMA_BASE_URLS when set"""
+        settings.llm_provider = "ollama"
+        settings.ollama_base_urls = "http://gpu-1:11434, http://gpu-2:11434"
+
+        router = create_llm_provider(settings)
+
+        assert isinstance(router, RouterProvider)
+        assert [b.name for b in router.backends] == ["http://gpu-1:11434", "http://gpu-2:11434"]
+        assert all(isinstance(b.provider, OllamaProvider) for b in router.backends)
+        assert all(b.provider.usage is router.usage for b in router.backends)
@@ -0,0 +1,91 @@
+"""Tests for LLM admission control"""
+
+import asyncio
+
+import pytest
+
+from bugspotter_intelligence.llm import LLMOverloadedError, LLMScheduler, Priority
+
+
+async def _hold(scheduler: LLMScheduler, priority: Priority, started: list, name: str, release: asyncio.Event):
+    async with scheduler.slot(priority):
+        started.append(name)
+        await release.wait()
+
+
+class TestLLMScheduler:
+    """Test suite for LLMScheduler"""
+
+    @pytest.mark.asyncio
+    async def test_interactive_runs_before_background(self):
+        """Should hand a freed slot to interactive calls before earlier background ones"""
+        scheduler = LLMScheduler(max_concurrency=1, max_queue=10, queue_timeout=5)
+        started, release = [], asyncio.Event()
+
+        tasks = [asyncio.create_task(_hold(scheduler, Priority.INTERACTIVE, started, "first", release))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(_hold(scheduler, Priority.BACKGROUND, started, "summary", release)))
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(_hold(scheduler, Priority.INTERACTIVE, started, "ask", release)))
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert started == ["first", "ask", "summary"]
+        assert scheduler.stats() == {"running": 0, "waiting_interactive": 0, "waiting_background": 0}
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_with_429(self):
+        """Should reject interactive calls at once when the queue is full"""
+        scheduler = LLMScheduler(max_concurrency=1, max_queue=1, queue_timeout=5)
+        started, release = [], asyncio.Event()
+        tasks = [asyncio.create_task(_hold(scheduler, Priority.INTERACTIVE, started, n, release)) for n in "ab"]
+        await asyncio.sleep(0)
+
+        with pytest.raises(LLMOverloadedError) as exc_info:
+            await scheduler.acquire(Priority.INTERACTIVE)
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.retry_after >= 1
+
+        # Background work is never rejected
+        background = asyncio.create_task(_hold(scheduler, Priority.BACKGROUND, started, "summary", release))
+        release.set()
+        await asyncio.gather(*tasks, background)
+        assert started == ["a", "b", "summary"]
+
+    @pytest.mark.asyncio
+    async def test_queue_deadline_gives_503(self):
+        """Should fail an interactive call that waits past queue_timeout"""
+        scheduler = LLMScheduler(max_concurrency=1, max_queue=10, queue_timeout=0.01)
+        started, release = [], asyncio.Event()
+        holder = asyncio.create_task(_hold(scheduler, Priority.INTERACTIVE, started, "a", release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(LLMOverloadedError) as exc_info:
+            await scheduler.acquire(Priority.INTERACTIVE)
+
+        assert exc_info.value.status_code == 503
+        release.set()
+        await holder
+        # The timed-out waiter didn't keep a slot
+        assert scheduler.stats()["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_its_place(self):
+        """Should pass the slot on when a waiting caller goes away"""
+        scheduler = LLMScheduler(max_concurrency=1, max_queue=10, queue_timeout=5)
+        started, release = [], asyncio.Event()
+        holder = asyncio.create_task(_hold(scheduler, Priority.INTERACTIVE, started, "a", release))
+        await asyncio.sleep(0)
+        leaving = asyncio.create_task(_hold(scheduler, Priority.INTERACTIVE, started, "gone", release))
+        staying = asyncio.create_task(_hold(scheduler, Priority.INTERACTIVE, started, "b", release))
+        await asyncio.sleep(0)
+
+        leaving.cancel()
+        release.set()
+        await asyncio.gather(holder, staying)
+
+        assert started == ["a", "b"]
+        assert scheduler.stats()["running"] == 0
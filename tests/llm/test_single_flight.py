@@ -0,0 +1,146 @@
+"""Tests for single-flight coalescing of LLM requests"""
+
+import asyncio
+from typing import Optional
+
+import pytest
+
+from bugspotter_intelligence.config import Settings
+from bugspotter_intelligence.llm import LLMProvider, SingleFlightLLMProvider
+
+
+class GatedProvider(LLMProvider):
+    """Provider whose generations finish when the test releases them"""
+
+    def __init__(self):
+        super().__init__(Settings())
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.chunk_ready = asyncio.Event()
+        self.error: Optional[Exception] = None
+
+    async def generate(self, prompt, context=None, temperature=0.7, max_tokens=1000) -> str:
+        self.calls += 1
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return f"answer to {prompt}"
+
+    async def stream(self, prompt, context=None, temperature=0.7, max_tokens=1000):
+        self.calls += 1
+        yield "first "
+        self.chunk_ready.set()
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        yield "second"
+
+
+@pytest.fixture
+def inner():
+    return GatedProvider()
+
+
+@pytest.fixture
+def provider(inner):
+    return SingleFlightLLMProvider(inner, "llama3.1:8b")
+
+
+class TestSingleFlightGenerate:
+    """Test suite for coalesced generate()"""
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_share_one_call(self, provider, inner):
+        """Should call the provider once for concurrent identical requests"""
+        waiters = [asyncio.create_task(provider.generate("Fix?", ["ctx"], 0.3, 300)) for _ in range(5)]
+        await asyncio.sleep(0)
+        inner.release.set()
+
+        assert await asyncio.gather(*waiters) == ["answer to Fix?"] * 5
+        assert inner.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_different_parameters_not_shared(self, provider, inner):
+        """Should generate separately when any key part differs"""
+        inner.release.set()
+
+        await asyncio.gather(
+            provider.generate("Fix?", temperature=0.3),
+            provider.generate("Fix?", temperature=0.7),
+            provider.generate("Fix?", context=["other"], temperature=0.3)
+        )
+
+        assert inner.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_error_reaches_all_waiters(self, provider, inner):
+        """Should raise the shared failure in every waiter"""
+        inner.error = RuntimeError("Ollama API error: 500")
+        waiters = [asyncio.create_task(provider.generate("Fix?")) for _ in range(3)]
+        await asyncio.sleep(0)
+        inner.release.set()
+
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self, provider, inner):
+        """Should keep generating for the remaining waiters"""
+        leaving = asyncio.create_task(provider.generate("Fix?"))
+        staying = asyncio.create_task(provider.generate("Fix?"))
+        await asyncio.sleep(0)
+
+        leaving.cancel()
+        await asyncio.sleep(0)
+        inner.release.set()
+
+        assert await staying == "answer to Fix?"
+        assert inner.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_nothing_kept_after_completion(self, provider, inner):
+        """Should start a new generation once the previous one finished"""
+        inner.release.set()
+
+        await provider.generate("Fix?")
+        await provider.generate("Fix?")
+
+        assert inner.calls == 2
+
+
+class TestSingleFlightStream:
+    """Test suite for coalesced stream()"""
+
+    @pytest.mark.asyncio
+    async def test_late_joiner_gets_every_chunk(self, provider, inner):
+        """Should replay earlier chunks to a caller joining mid-stream"""
+        async def collect():
+            return [chunk async for chunk in provider.stream("Fix?")]
+
+        first = asyncio.create_task(collect())
+        await inner.chunk_ready.wait()
+        second = asyncio.create_task(collect())
+        await asyncio.sleep(0)
+        inner.release.set()
+
+        assert await first == await second == ["first ", "second"]
+        assert inner.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_error_reaches_all_subscribers(self, provider, inner):
+        """Should raise the failure after the chunks already sent"""
+        inner.error = RuntimeError("connection reset")
+
+        async def collect():
+            chunks = []
+            with pytest.raises(RuntimeError):
+                async for chunk in provider.stream("Fix?"):
+                    chunks.append(chunk)
+            return chunks
+
+        subscribers = [asyncio.create_task(collect()) for _ in range(2)]
+        await inner.chunk_ready.wait()
+        inner.release.set()
+
+        assert await asyncio.gather(*subscribers) == [["first "], ["first "]]
@@ -14,6 +14,8 @@ def mock_settings():
     settings.similarity_threshold = 0.75
     settings.duplicate_threshold = 0.90
     settings.max_similar_bugs = 5
+    # Tests opt in to the mitigation cache explicitly
+    settings.mitigation_cache_enabled = False
     return settings
 
 
@@ -45,4 +47,8 @@ def mock_db_connection():
     cursor.__aexit__ = AsyncMock(return_value=None)
     conn.cursor = MagicMock(return_value=cursor)
     conn.commit = AsyncMock()
+    transaction = MagicMock()
+    transaction.__aenter__ = AsyncMock()
+    transaction.__aexit__ = AsyncMock(return_value=None)
+    conn.transaction = MagicMock(return_value=transaction)
     return conn
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""Tests for batched access tracking"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from bugspotter_intelligence.services.access_tracker import AccessTracker
+from bugspotter_intelligence.services.bug_query_service import BugQueryService
+
+
+@pytest.fixture
+def pool(mock_db_connection):
+    pool = MagicMock()
+    pool.connection.return_value.__aenter__ = AsyncMock(return_value=mock_db_connection)
+    pool.connection.return_value.__aexit__ = AsyncMock(return_value=None)
+    return pool
+
+
+class TestAccessTracker:
+    """Test suite for AccessTracker"""
+
+    @pytest.fixture
+    def tracker(self, pool):
+        return AccessTracker(pool, flush_interval=60)
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_all_ids_once(self, tracker):
+        """Many reads should become a single bulk write"""
+        tracker.record(["bug-001", "bug-002"])
+        tracker.record(["bug-001"])
+
+        with patch.object(tracker.repo, 'touch_bugs', new_callable=AsyncMock, return_value=2) as mock_touch:
+            await tracker.flush()
+
+            mock_touch.assert_called_once()
+            assert sorted(mock_touch.call_args.args[1]) == ["bug-001", "bug-002"]
+
+    @pytest.mark.asyncio
+    async def test_flush_without_accesses_skips_db(self, tracker):
+        with patch.object(tracker.repo, 'touch_bugs', new_callable=AsyncMock) as mock_touch:
+            assert await tracker.flush() == 0
+
+            mock_touch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_pending(self, tracker):
+        """Ids should be retried on the next flush after a DB error"""
+        tracker.record(["bug-001"])
+
+        with patch.object(tracker.repo, 'touch_bugs', new_callable=AsyncMock, side_effect=Exception("db down")):
+            with pytest.raises(Exception):
+                await tracker.flush()
+
+        with patch.object(tracker.repo, 'touch_bugs', new_callable=AsyncMock, return_value=1) as mock_touch:
+            await tracker.flush()
+
+            assert mock_touch.call_args.args[1] == ["bug-001"]
+
+
+class TestQueryServiceRecordsAccess:
+    """Reads through BugQueryService should be recorded"""
+
+    @pytest.mark.asyncio
+    async def test_get_bug_and_similar_record_access(
+            self,
+            pool,
+            mock_settings,
+            mock_llm_provider,
+            mock_embedding_provider,
+            mock_db_connection
+    ):
+        tracker = AccessTracker(pool)
+        service = BugQueryService(
+            mock_settings,
+            mock_llm_provider,
+            mock_embedding_provider,
+            access_tracker=tracker
+        )
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchone.return_value = ([0.1] * 384,)
+        mock_similar = [{"bug_id": "bug-002", "title": "Similar", "similarity": 0.85}]
+
+        with patch.object(service.repo, 'get_bug', new_callable=AsyncMock, return_value={"bug_id": "bug-001"}):
+            with patch.object(service.repo, 'find_similar', new_callable=AsyncMock, return_value=mock_similar):
+                await service.get_bug(mock_db_connection, "bug-001")
+                await service.find_similar_bugs(mock_db_connection, "bug-001")
+
+        assert tracker._pending == {"bug-001", "bug-002"}
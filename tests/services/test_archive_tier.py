@@ -0,0 +1,122 @@
+"""Tests for the compressed archive tier"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from bugspotter_intelligence.config import Settings
+from bugspotter_intelligence.db.archive_repository import pack_payload, unpack_payload
+from bugspotter_intelligence.services.bug_query_service import BugQueryService
+
+
+class TestArchivePayload:
+    """Test archive payload compression"""
+
+    def test_round_trip(self):
+        """Should restore text fields and timestamps"""
+        bug = {
+            "title": "Login fails",
+            "description": "NullPointerException in AuthService " * 20,
+            "resolution": "Added null check",
+            "resolution_summary": None,
+            "duplicate_of": None,
+            "embedding_text": "Login fails NullPointerException in AuthService",
+            "duplicate_cluster_id": "bug-001",
+            "created_at": datetime(2023, 5, 1, 12, 30),
+            "updated_at": None
+        }
+
+        blob = pack_payload(bug)
+
+        assert unpack_payload(blob) == bug
+        assert len(blob) < len(bug["description"])
+
+
+class TestArchiveFallThrough:
+    """Test BugQueryService archive search and rehydration"""
+
+    @pytest.fixture
+    def service(self, mock_settings, mock_llm_provider, mock_embedding_provider):
+        mock_settings.archive_search_enabled = True
+        return BugQueryService(mock_settings, mock_llm_provider, mock_embedding_provider)
+
+    @pytest.mark.asyncio
+    async def test_archive_fills_short_results(self, service, mock_db_connection):
+        """Should merge archived matches by similarity and rehydrate the ones returned"""
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchone.return_value = ([0.1] * 384,)
+
+        hot = [{"bug_id": "bug-002", "similarity": 0.80}]
+        archived = [
+            {"bug_id": "bug-001", "similarity": 1.0},  # the query bug itself
+            {"bug_id": "bug-900", "similarity": 0.95},
+            {"bug_id": "bug-901", "similarity": 0.78}
+        ]
+
+        with patch.object(service.repo, 'get_bug', new_callable=AsyncMock, return_value={"bug_id": "bug-001"}), \
+                patch.object(service.repo, 'find_similar', new_callable=AsyncMock, return_value=hot), \
+                patch.object(service.archive, 'search', new_callable=AsyncMock, return_value=archived), \
+                patch.object(service.archive, 'rehydrate', new_callable=AsyncMock, return_value=2) as mock_rehydrate:
+            result = await service.find_similar_bugs(mock_db_connection, "bug-001")
+
+        assert [b["bug_id"] for b in result["similar_bugs"]] == ["bug-900", "bug-002", "bug-901"]
+        assert result["is_duplicate"] is True
+        assert sorted(mock_rehydrate.call_args.args[1]) == ["bug-900", "bug-901"]
+
+    @pytest.mark.asyncio
+    async def test_archive_skipped_when_hot_is_enough(self, service, mock_db_connection):
+        """Should not scan the archive when the hot tier filled the limit"""
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchone.return_value = ([0.1] * 384,)
+
+        hot = [{"bug_id": f"bug-{i}", "similarity": 0.9} for i in range(10, 15)]
+
+        with patch.object(service.repo, 'get_bug', new_callable=AsyncMock, return_value={"bug_id": "bug-001"}), \
+                patch.object(service.repo, 'find_similar', new_callable=AsyncMock, return_value=hot), \
+                patch.object(service.archive, 'search', new_callable=AsyncMock) as mock_search:
+            result = await service.find_similar_bugs(mock_db_connection, "bug-001")
+
+        assert len(result["similar_bugs"]) == 5
+        mock_search.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_archive_search_disabled(self, service, mock_db_connection, mock_settings):
+        """Should never touch the archive when disabled"""
+        mock_settings.archive_search_enabled = False
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchone.return_value = ([0.1] * 384,)
+
+        with patch.object(service.repo, 'get_bug', new_callable=AsyncMock, return_value={"bug_id": "bug-001"}), \
+                patch.object(service.repo, 'find_similar', new_callable=AsyncMock, return_value=[]), \
+                patch.object(service.archive, 'search', new_callable=AsyncMock) as mock_search:
+            result = await service.find_similar_bugs(mock_db_connection, "bug-001")
+
+        assert result["similar_bugs"] == []
+        mock_search.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_archive_search_off_by_default(self, mock_llm_provider, mock_embedding_provider, mock_db_connection):
+        """Should not add an archive scan to short results unless enabled"""
+        service = BugQueryService(Settings(), mock_llm_provider, mock_embedding_provider)
+
+        with patch.object(service.repo, 'get_bug', new_callable=AsyncMock, return_value={"bug_id": "bug-001"}), \
+                patch.object(service.repo, 'find_similar', new_callable=AsyncMock, return_value=[]), \
+                patch.object(service, '_get_query_embedding', new_callable=AsyncMock, return_value=[0.1] * 384), \
+                patch.object(service.archive, 'search', new_callable=AsyncMock) as mock_search:
+            await service.find_similar_bugs(mock_db_connection, "bug-001")
+
+        mock_search.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_bug_rehydrates_archived_bug(self, service, mock_db_connection):
+        """Should return an archived bug and move it back to the hot tier"""
+        archived = {"bug_id": "bug-900", "title": "Old crash", "status": "resolved"}
+
+        with patch.object(service.repo, 'get_bug', new_callable=AsyncMock, return_value=None), \
+                patch.object(service.archive, 'get_bug', new_callable=AsyncMock, return_value=archived), \
+                patch.object(service.archive, 'rehydrate', new_callable=AsyncMock, return_value=1) as mock_rehydrate:
+            result = await service.get_bug(mock_db_connection, "bug-900")
+
+        assert result == archived
+        mock_rehydrate.assert_called_once_with(mock_db_connection, ["bug-900"])
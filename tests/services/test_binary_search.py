@@ -0,0 +1,96 @@
+"""Tests for binary-quantized two-stage similarity search"""
+
+import pytest
+
+from bugspotter_intelligence.db.bug_repository import BugRepository
+from bugspotter_intelligence.services.bug_query_service import BugQueryService
+
+
+def _executed(mock_db_connection) -> tuple[str, tuple]:
+    cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+    return cursor.execute.call_args.args
+
+
+class TestBinaryQuantizedSearch:
+    """Test the binary first pass in BugRepository and its wiring"""
+
+    @pytest.mark.asyncio
+    async def test_default_search_is_single_stage(self, mock_db_connection):
+        """Should not touch binary embeddings unless asked to"""
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchall.return_value = []
+
+        await BugRepository.find_similar(mock_db_connection, [0.1] * 384, limit=5, threshold=0.7)
+
+        sql, _ = _executed(mock_db_connection)
+        assert "binary_quantize" not in sql
+        mock_db_connection.transaction.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_rerank_uses_hamming_candidates(self, mock_db_connection):
+        """Should fetch Hamming candidates and re-rank them with cosine"""
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchall.return_value = [("bug-002", "Title", None, "open", None, 0.91)]
+        embedding = [0.1] * 384
+
+        results = await BugRepository.find_similar(
+            mock_db_connection, embedding, limit=5, threshold=0.7, rerank_candidates=100
+        )
+
+        sql, params = _executed(mock_db_connection)
+        assert "binary_quantize(embedding)::bit(384) <~>" in sql
+        assert params == (embedding, embedding, 100, embedding, 0.7, embedding, 5)
+        assert results[0]["similarity"] == 0.91
+
+    @pytest.mark.asyncio
+    async def test_ef_search_covers_candidates(self, mock_db_connection):
+        """Should raise hnsw.ef_search to the candidate count for the query's transaction"""
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchall.return_value = []
+
+        await BugRepository.find_similar(
+            mock_db_connection, [0.1] * 384, limit=5, threshold=0.7, rerank_candidates=100
+        )
+
+        mock_db_connection.transaction.assert_called_once()
+        mock_db_connection.execute.assert_awaited_once_with("SET LOCAL hnsw.ef_search = 100")
+
+    @pytest.mark.asyncio
+    async def test_bit_width_follows_dimension(self, mock_db_connection):
+        """Should cast to the embedding dimension so the binary index matches"""
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchall.return_value = []
+
+        await BugRepository.find_similar(
+            mock_db_connection, [0.1] * 768, limit=5, threshold=0.7, rerank_candidates=100, dimension=768
+        )
+
+        sql, _ = _executed(mock_db_connection)
+        assert "binary_quantize(embedding)::bit(768) <~>" in sql
+
+    @pytest.mark.asyncio
+    async def test_candidates_never_below_limit(self, mock_db_connection):
+        """Should fetch at least `limit` candidates"""
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchall.return_value = []
+
+        await BugRepository.find_similar_batch(
+            mock_db_connection, [[0.1] * 384], limit=20, threshold=0.7, rerank_candidates=10
+        )
+
+        sql, params = _executed(mock_db_connection)
+        assert "binary_quantize(q.embedding)" in sql
+        assert params[1:] == (20, 0.7, 20)
+        mock_db_connection.execute.assert_awaited_once_with("SET LOCAL hnsw.ef_search = 20")
+
+    def test_setting_enables_binary_backend(self, mock_settings, mock_llm_provider, mock_embedding_provider):
+        """Should pass the candidate count to the pgvector backend when enabled"""
+        mock_settings.binary_search_enabled = True
+        mock_settings.binary_rerank_candidates = 200
+        mock_settings.embedding_dimension = 768
+
+        service = BugQueryService(mock_settings, mock_llm_provider, mock_embedding_provider)
+
+        assert service.db_search.rerank_candidates == 200
+        assert service.db_search.dimension == 768
+        assert service.db_search.backend_name == "pgvector-binary"
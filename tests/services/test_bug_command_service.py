@@ -5,6 +5,7 @@ from unittest.mock import AsyncMock, patch
 import pytest
 
 from bugspotter_intelligence.services.bug_command_service import BugCommandService
+from bugspotter_intelligence.utils.minhash import minhash_signature
 
 
 class TestBugCommandService:
@@ -128,7 +129,9 @@ class TestBugCommandService:
             mock_db_connection,
             mock_llm_provider
     ):
-        """Should update bug resolution and generate summary"""
+        """Should update bug resolution and generate summary when summary jobs are disabled"""
+        command_service.settings.summary_jobs_enabled = False
+
         with patch.object(command_service.repo, 'update_resolution', new_callable=AsyncMock) as mock_update:
             result = await command_service.update_bug_resolution(
                 conn=mock_db_connection,
@@ -147,6 +150,38 @@ class TestBugCommandService:
             # Should have updated database
             mock_update.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_update_bug_resolution_queues_summary(
+            self,
+            command_service,
+            mock_db_connection,
+            mock_llm_provider
+    ):
+        """Should write the resolution without waiting for the LLM and queue its summary"""
+        with patch.object(command_service.repo, 'update_resolution', new_callable=AsyncMock) as mock_update:
+            result = await command_service.update_bug_resolution(
+                conn=mock_db_connection,
+                bug_id="bug-005",
+                resolution="Added null check in AuthService.java:42"
+            )
+
+            mock_llm_provider.generate.assert_not_called()
+            assert mock_update.call_args.kwargs["queue_summary"] is True
+            assert mock_update.call_args.kwargs.get("resolution_summary") is None
+            assert result["summary_status"] == "pending"
+            assert result["resolution_summary"] is None
+
+    @pytest.mark.asyncio
+    async def test_update_bug_resolution_unknown_bug(self, command_service, mock_db_connection):
+        """Should report an unknown bug instead of a pending summary"""
+        with patch.object(command_service.repo, 'update_resolution', new_callable=AsyncMock, return_value=False):
+            with pytest.raises(ValueError, match="bug-404 not found"):
+                await command_service.update_bug_resolution(
+                    conn=mock_db_connection,
+                    bug_id="bug-404",
+                    resolution="Added null check in AuthService.java:42"
+                )
+
     @pytest.mark.asyncio
     async def test_embedding_stored_correctly(
             self,
@@ -167,4 +202,176 @@ class TestBugCommandService:
 
             # Should store the exact embedding
             stored_embedding = mock_insert.call_args.kwargs["embedding"]
-            assert stored_embedding == mock_embedding
\ No newline at end of file
+            assert stored_embedding == mock_embedding
+    @pytest.mark.asyncio
+    async def test_detect_duplicates_marks_duplicate(
+            self,
+            mock_llm_provider,
+            mock_embedding_provider,
+            mock_settings,
+            mock_db_connection
+    ):
+        """Should store the bug as a duplicate of a match above duplicate_threshold"""
+        service = BugCommandService(mock_llm_provider, mock_embedding_provider, mock_settings)
+        match = {"bug_id": "bug-001", "title": "Login crashes", "similarity": 0.96}
+
+        with patch.object(service.repo, 'find_similar', new_callable=AsyncMock, return_value=[match]) as mock_find, \
+                patch.object(service.repo, 'insert_bug', new_callable=AsyncMock) as mock_insert:
+            result = await service.analyze_and_store_bug(
+                conn=mock_db_connection,
+                bug_id="bug-007",
+                title="Login crashes again",
+                detect_duplicates=True
+            )
+
+            assert result["is_duplicate"] is True
+            assert result["duplicate_of"] == "bug-001"
+            assert result["duplicate_similarity"] == 0.96
+            assert mock_insert.call_args.kwargs["duplicate_of"] == "bug-001"
+
+            # Searched with the in-memory embedding, before storing
+            assert mock_find.call_args.kwargs["embedding"] == mock_embedding_provider.embed.return_value
+            assert mock_find.call_args.kwargs["threshold"] == mock_settings.duplicate_threshold
+
+    @pytest.mark.asyncio
+    async def test_detect_duplicates_ignores_self_and_weak_matches(
+            self,
+            mock_llm_provider,
+            mock_embedding_provider,
+            mock_settings,
+            mock_db_connection
+    ):
+        """Should not mark a re-analyzed bug as a duplicate of itself"""
+        service = BugCommandService(mock_llm_provider, mock_embedding_provider, mock_settings)
+        matches = [{"bug_id": "bug-008", "similarity": 1.0}]
+
+        with patch.object(service.repo, 'find_similar', new_callable=AsyncMock, return_value=matches), \
+                patch.object(service.repo, 'insert_bug', new_callable=AsyncMock) as mock_insert:
+            result = await service.analyze_and_store_bug(
+                conn=mock_db_connection,
+                bug_id="bug-008",
+                title="Same bug",
+                detect_duplicates=True
+            )
+
+            assert result["is_duplicate"] is False
+            assert result["duplicate_of"] is None
+            assert mock_insert.call_args.kwargs["duplicate_of"] is None
+
+    @pytest.mark.asyncio
+    async def test_no_detection_by_default(
+            self,
+            mock_llm_provider,
+            mock_embedding_provider,
+            mock_settings,
+            mock_db_connection
+    ):
+        """Should not search for duplicates unless asked"""
+        service = BugCommandService(mock_llm_provider, mock_embedding_provider, mock_settings)
+
+        with patch.object(service.repo, 'find_similar', new_callable=AsyncMock) as mock_find, \
+                patch.object(service.repo, 'insert_bug', new_callable=AsyncMock):
+            result = await service.analyze_and_store_bug(
+                conn=mock_db_connection,
+                bug_id="bug-009",
+                title="Another bug"
+            )
+
+            assert result["is_duplicate"] is None
+            mock_find.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_near_exact_copy_reuses_embedding(
+            self,
+            mock_llm_provider,
+            mock_embedding_provider,
+            mock_settings,
+            mock_db_connection
+    ):
+        """Should mark a near-verbatim copy without embedding or vector search"""
+        mock_settings.minhash_dedup_enabled = True
+        mock_settings.neighbor_lists_enabled = True
+        service = BugCommandService(mock_llm_provider, mock_embedding_provider, mock_settings)
+        stored = minhash_signature("Login crashes at 2024-05-01T10:00:00Z for user 123", num_perm=128)
+        match = {"bug_id": "bug-001", "signature": stored, "embedding": "[0.3,0.4]"}
+
+        with patch.object(service.repo, 'find_near_exact_candidates', new_callable=AsyncMock, return_value=[match]), \
+                patch.object(service.repo, 'find_similar', new_callable=AsyncMock) as mock_find, \
+                patch.object(service.repo, 'store_minhash', new_callable=AsyncMock) as mock_store, \
+                patch.object(service.repo, 'insert_bug', new_callable=AsyncMock) as mock_insert:
+            result = await service.analyze_and_store_bug(
+                conn=mock_db_connection,
+                bug_id="bug-010",
+                title="Login crashes at 2024-06-02T11:30:00Z for user 987",
+                detect_duplicates=True
+            )
+
+            assert result["is_duplicate"] is True
+            assert result["duplicate_of"] == "bug-001"
+            assert result["duplicate_similarity"] == 1.0
+            assert mock_insert.call_args.kwargs["embedding"] == "[0.3,0.4]"
+            assert mock_insert.call_args.kwargs["duplicate_of"] == "bug-001"
+            mock_embedding_provider.embed.assert_not_called()
+            mock_find.assert_not_called()
+            mock_store.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_near_exact_copy_not_marked_without_detection(
+            self,
+            mock_llm_provider,
+            mock_embedding_provider,
+            mock_settings,
+            mock_db_connection
+    ):
+        """Should reuse the embedding but store the copy as a regular bug without detect_duplicates"""
+        mock_settings.minhash_dedup_enabled = True
+        service = BugCommandService(mock_llm_provider, mock_embedding_provider, mock_settings)
+        stored = minhash_signature("Login crashes at 2024-05-01T10:00:00Z for user 123", num_perm=128)
+        match = {"bug_id": "bug-001", "signature": stored, "embedding": "[0.3,0.4]"}
+
+        with patch.object(service.repo, 'find_near_exact_candidates', new_callable=AsyncMock, return_value=[match]), \
+                patch.object(service.repo, 'store_minhash', new_callable=AsyncMock) as mock_store, \
+                patch.object(service.repo, 'insert_bug', new_callable=AsyncMock) as mock_insert:
+            result = await service.analyze_and_store_bug(
+                conn=mock_db_connection,
+                bug_id="bug-010",
+                title="Login crashes at 2024-06-02T11:30:00Z for user 987"
+            )
+
+            assert result["is_duplicate"] is None
+            assert result["duplicate_of"] is None
+            assert mock_insert.call_args.kwargs["embedding"] == "[0.3,0.4]"
+            assert mock_insert.call_args.kwargs["duplicate_of"] is None
+            mock_embedding_provider.embed.assert_not_called()
+            mock_store.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_distinct_bug_is_indexed_for_pre_dedup(
+            self,
+            mock_llm_provider,
+            mock_embedding_provider,
+            mock_settings,
+            mock_db_connection
+    ):
+        """Should embed as usual and store the signature when nothing matches"""
+        mock_settings.minhash_dedup_enabled = True
+        service = BugCommandService(mock_llm_provider, mock_embedding_provider, mock_settings)
+        other = {"bug_id": "bug-001", "signature": minhash_signature("Checkout fails on empty cart"), "embedding": "[]"}
+
+        with patch.object(service.repo, 'find_near_exact_candidates', new_callable=AsyncMock, return_value=[other]), \
+                patch.object(service.repo, 'store_minhash', new_callable=AsyncMock) as mock_store, \
+                patch.object(service.repo, 'insert_bug', new_callable=AsyncMock) as mock_insert:
+            result = await service.analyze_and_store_bug(
+                conn=mock_db_connection,
+                bug_id="bug-011",
+                title="Login crashes"
+            )
+
+            assert result["is_duplicate"] is None
+            assert mock_insert.call_args.kwargs["duplicate_of"] is None
+            mock_embedding_provider.embed.assert_called_once()
+
+            bug_id, signature, buckets = mock_store.call_args.args[1:]
+            assert bug_id == "bug-011"
+            assert len(signature) == mock_settings.minhash_bands * mock_settings.minhash_rows
+            assert len(buckets) == mock_settings.minhash_bands
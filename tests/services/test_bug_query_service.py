@@ -1,10 +1,11 @@
 """Tests for BugQueryService"""
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from bugspotter_intelligence.services.bug_query_service import BugQueryService
+from bugspotter_intelligence.utils.pagination import decode_cursor
 
 
 class TestBugQueryService:
@@ -32,7 +33,8 @@ class TestBugQueryService:
     @pytest.mark.asyncio
     async def test_get_bug_not_found(self, query_service, mock_db_connection):
         """Should return None when bug not found"""
-        with patch.object(query_service.repo, 'get_bug', new_callable=AsyncMock, return_value=None):
+        with patch.object(query_service.repo, 'get_bug', new_callable=AsyncMock, return_value=None), \
+                patch.object(query_service.archive, 'get_bug', new_callable=AsyncMock, return_value=None):
             result = await query_service.get_bug(mock_db_connection, "nonexistent")
 
             assert result is None
@@ -217,4 +219,88 @@ class TestBugQueryService:
 
             # Should have called LLM without context
             call_kwargs = mock_llm_provider.generate.call_args.kwargs
-            assert call_kwargs["context"] is None or len(call_kwargs["context"]) == 0
\ No newline at end of file
+            assert call_kwargs["context"] is None or len(call_kwargs["context"]) == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_mitigation_uses_prepared_prompt(
+            self,
+            query_service,
+            mock_db_connection,
+            mock_llm_provider
+    ):
+        """Should stream with the same prompt and settings as the non-streaming path"""
+        mock_bug = {"bug_id": "bug-001", "title": "Login error", "description": "Crashes"}
+
+        async def tokens(**kwargs):
+            yield "Add a null check"
+
+        mock_llm_provider.stream = MagicMock(side_effect=tokens)
+
+        with patch.object(query_service.repo, 'get_bug', new_callable=AsyncMock, return_value=mock_bug):
+            request = await query_service.prepare_mitigation(mock_db_connection, "bug-001", use_similar_bugs=False)
+            chunks = [chunk async for chunk in query_service.stream_mitigation(request)]
+
+            assert chunks == ["Add a null check"]
+            call_kwargs = mock_llm_provider.stream.call_args.kwargs
+            assert "Bug: Login error" in call_kwargs["prompt"]
+            assert call_kwargs["context"] is None
+            assert request["based_on_similar_bugs"] is False
+
+    @pytest.mark.asyncio
+    async def test_prepare_mitigation_not_found(self, query_service, mock_db_connection):
+        """Should raise ValueError before any generation for an unknown bug"""
+        with patch.object(query_service.repo, 'get_bug', new_callable=AsyncMock, return_value=None), \
+                patch.object(query_service.archive, 'get_bug', new_callable=AsyncMock, return_value=None):
+            with pytest.raises(ValueError):
+                await query_service.prepare_mitigation(mock_db_connection, "missing")
+
+    @pytest.mark.asyncio
+    async def test_iter_similar_bugs_streams_with_cursors(self, query_service, mock_db_connection):
+        """Should stream every match except the bug itself, each with a resume cursor"""
+        batches = [
+            [
+                {"bug_id": "bug-001", "similarity": 1.0, "distance": 0.0},
+                {"bug_id": "bug-002", "similarity": 0.9, "distance": 0.1}
+            ],
+            [{"bug_id": "bug-003", "similarity": 0.85, "distance": 0.15}]
+        ]
+        calls = []
+
+        async def fake_iter_similar(conn, embedding, threshold, after=None):
+            calls.append((threshold, after))
+            for batch in batches:
+                yield batch
+
+        with patch.object(query_service.repo, 'iter_similar', fake_iter_similar):
+            results = [
+                bug async for bug in query_service.iter_similar_bugs(
+                    mock_db_connection, "bug-001", [0.1] * 384, similarity_threshold=0.8, after=(0.05, "bug-000")
+                )
+            ]
+
+        assert [b["bug_id"] for b in results] == ["bug-002", "bug-003"]
+        assert "distance" not in results[0]
+        assert decode_cursor(results[-1]["cursor"]) == (0.15, "bug-003")
+        assert calls == [(0.8, (0.05, "bug-000"))]
+
+    @pytest.mark.asyncio
+    async def test_iter_similar_bugs_stops_at_limit(self, query_service, mock_db_connection):
+        """Should stop streaming and close the cursor once the limit is reached"""
+        closed = []
+
+        async def fake_iter_similar(conn, embedding, threshold, after=None):
+            try:
+                for i in range(100):
+                    yield [{"bug_id": f"bug-{i:03}", "similarity": 0.9, "distance": 0.1}]
+            finally:
+                closed.append(True)
+
+        with patch.object(query_service.repo, 'iter_similar', fake_iter_similar):
+            results = [
+                bug async for bug in query_service.iter_similar_bugs(
+                    mock_db_connection, "bug-xyz", [0.1] * 384, limit=3
+                )
+            ]
+
+        assert len(results) == 3
+        assert closed == [True]
@@ -0,0 +1,130 @@
+"""Tests for bulk resolution updates and packed summaries"""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from bugspotter_intelligence.services.bug_command_service import (
+    BugCommandService,
+    summarize_in_batches,
+    summarize_resolutions
+)
+
+RESOLUTIONS = ["Added null check in AuthService", "Raised the pool size to 50", "Pinned urllib3 below 2.0"]
+
+
+@pytest.fixture
+def llm():
+    llm = MagicMock()
+    llm.generate = AsyncMock()
+    return llm
+
+
+@pytest.fixture
+def command_service(mock_llm_provider, mock_embedding_provider, mock_settings):
+    return BugCommandService(mock_llm_provider, mock_embedding_provider, mock_settings)
+
+
+class TestPackedSummaries:
+    """Test summarize_resolutions and summarize_in_batches"""
+
+    @pytest.mark.asyncio
+    async def test_one_call_per_pack(self, llm):
+        """Should summarize a pack with a single LLM call and parse its JSON array"""
+        llm.generate.return_value = 'Here you go:\n["Null check.", "Bigger pool.", "Pinned urllib3."]'
+
+        summaries = await summarize_resolutions(llm, RESOLUTIONS)
+
+        assert summaries == ["Null check.", "Bigger pool.", "Pinned urllib3."]
+        llm.generate.assert_awaited_once()
+        prompt = llm.generate.call_args.kwargs["prompt"]
+        assert all(resolution in prompt for resolution in RESOLUTIONS)
+
+    @pytest.mark.asyncio
+    async def test_wrong_item_count_is_rejected(self, llm):
+        """Should not guess which summary belongs to which resolution"""
+        llm.generate.return_value = '["Null check.", "Bigger pool."]'
+
+        assert await summarize_resolutions(llm, RESOLUTIONS) == [None, None, None]
+
+    @pytest.mark.asyncio
+    async def test_batches_fall_back_to_single_calls(self, llm):
+        """Should split into packs and summarize unparsed items one by one"""
+        answers = {
+            2: json.dumps(["Null check.", ""]),  # second item missing
+            1: "Pinned urllib3."
+        }
+
+        async def generate(prompt, **kwargs):
+            if "JSON" in prompt:
+                return answers[2]
+            return "Bigger pool." if RESOLUTIONS[1] in prompt else answers[1]
+
+        llm.generate.side_effect = generate
+
+        summaries = await summarize_in_batches(llm, RESOLUTIONS, batch_size=2, concurrency=2)
+
+        assert summaries == ["Null check.", "Bigger pool.", "Pinned urllib3."]
+        # One packed call, one retry for the missing item, one single-item pack
+        assert llm.generate.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_summary_is_none(self, llm):
+        """Should return None for a resolution the LLM can't summarize"""
+        llm.generate.side_effect = RuntimeError("Ollama API error: 500")
+
+        assert await summarize_in_batches(llm, RESOLUTIONS[:2], batch_size=2, concurrency=1) == [None, None]
+
+
+class TestBulkResolutionUpdate:
+    """Test BugCommandService.update_bug_resolutions"""
+
+    @pytest.mark.asyncio
+    async def test_queues_summaries_in_one_write(self, command_service, mock_db_connection, mock_llm_provider):
+        """Should write every resolution at once, queue summaries and report unknown bugs"""
+        updates = [
+            {"bug_id": "bug-1", "resolution": "Old fix", "status": "resolved"},
+            {"bug_id": "bug-2", "resolution": RESOLUTIONS[1], "status": "resolved"},
+            {"bug_id": "bug-404", "resolution": RESOLUTIONS[2], "status": "resolved"},
+            {"bug_id": "bug-1", "resolution": RESOLUTIONS[0], "status": "closed"}
+        ]
+
+        with patch.object(command_service.repo, 'update_resolutions', new_callable=AsyncMock,
+                          return_value=["bug-1", "bug-2"]) as mock_update:
+            result = await command_service.update_bug_resolutions(mock_db_connection, updates)
+
+        mock_llm_provider.generate.assert_not_called()
+        mock_update.assert_awaited_once()
+        rows = mock_update.call_args.args[1]
+        assert [(r["bug_id"], r["resolution"]) for r in rows] == [
+            ("bug-1", RESOLUTIONS[0]), ("bug-2", RESOLUTIONS[1]), ("bug-404", RESOLUTIONS[2])
+        ]
+        assert mock_update.call_args.kwargs["queue_summaries"] is True
+
+        assert [(r["bug_id"], r["status"], r["summary_status"]) for r in result["results"]] == [
+            ("bug-1", "closed", "pending"), ("bug-2", "resolved", "pending")
+        ]
+        assert result["not_found"] == ["bug-404"]
+
+    @pytest.mark.asyncio
+    async def test_inline_summaries_are_packed(self, command_service, mock_db_connection, mock_llm_provider):
+        """Should generate the summaries in packed calls before writing when summary jobs are off"""
+        command_service.settings.summary_jobs_enabled = False
+        command_service.settings.summary_batch_size = 8
+        mock_llm_provider.generate.return_value = json.dumps(["Null check.", "Bigger pool.", "Pinned urllib3."])
+        updates = [
+            {"bug_id": f"bug-{i}", "resolution": resolution, "status": "resolved"}
+            for i, resolution in enumerate(RESOLUTIONS)
+        ]
+
+        with patch.object(command_service.repo, 'update_resolutions', new_callable=AsyncMock,
+                          return_value=["bug-0", "bug-1", "bug-2"]) as mock_update:
+            result = await command_service.update_bug_resolutions(mock_db_connection, updates)
+
+        mock_llm_provider.generate.assert_awaited_once()
+        assert [r["resolution_summary"] for r in mock_update.call_args.args[1]] == [
+            "Null check.", "Bigger pool.", "Pinned urllib3."
+        ]
+        assert mock_update.call_args.kwargs["queue_summaries"] is False
+        assert all(r["summary_status"] == "done" for r in result["results"])
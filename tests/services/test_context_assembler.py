@@ -0,0 +1,97 @@
+"""Tests for token-budgeted prompt context"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from bugspotter_intelligence.services.bug_query_service import BugQueryService
+from bugspotter_intelligence.services.context_assembler import ContextAssembler, estimate_tokens
+
+LONG_FIX = "Rewrote the session refresh logic so tokens are renewed before expiry. " * 20
+
+
+def _bug(bug_id: str, similarity: float, resolution, title: str = "Login fails") -> dict:
+    return {"bug_id": bug_id, "title": title, "resolution": resolution, "similarity": similarity}
+
+
+@pytest.fixture
+def assembler():
+    return ContextAssembler(token_budget=200, dedup_threshold=0.8, prefill_tokens_per_second=50.0)
+
+
+class TestContextAssembler:
+    """Test suite for ContextAssembler"""
+
+    def test_orders_by_similarity_and_skips_unresolved(self, assembler):
+        """Should take resolved bugs most similar first"""
+        context = assembler.assemble([
+            _bug("bug-2", 0.80, "Increased the pool size"),
+            _bug("bug-3", 0.95, None),
+            _bug("bug-4", 0.90, "Added a null check in AuthService")
+        ])
+
+        assert [bug_id for bug_id, _ in context.snippets] == ["bug-4", "bug-2"]
+        assert context.snippets[0][1] == "Similar bug: Login fails\nResolution: Added a null check in AuthService"
+
+    def test_prefers_summary_and_reports_savings(self, assembler):
+        """Should use the resolution summary instead of a long resolution"""
+        context = assembler.assemble(
+            [_bug("bug-2", 0.9, LONG_FIX)],
+            summaries={"bug-2": "Renew session tokens before they expire."}
+        )
+
+        assert "Renew session tokens" in context.snippets[0][1]
+        assert context.summaries_used == 1
+
+        stats = assembler.report("Bug: Login fails", context)
+        assert stats["tokens_saved"] == context.full_tokens - context.tokens > 0
+        assert stats["prefill_seconds_saved"] == round(stats["tokens_saved"] / 50.0, 2)
+        assert stats["prompt_tokens"] == estimate_tokens("Bug: Login fails") + context.tokens
+
+    def test_drops_near_identical_resolutions(self, assembler):
+        """Should keep only the most similar of near-identical resolutions"""
+        context = assembler.assemble([
+            _bug("bug-2", 0.9, "Added a null check in AuthService.login before reading the user"),
+            _bug("bug-3", 0.8, "Added a null check in AuthService.login before reading the user."),
+            _bug("bug-4", 0.7, "Increased the connection pool size")
+        ])
+
+        assert [bug_id for bug_id, _ in context.snippets] == ["bug-2", "bug-4"]
+        assert context.duplicates_dropped == 1
+
+    def test_stays_within_budget(self, assembler):
+        """Should skip snippets that would overrun the token budget"""
+        context = assembler.assemble([
+            _bug("bug-2", 0.9, LONG_FIX),
+            _bug("bug-3", 0.8, "Increased the pool size")
+        ])
+
+        assert [bug_id for bug_id, _ in context.snippets] == ["bug-3"]
+        assert context.over_budget_dropped == 1
+        assert context.tokens <= 200
+
+
+class TestMitigationContext:
+    """Test that mitigation prompts go through the assembler"""
+
+    @pytest.fixture
+    def query_service(self, mock_settings, mock_llm_provider, mock_embedding_provider):
+        return BugQueryService(mock_settings, mock_llm_provider, mock_embedding_provider)
+
+    @pytest.mark.asyncio
+    async def test_prepare_mitigation_uses_summaries(self, query_service, mock_db_connection):
+        """Should build context from stored summaries and return prompt stats"""
+        bug = {"bug_id": "bug-001", "title": "Login error", "description": "Crashes"}
+        similar = {"similar_bugs": [_bug("bug-002", 0.9, LONG_FIX), _bug("bug-003", 0.8, None)]}
+
+        with patch.object(query_service.repo, 'get_bug', new_callable=AsyncMock, return_value=bug), \
+                patch.object(query_service, 'find_similar_bugs', new_callable=AsyncMock, return_value=similar), \
+                patch.object(query_service.repo, 'get_resolution_summaries', new_callable=AsyncMock,
+                             return_value={"bug-002": "Renew tokens early."}) as mock_summaries:
+            request = await query_service.prepare_mitigation(mock_db_connection, "bug-001")
+
+        assert mock_summaries.call_args.args[1] == ["bug-002"]
+        assert request["context"] == ["Similar bug: Login fails\nResolution: Renew tokens early."]
+        assert request["context_bug_ids"] == ["bug-002"]
+        assert request["prompt_stats"]["summaries_used"] == 1
+        assert request["prompt_stats"]["tokens_saved"] > 0
@@ -53,6 +53,14 @@ class TestLocalEmbeddingProvider:
         assert len(embedding) == 384
         assert all(isinstance(x, float) for x in embedding)
 
+    def test_embeddings_are_unit_length(self, provider):
+        """Should emit L2-normalized vectors (inner product == cosine)"""
+        embedding = provider.embed("App crashes on login")
+        batch = provider.embed_batch(["Login fails", "Checkout hangs"])
+
+        assert np.linalg.norm(embedding) == pytest.approx(1.0, abs=1e-5)
+        assert np.linalg.norm(batch, axis=1) == pytest.approx([1.0, 1.0], abs=1e-5)
+
     def test_embed_empty_text_raises_error(self, provider):
         """Should raise error for empty text"""
         with pytest.raises(ValueError, match="Text cannot be empty"):
@@ -0,0 +1,161 @@
+"""Tests for hybrid lexical + vector search with reciprocal rank fusion"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from bugspotter_intelligence.db.bug_repository import BugRepository
+from bugspotter_intelligence.services.bug_query_service import BugQueryService
+
+
+def _executed(mock_db_connection) -> tuple[str, dict]:
+    cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+    return cursor.execute.call_args.args
+
+
+class TestHybridSearch:
+    """Test the hybrid mode of BugRepository.find_similar and its wiring"""
+
+    @pytest.mark.asyncio
+    async def test_query_text_runs_fused_query(self, mock_db_connection):
+        """Should fuse vector and full-text rankings in one statement"""
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchall.return_value = [("bug-002", "Title", None, "open", None, 0.42)]
+        embedding = [0.1] * 384
+
+        results = await BugRepository.find_similar(
+            mock_db_connection, embedding, limit=5, threshold=0.7,
+            query_text="ECONNRESET at /api/login", hybrid_candidates=30, rrf_k=60
+        )
+
+        sql, params = _executed(mock_db_connection)
+        assert "search_vector @@ terms.query" in sql
+        assert "embedding <#>" in sql
+        assert params["query_text"] == "ECONNRESET at /api/login"
+        assert params["candidates"] == 30
+        assert params["rrf_k"] == 60
+        assert params["max_terms"] == 32
+        assert results == [{
+            "bug_id": "bug-002",
+            "title": "Title",
+            "description": None,
+            "status": "open",
+            "resolution": None,
+            "similarity": 0.42
+        }]
+
+    @pytest.mark.asyncio
+    async def test_candidates_never_below_limit(self, mock_db_connection):
+        """Should take at least `limit` hits from each ranking"""
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchall.return_value = []
+
+        await BugRepository.find_similar(
+            mock_db_connection, [0.1] * 384, limit=20, query_text="timeout", hybrid_candidates=5
+        )
+
+        _, params = _executed(mock_db_connection)
+        assert params["candidates"] == 20
+
+    @pytest.mark.asyncio
+    async def test_service_uses_bug_text_in_hybrid_mode(
+            self, mock_settings, mock_llm_provider, mock_embedding_provider, mock_db_connection
+    ):
+        """Should search with the bug's own text and skip itself"""
+        mock_settings.search_mode = "hybrid"
+        mock_settings.archive_search_enabled = False
+        service = BugQueryService(mock_settings, mock_llm_provider, mock_embedding_provider)
+
+        with patch.object(service, 'get_query_embedding', new_callable=AsyncMock) as mock_embedding, \
+             patch.object(service.repo, 'get_search_text', new_callable=AsyncMock) as mock_text, \
+             patch.object(service.repo, 'find_similar', new_callable=AsyncMock) as mock_find:
+            mock_embedding.return_value = [0.1] * 384
+            mock_text.return_value = "Login fails ECONNRESET"
+            mock_find.return_value = [
+                {"bug_id": "bug-001", "similarity": 1.0},
+                {"bug_id": "bug-002", "similarity": 0.6},
+                {"bug_id": "bug-003", "similarity": 0.93}
+            ]
+
+            result = await service.find_similar_bugs(mock_db_connection, "bug-001")
+
+            kwargs = mock_find.call_args.kwargs
+            assert kwargs["query_text"] == "Login fails ECONNRESET"
+            assert kwargs["hybrid_candidates"] == mock_settings.hybrid_candidates
+            assert kwargs["hybrid_max_terms"] == mock_settings.hybrid_max_terms
+            assert [b["bug_id"] for b in result["similar_bugs"]] == ["bug-002", "bug-003"]
+            # Fused order isn't similarity order; a lower-ranked match still flags a duplicate
+            assert result["is_duplicate"] is True
+
+    @pytest.mark.asyncio
+    async def test_vector_mode_does_not_fetch_text(
+            self, mock_settings, mock_llm_provider, mock_embedding_provider, mock_db_connection
+    ):
+        """Should keep the plain vector path by default"""
+        mock_settings.archive_search_enabled = False
+        service = BugQueryService(mock_settings, mock_llm_provider, mock_embedding_provider)
+
+        with patch.object(service, 'get_query_embedding', new_callable=AsyncMock) as mock_embedding, \
+             patch.object(service.repo, 'get_search_text', new_callable=AsyncMock) as mock_text, \
+             patch.object(service.repo, 'find_similar', new_callable=AsyncMock) as mock_find:
+            mock_embedding.return_value = [0.1] * 384
+            mock_find.return_value = []
+
+            await service.find_similar_bugs(mock_db_connection, "bug-001")
+
+            mock_text.assert_not_called()
+            assert "query_text" not in mock_find.call_args.kwargs
+
+
+def _unit(i: int) -> list[float]:
+    vector = [0.0] * 384
+    vector[i] = 1.0
+    return vector
+
+
+@pytest.mark.integration
+class TestHybridSearchIntegration:
+    """Run the hybrid statement against real Postgres (testcontainers)"""
+
+    @pytest.mark.asyncio
+    async def test_fuses_lexical_and_vector_matches(self, db_conn):
+        """Should find bugs by shared words even when their embeddings are far apart"""
+        await BugRepository.insert_bug(db_conn, "bug-near", "Checkout slow", None, _unit(0),
+                                       embedding_text="Checkout page is slow")
+        await BugRepository.insert_bug(db_conn, "bug-words", "Login fails", None, _unit(1),
+                                       embedding_text="Login fails with ECONNRESET at /api/login")
+        await BugRepository.insert_bug(db_conn, "bug-stopwords", "Unrelated", None, _unit(2),
+                                       embedding_text="It is at the top of the page")
+
+        results = await BugRepository.find_similar(
+            db_conn, _unit(0), limit=5, threshold=0.9,
+            query_text="The login is failing at the gateway with ECONNRESET"
+        )
+
+        assert [b["bug_id"] for b in results] == ["bug-near", "bug-words"]
+        assert results[1]["similarity"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_only_first_terms_are_searched(self, db_conn):
+        """Should OR only the first hybrid_max_terms words of a long text"""
+        await BugRepository.insert_bug(db_conn, "bug-tail", "Tail", None, _unit(1),
+                                       embedding_text="deadlock")
+
+        query_text = "timeout gateway checkout " + "filler " * 50 + "deadlock"
+        capped = await BugRepository.find_similar(
+            db_conn, _unit(0), query_text=query_text, hybrid_max_terms=3
+        )
+        uncapped = await BugRepository.find_similar(
+            db_conn, _unit(0), query_text=query_text, hybrid_max_terms=5
+        )
+
+        assert capped == []
+        assert [b["bug_id"] for b in uncapped] == ["bug-tail"]
+
+    @pytest.mark.asyncio
+    async def test_text_without_words_matches_nothing(self, db_conn):
+        """Should fall back to vector hits when the text has no searchable words"""
+        await BugRepository.insert_bug(db_conn, "bug-near", "Near", None, _unit(0), embedding_text="the")
+
+        results = await BugRepository.find_similar(db_conn, _unit(0), query_text="the ... !!")
+
+        assert [b["bug_id"] for b in results] == ["bug-near"]
@@ -0,0 +1,108 @@
+"""Tests for stored mitigation suggestions"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from bugspotter_intelligence.db.bug_repository import BugRepository
+from bugspotter_intelligence.services.bug_query_service import BugQueryService, mitigation_fingerprint
+
+BUG = {"bug_id": "bug-001", "title": "Login error", "description": "Crashes"}
+SIMILAR = {
+    "similar_bugs": [
+        {"bug_id": "bug-002", "title": "Similar login issue", "resolution": "Added null check"},
+        {"bug_id": "bug-003", "title": "Unresolved login issue", "resolution": None}
+    ]
+}
+
+
+@pytest.fixture
+def cached_service(mock_settings, mock_llm_provider, mock_embedding_provider):
+    mock_settings.mitigation_cache_enabled = True
+    return BugQueryService(mock_settings, mock_llm_provider, mock_embedding_provider)
+
+
+class TestMitigationCache:
+    """Test the stored-suggestion path of get_mitigation_suggestion"""
+
+    @pytest.mark.asyncio
+    async def test_miss_generates_and_stores(self, cached_service, mock_db_connection, mock_llm_provider):
+        """Should generate once and store the suggestion with its context bugs"""
+        with patch.object(cached_service.repo, 'get_bug', new_callable=AsyncMock, return_value=BUG), \
+                patch.object(cached_service, 'find_similar_bugs', new_callable=AsyncMock, return_value=SIMILAR), \
+                patch.object(cached_service.repo, 'get_mitigation', new_callable=AsyncMock, return_value=None), \
+                patch.object(cached_service.repo, 'store_mitigation', new_callable=AsyncMock) as mock_store:
+            result = await cached_service.get_mitigation_suggestion(mock_db_connection, "bug-001")
+
+        mock_llm_provider.generate.assert_awaited_once()
+        kwargs = mock_store.call_args.kwargs
+        assert kwargs["suggestion"] == result["mitigation_suggestion"] == "AI generated suggestion"
+        assert kwargs["context_bug_ids"] == ["bug-002"]
+        assert kwargs["based_on_similar_bugs"] is True
+
+    @pytest.mark.asyncio
+    async def test_stored_suggestion_is_one_read(self, cached_service, mock_db_connection, mock_llm_provider,
+                                                 mock_settings):
+        """Should serve a stored suggestion without loading the bug, searching or calling the LLM"""
+        stored = {
+            "model": f"ollama:{mock_settings.ollama_model}",
+            "fingerprint": "0" * 64,
+            "mitigation_suggestion": "Stored suggestion",
+            "based_on_similar_bugs": True
+        }
+
+        with patch.object(cached_service.repo, 'get_bug', new_callable=AsyncMock) as mock_get_bug, \
+                patch.object(cached_service, 'find_similar_bugs', new_callable=AsyncMock) as mock_similar, \
+                patch.object(cached_service.repo, 'get_mitigation', new_callable=AsyncMock, return_value=stored), \
+                patch.object(cached_service.repo, 'store_mitigation', new_callable=AsyncMock) as mock_store:
+            result = await cached_service.get_mitigation_suggestion(mock_db_connection, "bug-001")
+            streamed = [chunk async for chunk in cached_service.stream_mitigation(
+                await cached_service.prepare_mitigation(mock_db_connection, "bug-001")
+            )]
+
+        assert result["mitigation_suggestion"] == "Stored suggestion"
+        assert result["based_on_similar_bugs"] is True
+        assert result["prompt_stats"] is None
+        assert streamed == ["Stored suggestion"]
+        mock_get_bug.assert_not_called()
+        mock_similar.assert_not_called()
+        mock_llm_provider.generate.assert_not_called()
+        mock_store.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_other_model_regenerates(self, cached_service, mock_db_connection, mock_llm_provider):
+        """Should regenerate when the stored suggestion came from another model"""
+        stale = {
+            "model": "claude:old-model",
+            "fingerprint": "0" * 64,
+            "mitigation_suggestion": "Old",
+            "based_on_similar_bugs": True
+        }
+
+        with patch.object(cached_service.repo, 'get_bug', new_callable=AsyncMock, return_value=BUG), \
+                patch.object(cached_service, 'find_similar_bugs', new_callable=AsyncMock, return_value=SIMILAR), \
+                patch.object(cached_service.repo, 'get_mitigation', new_callable=AsyncMock, return_value=stale), \
+                patch.object(cached_service.repo, 'store_mitigation', new_callable=AsyncMock) as mock_store:
+            result = await cached_service.get_mitigation_suggestion(mock_db_connection, "bug-001")
+
+        assert result["mitigation_suggestion"] == "AI generated suggestion"
+        mock_store.assert_awaited_once()
+        assert mock_store.call_args.kwargs["model"].startswith("ollama:")
+
+    def test_fingerprint_tracks_context_resolution(self):
+        """Should change when a context bug's resolution changes"""
+        before = mitigation_fingerprint("ollama:llama3.1:8b", "Bug: X", [("bug-002", "Resolution: A")])
+        after = mitigation_fingerprint("ollama:llama3.1:8b", "Bug: X", [("bug-002", "Resolution: B")])
+
+        assert before != after
+        assert before == mitigation_fingerprint("ollama:llama3.1:8b", "Bug: X", [("bug-002", "Resolution: A")])
+
+    @pytest.mark.asyncio
+    async def test_resolution_update_invalidates(self, mock_db_connection):
+        """Should drop suggestions for the bug and those using it as context"""
+        await BugRepository.update_resolution(mock_db_connection, "bug-002", "Added null check")
+
+        cursor = mock_db_connection.cursor.return_value
+        sql, params = cursor.execute.call_args_list[0].args
+        assert "DELETE FROM bug_mitigations" in sql
+        assert params == ("bug-002", "bug-002")
@@ -0,0 +1,232 @@
+"""Tests for precomputed neighbor lists"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from bugspotter_intelligence.db.bug_repository import BugRepository
+from bugspotter_intelligence.services.bug_command_service import BugCommandService
+from bugspotter_intelligence.services.bug_query_service import BugQueryService
+
+
+def _bug(bug_id: str, similarity: float) -> dict:
+    return {
+        "bug_id": bug_id,
+        "title": f"Bug {bug_id}",
+        "description": None,
+        "status": "open",
+        "resolution": None,
+        "similarity": similarity
+    }
+
+
+@pytest.fixture
+def neighbor_settings(mock_settings):
+    mock_settings.neighbor_lists_enabled = True
+    mock_settings.neighbor_list_size = 3
+    mock_settings.neighbor_min_similarity = 0.5
+    mock_settings.neighbor_update_candidates = 10
+    mock_settings.archive_search_enabled = False
+    return mock_settings
+
+
+class TestNeighborListMaintenance:
+    """Test neighbor list updates at ingest time"""
+
+    @pytest.mark.asyncio
+    async def test_ingest_stores_top_k_and_updates_neighbors(
+            self,
+            neighbor_settings,
+            mock_llm_provider,
+            mock_embedding_provider,
+            mock_db_connection
+    ):
+        """Should store the new bug's top K and offer it to every candidate's list"""
+        service = BugCommandService(mock_llm_provider, mock_embedding_provider, neighbor_settings)
+        candidates = [_bug("bug-new", 1.0)] + [_bug(f"bug-{i}", 0.9 - i * 0.05) for i in range(5)]
+
+        with patch.object(service.repo, 'insert_bug', new_callable=AsyncMock), \
+                patch.object(service.repo, 'invalidate_neighbors', new_callable=AsyncMock) as mock_invalidate, \
+                patch.object(service.repo, 'find_similar', new_callable=AsyncMock, return_value=candidates) as mock_find, \
+                patch.object(service.repo, 'store_neighbors', new_callable=AsyncMock) as mock_store, \
+                patch.object(service.repo, 'add_reverse_neighbors', new_callable=AsyncMock) as mock_reverse:
+            await service.analyze_and_store_bug(mock_db_connection, "bug-new", "New bug")
+
+        mock_invalidate.assert_called_once_with(mock_db_connection, "bug-new")
+        assert mock_find.call_args.kwargs["limit"] == 11
+        assert mock_find.call_args.kwargs["threshold"] == 0.5
+
+        stored = mock_store.call_args.args[2]
+        assert [b["bug_id"] for b in stored] == ["bug-0", "bug-1", "bug-2"]
+
+        offered = mock_reverse.call_args.args[2]
+        assert len(offered) == 5
+        assert mock_reverse.call_args.args[3] == 3
+
+    @pytest.mark.asyncio
+    async def test_duplicate_not_offered_to_neighbors(
+            self,
+            neighbor_settings,
+            mock_llm_provider,
+            mock_embedding_provider,
+            mock_db_connection
+    ):
+        """Should keep a bug stored as a duplicate out of other bugs' lists"""
+        service = BugCommandService(mock_llm_provider, mock_embedding_provider, neighbor_settings)
+        candidates = [_bug("bug-0", 0.97), _bug("bug-1", 0.8)]
+
+        with patch.object(service.repo, 'insert_bug', new_callable=AsyncMock), \
+                patch.object(service.repo, 'invalidate_neighbors', new_callable=AsyncMock), \
+                patch.object(service.repo, 'find_similar', new_callable=AsyncMock, return_value=candidates), \
+                patch.object(service.repo, 'store_neighbors', new_callable=AsyncMock) as mock_store, \
+                patch.object(service.repo, 'add_reverse_neighbors', new_callable=AsyncMock) as mock_reverse:
+            result = await service.analyze_and_store_bug(
+                mock_db_connection, "bug-copy", "Copy", detect_duplicates=True
+            )
+
+        assert result["duplicate_of"] == "bug-0"
+        mock_store.assert_called_once()
+        mock_reverse.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_near_exact_reingest_invalidates_lists(
+            self,
+            neighbor_settings,
+            mock_llm_provider,
+            mock_embedding_provider,
+            mock_db_connection
+    ):
+        """Should mark lists holding the bug stale when a near-exact copy replaces its embedding"""
+        neighbor_settings.minhash_dedup_enabled = True
+        service = BugCommandService(mock_llm_provider, mock_embedding_provider, neighbor_settings)
+        match = {"bug_id": "bug-0", "similarity": 0.95, "embedding": [0.2] * 384}
+
+        with patch.object(service, '_find_near_exact', new_callable=AsyncMock, return_value=match), \
+                patch.object(service.repo, 'insert_bug', new_callable=AsyncMock), \
+                patch.object(service.repo, 'invalidate_neighbors', new_callable=AsyncMock) as mock_invalidate, \
+                patch.object(service.repo, 'find_similar', new_callable=AsyncMock) as mock_find, \
+                patch.object(service.repo, 'add_reverse_neighbors', new_callable=AsyncMock) as mock_reverse:
+            await service.analyze_and_store_bug(
+                mock_db_connection, "bug-7", "Login fails", detect_duplicates=True
+            )
+
+        mock_invalidate.assert_called_once_with(mock_db_connection, "bug-7")
+        mock_find.assert_not_called()
+        mock_reverse.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ingest_skips_lists_when_disabled(
+            self,
+            mock_settings,
+            mock_llm_provider,
+            mock_embedding_provider,
+            mock_db_connection
+    ):
+        """Should not search at ingest when neighbor lists are disabled"""
+        service = BugCommandService(mock_llm_provider, mock_embedding_provider, mock_settings)
+
+        with patch.object(service.repo, 'insert_bug', new_callable=AsyncMock), \
+                patch.object(service.repo, 'find_similar', new_callable=AsyncMock) as mock_find:
+            await service.analyze_and_store_bug(mock_db_connection, "bug-new", "New bug")
+
+        mock_find.assert_not_called()
+
+
+class TestNeighborListReads:
+    """Test serving similar-bug queries from neighbor lists"""
+
+    @pytest.fixture
+    def service(self, neighbor_settings, mock_llm_provider, mock_embedding_provider):
+        return BugQueryService(neighbor_settings, mock_llm_provider, mock_embedding_provider)
+
+    @pytest.mark.asyncio
+    async def test_serves_from_list(self, service, mock_db_connection):
+        """Should answer from the list without running a search"""
+        listed = [_bug("bug-002", 0.95)]
+
+        with patch.object(service.repo, 'get_neighbors', new_callable=AsyncMock, return_value=listed), \
+                patch.object(service.repo, 'find_similar', new_callable=AsyncMock) as mock_find:
+            result = await service.find_similar_bugs(mock_db_connection, "bug-001", limit=3)
+
+        assert result["similar_bugs"] == listed
+        assert result["is_duplicate"] is True
+        mock_find.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_searches_outside_list_bounds(self, service, mock_db_connection):
+        """Should run a full search for thresholds below the list floor"""
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchone.return_value = ([0.1] * 384,)
+
+        with patch.object(service.repo, 'get_bug', new_callable=AsyncMock, return_value={"bug_id": "bug-001"}), \
+                patch.object(service.repo, 'get_neighbors', new_callable=AsyncMock) as mock_neighbors, \
+                patch.object(service.repo, 'find_similar', new_callable=AsyncMock, return_value=[]) as mock_find:
+            await service.find_similar_bugs(mock_db_connection, "bug-001", similarity_threshold=0.3, limit=3)
+
+        mock_neighbors.assert_not_called()
+        assert mock_find.call_args.kwargs["threshold"] == 0.3
+
+    @pytest.mark.asyncio
+    async def test_recomputes_missing_list(self, service, mock_db_connection):
+        """Should search at the list bounds, store the list and answer from it"""
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchone.return_value = ([0.1] * 384,)
+        found = [_bug("bug-002", 0.9), _bug("bug-003", 0.7), _bug("bug-004", 0.6)]
+
+        with patch.object(service.repo, 'get_bug', new_callable=AsyncMock, return_value={"bug_id": "bug-001"}), \
+                patch.object(service.repo, 'get_neighbors', new_callable=AsyncMock, return_value=None), \
+                patch.object(service.repo, 'find_similar', new_callable=AsyncMock, return_value=found) as mock_find, \
+                patch.object(service.repo, 'store_neighbors', new_callable=AsyncMock) as mock_store:
+            result = await service.find_similar_bugs(mock_db_connection, "bug-001", similarity_threshold=0.65, limit=3)
+
+        assert mock_find.call_args.kwargs["threshold"] == 0.5
+        assert mock_store.call_args.args[2] == found
+        assert [b["bug_id"] for b in result["similar_bugs"]] == ["bug-002", "bug-003"]
+
+
+class TestGetNeighbors:
+    """Test BugRepository.get_neighbors result handling"""
+
+    @staticmethod
+    def _row(stored, bug_id, similarity, weakest=0.8, computed=True):
+        return (computed, stored, weakest, bug_id, f"Bug {bug_id}", None, "open", None, similarity)
+
+    @pytest.mark.asyncio
+    async def test_not_computed_returns_none(self, mock_db_connection):
+        """Should not answer from a list that was never computed"""
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchall.return_value = [self._row(None, None, None, weakest=None, computed=False)]
+
+        assert await BugRepository.get_neighbors(mock_db_connection, "bug-001", 0.7, 5, 20) is None
+
+    @pytest.mark.asyncio
+    async def test_short_complete_list_answers(self, mock_db_connection):
+        """Should answer from a list with fewer than K entries, even if short"""
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchall.return_value = [self._row(2, "bug-002", 0.9), self._row(2, None, None)]
+
+        result = await BugRepository.get_neighbors(mock_db_connection, "bug-001", 0.7, 5, 20)
+
+        assert [b["bug_id"] for b in result] == ["bug-002"]
+
+    @pytest.mark.asyncio
+    async def test_full_list_filtered_too_short_returns_none(self, mock_db_connection):
+        """Should fall back when a full list above the threshold lost entries"""
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchall.return_value = [self._row(3, "bug-002", 0.9), self._row(3, None, None), self._row(3, None, None)]
+
+        assert await BugRepository.get_neighbors(mock_db_connection, "bug-001", 0.7, 2, 3) is None
+
+    @pytest.mark.asyncio
+    async def test_full_list_reaching_below_threshold_answers(self, mock_db_connection):
+        """Should answer from a full list whose tail is below the threshold"""
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchall.return_value = [
+            self._row(3, "bug-002", 0.95, weakest=0.6),
+            self._row(3, None, None, weakest=0.6),
+            self._row(3, None, None, weakest=0.6)
+        ]
+
+        result = await BugRepository.get_neighbors(mock_db_connection, "bug-001", 0.9, 2, 3)
+
+        assert [b["bug_id"] for b in result] == ["bug-002"]
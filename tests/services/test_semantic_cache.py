@@ -0,0 +1,153 @@
+"""Tests for the semantic /ask response cache"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from bugspotter_intelligence.services.semantic_cache import CachedLLMProvider, SemanticCache
+
+KEY = ("ollama", "llama3.1:8b", 0.7, 500)
+
+
+def _unit(*values: float) -> list[float]:
+    vector = np.asarray(values, dtype=np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return SemanticCache(threshold=0.95, ttl_seconds=60, max_entries=2, clock=clock)
+
+
+class TestSemanticCache:
+    """Test suite for SemanticCache"""
+
+    def test_similar_embedding_hits(self, cache):
+        """Should serve an answer for a close enough embedding"""
+        cache.store(_unit(1, 0, 0), KEY, "Restart the worker")
+
+        assert cache.lookup(_unit(1, 0.1, 0), KEY) == "Restart the worker"
+        assert cache.lookup(_unit(0, 1, 0), KEY) is None
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_key_must_match(self, cache):
+        """Should not serve answers generated with another temperature or model"""
+        cache.store(_unit(1, 0, 0), KEY, "Restart the worker")
+
+        assert cache.lookup(_unit(1, 0, 0), ("ollama", "llama3.1:8b", 0.2, 500)) is None
+        assert cache.lookup(_unit(1, 0, 0), ("ollama", "mistral", 0.7, 500)) is None
+
+    def test_entries_expire(self, cache, clock):
+        """Should stop serving entries after the TTL"""
+        cache.store(_unit(1, 0, 0), KEY, "Restart the worker")
+        clock.now = 61
+
+        assert cache.lookup(_unit(1, 0, 0), KEY) is None
+
+    def test_evicts_least_recently_used(self, cache):
+        """Should evict the least recently used entry when full"""
+        cache.store(_unit(1, 0, 0), KEY, "a")
+        cache.store(_unit(0, 1, 0), KEY, "b")
+        cache.lookup(_unit(1, 0, 0), KEY)
+
+        cache.store(_unit(0, 0, 1), KEY, "c")
+
+        assert cache.lookup(_unit(1, 0, 0), KEY) == "a"
+        assert cache.lookup(_unit(0, 1, 0), KEY) is None
+        assert cache.stats()["entries"] == 2
+        assert cache.stats()["evictions"] == 1
+
+    def test_expired_slot_reused_before_eviction(self, cache, clock):
+        """Should replace an expired entry rather than evict a live one"""
+        cache.store(_unit(1, 0, 0), KEY, "a")
+        clock.now = 30
+        cache.store(_unit(0, 1, 0), KEY, "b")
+        clock.now = 70
+
+        cache.store(_unit(0, 0, 1), KEY, "c")
+
+        assert cache.lookup(_unit(0, 1, 0), KEY) == "b"
+        assert cache.stats()["expirations"] == 1
+        assert cache.stats()["evictions"] == 0
+
+    def test_keys_dropped_with_their_last_entry(self, cache):
+        """Should not keep keys of evicted entries (temperature and max_tokens come from callers)"""
+        for max_tokens in range(10):
+            cache.store(_unit(1, 0, 0), ("ollama", "llama3.1:8b", 0.7, max_tokens), "a")
+
+        assert len(cache._key_index) == 2
+        assert cache.lookup(_unit(1, 0, 0), ("ollama", "llama3.1:8b", 0.7, 9)) == "a"
+        assert cache.lookup(_unit(1, 0, 0), ("ollama", "llama3.1:8b", 0.7, 0)) is None
+
+        cache.clear()
+        assert cache._key_index == {}
+
+
+class TestCachedLLMProvider:
+    """Test suite for the caching provider wrapper"""
+
+    @pytest.fixture
+    def wrapped(self, mock_settings, cache):
+        provider = MagicMock()
+        provider.settings = mock_settings
+        provider.generate = AsyncMock(return_value="Restart the worker")
+        embeddings = MagicMock()
+        embeddings.embed.return_value = _unit(1, 0, 0)
+        return CachedLLMProvider(provider, embeddings, cache, "llama3.1:8b")
+
+    @pytest.mark.asyncio
+    async def test_second_ask_served_from_cache(self, wrapped):
+        """Should call the LLM once for two similar questions"""
+        first = await wrapped.generate("Why does the queue stall?", temperature=0.7, max_tokens=500)
+        second = await wrapped.generate("Why is the queue stalling?", temperature=0.7, max_tokens=500)
+
+        assert first == second == "Restart the worker"
+        wrapped.provider.generate.assert_awaited_once()
+        assert wrapped.embeddings.embed.call_args_list[0].args[0] == "Why does the queue stall?"
+
+    @pytest.mark.asyncio
+    async def test_other_context_is_not_served(self, wrapped):
+        """Should not reuse an answer written for another context, however similar the question"""
+        await wrapped.generate("Why does the queue stall?", context=["Bug #1: worker deadlock"])
+        await wrapped.generate("Why does the queue stall?", context=["Bug #7: disk full"])
+        await wrapped.generate("Why does the queue stall?", context=["Bug #1: worker deadlock"])
+
+        assert wrapped.provider.generate.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_caches_complete_answer(self, wrapped):
+        """Should cache a streamed answer and replay it as one chunk"""
+        async def tokens(*args):
+            yield "Restart "
+            yield "the worker"
+
+        wrapped.provider.stream = MagicMock(side_effect=tokens)
+
+        streamed = [chunk async for chunk in wrapped.stream("Why does the queue stall?", None, 0.7, 500)]
+        replayed = [chunk async for chunk in wrapped.stream("Why does the queue stall?", None, 0.7, 500)]
+
+        assert streamed == ["Restart ", "the worker"]
+        assert replayed == ["Restart the worker"]
+        wrapped.provider.stream.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_embedding_failure_bypasses_cache(self, wrapped):
+        """Should still answer when the question can't be embedded"""
+        wrapped.embeddings.embed.side_effect = RuntimeError("model not loaded")
+
+        assert await wrapped.generate("Why does the queue stall?") == "Restart the worker"
+        assert wrapped.cache.stats()["entries"] == 0
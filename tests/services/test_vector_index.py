@@ -0,0 +1,353 @@
+"""Tests for in-memory vector indexes"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from bugspotter_intelligence.services.bug_query_service import BugQueryService
+from bugspotter_intelligence.services.vector_index import (
+    ExactVectorIndex,
+    IndexSearchBackend,
+    VectorIndexSync,
+    create_vector_index
+)
+from bugspotter_intelligence.services.vector_index.exact import top_k_rows
+
+
+def _vector(*values: float) -> list[float]:
+    """Build a 4-dimensional test vector"""
+    return list(values)
+
+
+@pytest.fixture
+def vectors():
+    return {
+        "bug-001": _vector(1.0, 0.0, 0.0, 0.0),
+        "bug-002": _vector(0.9, 0.1, 0.0, 0.0),
+        "bug-003": _vector(0.0, 1.0, 0.0, 0.0),
+        "bug-004": _vector(0.8, 0.0, 0.2, 0.0),
+    }
+
+
+class TestExactVectorIndex:
+    """Test suite for ExactVectorIndex"""
+
+    @pytest.fixture
+    def index(self, vectors):
+        index = ExactVectorIndex(dimension=4)
+        for bug_id, vector in vectors.items():
+            index.upsert(bug_id, vector)
+        return index
+
+    def test_search_orders_by_similarity(self, index):
+        """Should return nearest bugs first"""
+        results = index.search(_vector(1.0, 0.0, 0.0, 0.0), limit=3, threshold=0.5)
+
+        assert [bug_id for bug_id, _ in results] == ["bug-001", "bug-002", "bug-004"]
+        assert results[0][1] == pytest.approx(1.0)
+
+    def test_search_applies_threshold(self, index):
+        """Should drop results below threshold"""
+        results = index.search(_vector(1.0, 0.0, 0.0, 0.0), limit=10, threshold=0.999)
+
+        assert [bug_id for bug_id, _ in results] == ["bug-001"]
+
+    def test_search_excludes_duplicates(self, index):
+        """Should skip bugs with status 'duplicate', like find_similar"""
+        index.set_status("bug-002", "duplicate")
+
+        results = index.search(_vector(1.0, 0.0, 0.0, 0.0), limit=3, threshold=0.5)
+
+        assert "bug-002" not in [bug_id for bug_id, _ in results]
+
+    def test_remove_keeps_other_rows(self, index):
+        """Removing a row should not disturb the remaining rows"""
+        index.remove("bug-001")
+
+        assert "bug-001" not in index
+        assert len(index) == 3
+        results = index.search(_vector(0.0, 1.0, 0.0, 0.0), limit=1, threshold=0.5)
+        assert results[0][0] == "bug-003"
+
+    def test_upsert_replaces_embedding(self, index):
+        """Upserting an existing bug should replace its vector"""
+        index.upsert("bug-003", _vector(1.0, 0.0, 0.0, 0.0))
+
+        assert len(index) == 4
+        assert np.allclose(index.get_embedding("bug-003"), [1.0, 0.0, 0.0, 0.0])
+
+    def test_grows_past_initial_capacity(self):
+        """Should keep accepting rows beyond the initial matrix size"""
+        index = ExactVectorIndex(dimension=4)
+        for i in range(ExactVectorIndex.INITIAL_CAPACITY + 10):
+            index.upsert(f"bug-{i}", _vector(1.0, float(i), 0.0, 0.0))
+
+        assert len(index) == ExactVectorIndex.INITIAL_CAPACITY + 10
+
+    def test_dimension_mismatch_raises(self, index):
+        """Should reject vectors with the wrong dimension"""
+        with pytest.raises(ValueError, match="dimension mismatch"):
+            index.upsert("bug-999", [1.0, 0.0])
+
+    def test_search_batch_matches_single_searches(self, index, vectors):
+        """Batched queries should return the same results as one-by-one queries"""
+        queries = [vectors["bug-001"], vectors["bug-003"]]
+
+        batched = index.search_batch(queries, limit=2, threshold=0.0)
+
+        assert batched == [index.search(q, limit=2, threshold=0.0) for q in queries]
+
+    def test_rerank_scores_candidates_exactly(self, index):
+        """Should re-order candidates by exact cosine and drop unknown ids"""
+        results = index.rerank(
+            _vector(1.0, 0.0, 0.0, 0.0),
+            ["bug-003", "bug-004", "bug-002", "missing"],
+            limit=2,
+            threshold=0.5
+        )
+
+        assert [bug_id for bug_id, _ in results] == ["bug-002", "bug-004"]
+
+    def test_top_k_rows_orders_best_first(self):
+        """Should return the k best columns per row in descending order"""
+        scores = np.array([[0.1, 0.9, 0.5, 0.7], [0.8, 0.2, 0.3, 0.1]], dtype=np.float32)
+
+        assert top_k_rows(scores, 2).tolist() == [[1, 3], [0, 2]]
+
+
+class TestHNSWVectorIndex:
+    """Test suite for HNSWVectorIndex (requires hnswlib)"""
+
+    @pytest.fixture
+    def index(self, vectors):
+        pytest.importorskip("hnswlib")
+        from bugspotter_intelligence.services.vector_index.hnsw import HNSWVectorIndex
+
+        index = HNSWVectorIndex(dimension=4)
+        for bug_id, vector in vectors.items():
+            index.upsert(bug_id, vector)
+        return index
+
+    def test_search_matches_exact(self, index):
+        """Small corpus should give the same answer as exact search"""
+        results = index.search(_vector(1.0, 0.0, 0.0, 0.0), limit=3, threshold=0.5)
+
+        assert [bug_id for bug_id, _ in results] == ["bug-001", "bug-002", "bug-004"]
+
+    def test_search_excludes_duplicates_and_removed(self, index):
+        """Should skip duplicates and deleted elements"""
+        index.set_status("bug-002", "duplicate")
+        index.remove("bug-004")
+
+        results = index.search(_vector(1.0, 0.0, 0.0, 0.0), limit=3, threshold=0.5)
+
+        assert [bug_id for bug_id, _ in results] == ["bug-001"]
+
+    def test_rerank_matches_exact(self, index, vectors):
+        """Should re-score candidates from the stored vectors like the exact index"""
+        exact = ExactVectorIndex(dimension=4)
+        for bug_id, vector in vectors.items():
+            exact.upsert(bug_id, vector)
+        candidates = ["bug-003", "bug-004", "bug-002", "missing"]
+        query = _vector(1.0, 0.0, 0.0, 0.0)
+
+        results = index.rerank(query, candidates, limit=2, threshold=0.5)
+
+        assert [bug_id for bug_id, _ in results] == ["bug-002", "bug-004"]
+        assert [score for _, score in results] == pytest.approx(
+            [score for _, score in exact.rerank(query, candidates, limit=2, threshold=0.5)]
+        )
+
+
+class TestIndexSearchBackend:
+    """Test suite for search over an in-memory index"""
+
+    @pytest.fixture
+    def repo(self):
+        repo = MagicMock()
+        repo.get_bugs_by_ids = AsyncMock(side_effect=lambda conn, ids: {
+            bug_id: {"bug_id": bug_id, "status": "open"} for bug_id in ids
+        })
+        return repo
+
+    @pytest.mark.asyncio
+    async def test_approximate_index_is_reranked(self, repo, vectors):
+        """Should over-fetch ANN candidates and keep the exact top `limit`"""
+        index = MagicMock(approximate=True)
+        index.search_batch.return_value = [[("bug-004", 0.99), ("bug-002", 0.98), ("bug-001", 0.97)]]
+        index.rerank.return_value = [("bug-001", 1.0), ("bug-002", 0.99)]
+        backend = IndexSearchBackend(repo, index, rerank_candidates=50)
+
+        results = await backend.find_similar(MagicMock(), vectors["bug-001"], limit=2, threshold=0.5)
+
+        assert index.search_batch.call_args.kwargs["limit"] == 50
+        assert index.rerank.call_args.args == (vectors["bug-001"], ["bug-004", "bug-002", "bug-001"], 2, 0.5)
+        assert [(b["bug_id"], b["similarity"]) for b in results] == [("bug-001", 1.0), ("bug-002", 0.99)]
+
+    @pytest.mark.asyncio
+    async def test_exact_index_is_not_reranked(self, repo, vectors):
+        """Should search an exact index for `limit` results directly"""
+        index = ExactVectorIndex(dimension=4)
+        for bug_id, vector in vectors.items():
+            index.upsert(bug_id, vector)
+        backend = IndexSearchBackend(repo, index, rerank_candidates=50)
+
+        with patch.object(index, 'rerank', wraps=index.rerank) as mock_rerank:
+            results = await backend.find_similar(MagicMock(), vectors["bug-001"], limit=2, threshold=0.5)
+
+        mock_rerank.assert_not_called()
+        assert [b["bug_id"] for b in results] == ["bug-001", "bug-002"]
+
+
+class TestCreateVectorIndex:
+    """Test suite for create_vector_index"""
+
+    def test_disabled_by_default(self, mock_settings):
+        """Should return None when backend is 'none'"""
+        assert create_vector_index(mock_settings) is None
+
+    def test_exact_backend(self, mock_settings):
+        mock_settings.vector_index_backend = "exact"
+        assert isinstance(create_vector_index(mock_settings), ExactVectorIndex)
+
+    def test_invalid_backend(self, mock_settings):
+        mock_settings.vector_index_backend = "faiss"
+        with pytest.raises(ValueError, match="faiss"):
+            create_vector_index(mock_settings)
+
+
+class TestVectorIndexSync:
+    """Test suite for applying change notifications"""
+
+    @pytest.fixture
+    def sync(self, vectors):
+        index = ExactVectorIndex(dimension=4)
+        index.upsert("bug-001", vectors["bug-001"])
+
+        pool = MagicMock()
+        pool.connection.return_value.__aenter__ = AsyncMock(return_value=AsyncMock())
+        pool.connection.return_value.__aexit__ = AsyncMock(return_value=None)
+        return VectorIndexSync(index, pool, "postgresql://unused")
+
+    @pytest.mark.asyncio
+    async def test_insert_fetches_embedding(self, sync, vectors):
+        """INSERT notifications should load the new vector"""
+        with patch.object(sync.repo, 'get_embedding', new_callable=AsyncMock,
+                          return_value=(vectors["bug-002"], "open")):
+            await sync.apply({"op": "INSERT", "bug_id": "bug-002", "embedding_changed": True})
+
+        assert "bug-002" in sync.index
+
+    @pytest.mark.asyncio
+    async def test_status_update_skips_fetch(self, sync):
+        """Status-only updates should not query the database"""
+        with patch.object(sync.repo, 'get_embedding', new_callable=AsyncMock) as mock_fetch:
+            await sync.apply({
+                "op": "UPDATE",
+                "bug_id": "bug-001",
+                "status": "duplicate",
+                "embedding_changed": False
+            })
+
+            mock_fetch.assert_not_called()
+        assert sync.index.is_excluded("bug-001")
+
+    @pytest.mark.asyncio
+    async def test_delete_removes(self, sync):
+        await sync.apply({"op": "DELETE", "bug_id": "bug-001"})
+
+        assert "bug-001" not in sync.index
+
+
+class TestBugQueryServiceWithIndex:
+    """BugQueryService should serve KNN from the index and fall back to Postgres"""
+
+    @pytest.fixture
+    def index(self, vectors):
+        index = ExactVectorIndex(dimension=4)
+        for bug_id, vector in vectors.items():
+            index.upsert(bug_id, vector)
+        return index
+
+    @pytest.mark.asyncio
+    async def test_serves_from_index(
+            self,
+            index,
+            mock_settings,
+            mock_llm_provider,
+            mock_embedding_provider,
+            mock_db_connection
+    ):
+        """Should not run the pgvector query when the bug is indexed"""
+        service = BugQueryService(mock_settings, mock_llm_provider, mock_embedding_provider, index)
+        rows = {
+            "bug-002": {"bug_id": "bug-002", "title": "Near", "description": None,
+                        "status": "open", "resolution": None}
+        }
+
+        with patch.object(service.repo, 'get_bugs_by_ids', new_callable=AsyncMock, return_value=rows):
+            with patch.object(service.repo, 'find_similar', new_callable=AsyncMock) as mock_find:
+                result = await service.find_similar_bugs(mock_db_connection, "bug-001")
+
+                mock_find.assert_not_called()
+
+        assert [b["bug_id"] for b in result["similar_bugs"]] == ["bug-002"]
+        assert result["similar_bugs"][0]["similarity"] > 0.9
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_not_indexed(
+            self,
+            index,
+            mock_settings,
+            mock_llm_provider,
+            mock_embedding_provider,
+            mock_db_connection
+    ):
+        """Bugs missing from the index should be searched in Postgres"""
+        service = BugQueryService(mock_settings, mock_llm_provider, mock_embedding_provider, index)
+        cursor = mock_db_connection.cursor.return_value.__aenter__.return_value
+        cursor.fetchone.return_value = ([0.1] * 384,)
+
+        with patch.object(service.repo, 'get_bug', new_callable=AsyncMock, return_value={"bug_id": "bug-new"}):
+            with patch.object(service.repo, 'find_similar', new_callable=AsyncMock, return_value=[]) as mock_find:
+                await service.find_similar_bugs(mock_db_connection, "bug-new")
+
+                mock_find.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_batch_splits_between_index_and_db(
+            self,
+            index,
+            mock_settings,
+            mock_llm_provider,
+            mock_embedding_provider,
+            mock_db_connection
+    ):
+        """Indexed bugs come from the index, the rest from one batched DB query"""
+        service = BugQueryService(mock_settings, mock_llm_provider, mock_embedding_provider, index)
+        rows = {
+            "bug-002": {"bug_id": "bug-002", "title": "Near", "description": None,
+                        "status": "open", "resolution": None}
+        }
+        db_results = [[
+            {"bug_id": "bug-db", "title": "Self", "similarity": 1.0},
+            {"bug_id": "bug-003", "title": "Other", "similarity": 0.8}
+        ]]
+
+        with patch.object(service.repo, 'get_bugs_by_ids', new_callable=AsyncMock, return_value=rows):
+            with patch.object(service.repo, 'get_embeddings', new_callable=AsyncMock,
+                              return_value={"bug-db": [0.1] * 4}):
+                with patch.object(service.repo, 'find_similar_batch', new_callable=AsyncMock,
+                                  return_value=db_results) as mock_batch:
+                    result = await service.find_similar_bugs_batch(
+                        mock_db_connection,
+                        ["bug-001", "bug-db", "bug-missing"]
+                    )
+
+                    mock_batch.assert_called_once()
+
+        by_id = {item["bug_id"]: item for item in result["results"]}
+        assert [b["bug_id"] for b in by_id["bug-001"]["similar_bugs"]] == ["bug-002"]
+        assert [b["bug_id"] for b in by_id["bug-db"]["similar_bugs"]] == ["bug-003"]
+        assert result["not_found"] == ["bug-missing"]
@@ -0,0 +1,66 @@
+"""Tests for MinHash signatures and LSH banding"""
+
+from bugspotter_intelligence.utils.minhash import (
+    estimate_jaccard,
+    lsh_bands,
+    minhash_signature,
+    normalize_text,
+    shingles,
+)
+
+REPORT = (
+    "TypeError: Cannot read property 'id' of undefined at 2024-05-01T10:22:33Z "
+    "in checkout.js:142 for session 3f2b9c1e-8a4d-4e2f-9b1a-7c6d5e4f3a2b, user 48213"
+)
+
+
+class TestNormalize:
+    """Test suite for text normalization"""
+
+    def test_volatile_tokens_replaced(self):
+        """Should replace ids, timestamps and numbers with placeholders"""
+        tokens = normalize_text(REPORT)
+
+        assert "<uuid>" in tokens
+        assert "<ts>" in tokens
+        assert "48213" not in tokens
+        assert "typeerror" in tokens
+
+    def test_short_text_is_one_shingle(self):
+        """Should keep texts shorter than a shingle as a single shingle"""
+        assert shingles("Login fails") == {"login fails"}
+
+
+class TestMinHash:
+    """Test suite for signatures and bands"""
+
+    def test_copies_differing_in_ids_match(self):
+        """Should give identical signatures to copies differing only in volatile tokens"""
+        copy = REPORT.replace("2024-05-01T10:22:33Z", "2024-07-19T08:01:02Z").replace("48213", "77")
+
+        assert minhash_signature(REPORT) == minhash_signature(copy)
+
+    def test_estimate_tracks_similarity(self):
+        """Should rate an edited copy between an exact copy and an unrelated report"""
+        edited = REPORT + " after clicking pay twice"
+        unrelated = "Dark mode toggle does not persist after reload on settings page"
+        signature = minhash_signature(REPORT)
+
+        similar = estimate_jaccard(signature, minhash_signature(edited))
+        different = estimate_jaccard(signature, minhash_signature(unrelated))
+
+        assert 0.5 < similar < 1.0
+        assert different < 0.1
+
+    def test_signature_length_and_bands(self):
+        """Should produce num_perm values and one bucket per band"""
+        signature = minhash_signature(REPORT, num_perm=64)
+
+        assert len(signature) == 64
+        assert len(lsh_bands(signature, 16)) == 16
+        assert lsh_bands(signature, 16) == lsh_bands(list(signature), 16)
+        assert all(-2 ** 63 <= bucket < 2 ** 63 for bucket in lsh_bands(signature, 16))
+
+    def test_mismatched_signatures(self):
+        """Should not compare signatures of different lengths"""
+        assert estimate_jaccard(minhash_signature(REPORT, 64), minhash_signature(REPORT, 128)) == 0.0
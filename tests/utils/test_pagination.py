@@ -0,0 +1,27 @@
+"""Tests for similarity stream cursors"""
+
+import pytest
+
+from bugspotter_intelligence.utils.pagination import decode_cursor, encode_cursor
+
+
+class TestCursor:
+    """Test suite for keyset cursor tokens"""
+
+    def test_round_trip(self):
+        """Should restore the exact distance and bug id"""
+        distance = 0.123456789012345
+
+        assert decode_cursor(encode_cursor(distance, "bug-42")) == (distance, "bug-42")
+
+    def test_token_is_url_safe(self):
+        """Should not need escaping in a query string"""
+        token = encode_cursor(0.5, "bug/with?odd&chars")
+
+        assert all(c.isalnum() or c in "-_" for c in token)
+
+    @pytest.mark.parametrize("token", ["not-a-cursor", "", encode_cursor(0.1, "x")[:-3]])
+    def test_malformed_token_raises(self, token):
+        """Should raise ValueError for garbage tokens"""
+        with pytest.raises(ValueError):
+            decode_cursor(token)
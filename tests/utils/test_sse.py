@@ -0,0 +1,70 @@
+"""Tests for Server-Sent Events formatting"""
+
+import json
+
+import pytest
+
+from bugspotter_intelligence.llm import LLMOverloadedError
+from bugspotter_intelligence.utils.sse import format_event, start_stream, token_events
+
+
+async def _tokens(*chunks, fail: bool = False):
+    for chunk in chunks:
+        yield chunk
+    if fail:
+        raise RuntimeError("connection reset")
+
+
+async def _overloaded():
+    raise LLMOverloadedError("LLM queue is full", 429, 3)
+    yield
+
+
+class TestSSE:
+    """Test suite for SSE events"""
+
+    def test_format_event(self):
+        """Should emit event and JSON data lines ended by a blank line"""
+        assert format_event({"text": "a\nb"}, "token") == 'event: token\ndata: {"text": "a\\nb"}\n\n'
+        assert format_event({"x": 1}) == 'data: {"x": 1}\n\n'
+
+    @pytest.mark.asyncio
+    async def test_token_events_end_with_done(self):
+        """Should send one token event per chunk, then done"""
+        events = [e async for e in token_events(_tokens("Add ", "a check"), {"bug_id": "bug-1"})]
+
+        assert events[:2] == [format_event({"text": "Add "}, "token"), format_event({"text": "a check"}, "token")]
+        assert events[-1] == format_event({"bug_id": "bug-1"}, "done")
+
+    @pytest.mark.asyncio
+    async def test_failure_becomes_error_event(self):
+        """Should report a mid-stream failure as an error event instead of done"""
+        events = [e async for e in token_events(_tokens("Add ", fail=True), {})]
+
+        assert events[0].startswith("event: token")
+        assert events[-1].startswith("event: error")
+        assert json.loads(events[-1].split("data: ")[1])["detail"] == "connection reset"
+
+    @pytest.mark.asyncio
+    async def test_start_stream_keeps_every_chunk(self):
+        """Should hand back the whole stream, first chunk included"""
+        tokens = await start_stream(_tokens("Add ", "a check"))
+
+        assert [t async for t in tokens] == ["Add ", "a check"]
+        assert [t async for t in await start_stream(_tokens())] == []
+
+    @pytest.mark.asyncio
+    async def test_start_stream_raises_overload(self):
+        """Should raise a scheduler rejection before the response starts"""
+        with pytest.raises(LLMOverloadedError) as excinfo:
+            await start_stream(_overloaded())
+
+        assert excinfo.value.status_code == 429
+
+    @pytest.mark.asyncio
+    async def test_start_stream_defers_other_failures(self):
+        """Should leave other failures to token_events"""
+        tokens = await start_stream(_tokens(fail=True))
+        events = [e async for e in token_events(tokens, {})]
+
+        assert events == [format_event({"detail": "connection reset"}, "error")]